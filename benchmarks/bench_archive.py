@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Archiv: Listen-Endpunkte vor und nach dem Verschieben abgeschlossener Messen.
+
+Im synthetischen Datensatz (siehe dataset.py) wird ein Anteil --finished der
+Projekte auf "Abgeschlossen" gesetzt, wie bei einer Datenbank mit Messen
+aus mehreren Jahren. Gemessen wird der Durchsatz gemischter Listen-Abfragen
+ohne Antwort-Cache, dann läuft POST /api/archive, während Clients Aufgaben
+aktiver Projekte ändern (Latenz der Schreibzugriffe während des
+Archivierens), danach werden dieselben Listen erneut gemessen.
+
+    python benchmarks/bench_archive.py --size medium --finished 0.8
+"""
+
+import argparse
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+import urllib.request
+
+from common import format_result, run_load, run_requests, start_server, stop_server
+from dataset import SIZES, generate_dataset
+
+LIST_PATHS = [
+    '/api/projects?limit=100&sort=-date',
+    '/api/tasks?status=ToDo&limit=100&sort=dueDate',
+    '/api/tasks?priority=Hoch&limit=100',
+    '/api/overview',
+]
+
+SERVER_ENV = {'RESPONSE_CACHE_ENTRIES': '0', 'ARCHIVE_AFTER_DAYS': '0'}
+
+
+def mark_finished(db_file, share, seed=1):
+    """Setzt ``share`` der Projekte auf Abgeschlossen; liefert die Aufgaben der übrigen."""
+    rnd = random.Random(seed)
+    with sqlite3.connect(db_file) as conn:
+        ids = [row[0] for row in conn.execute('SELECT id FROM projects')]
+        finished = rnd.sample(ids, int(len(ids) * share))
+        conn.executemany("UPDATE projects SET status = 'Abgeschlossen' WHERE id = ?",
+                         [(i,) for i in finished])
+        conn.execute("UPDATE projects SET status = 'Montage' WHERE status = 'Abgeschlossen' "
+                     f"AND id NOT IN ({', '.join(map(str, finished)) or 'NULL'})")
+        return [row[0] for row in conn.execute(
+            "SELECT t.id FROM tasks t JOIN projects p ON p.id = t.project_id WHERE p.status != 'Abgeschlossen'")]
+
+
+def merge_results(results):
+    """Fasst Messungen in Abschnitten zusammen (p99: schlechtester Abschnitt)."""
+    return {
+        'rps': sum(r['requests'] for r in results) / sum(r['requests'] / r['rps'] for r in results if r['rps']),
+        'p50_ms': sorted(r['p50_ms'] for r in results)[len(results) // 2],
+        'p99_ms': max(r['p99_ms'] for r in results),
+        'errors': sum(r['errors'] for r in results),
+    }
+
+
+def archive(port):
+    request = urllib.request.Request(f'http://127.0.0.1:{port}/api/archive', data=b'', method='POST')
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=3600) as resp:
+        result = json.load(resp)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', choices=SIZES, default='small')
+    parser.add_argument('--finished', type=float, default=0.8, help='Anteil abgeschlossener Projekte')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--batch', type=int, default=20, help='ARCHIVE_BATCH')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'bench.db')
+        generate_dataset(db_file, *SIZES[args.size])
+        active_tasks = mark_finished(db_file, args.finished)
+        proc, port = start_server(db_file, dict(SERVER_ENV, ARCHIVE_BATCH=str(args.batch)))
+        try:
+            before = run_load(port, LIST_PATHS, args.clients, args.duration)
+
+            # Schreibzugriffe auf aktive Aufgaben: ohne und während der Archivierung
+            rnd = random.Random(1)
+            writes = [('PUT', f'/api/tasks/{rnd.choice(active_tasks)}', {'status': rnd.choice(['ToDo', 'Done'])})
+                      for _ in range(100000)]
+            writers = max(1, args.clients // 4)
+            idle = run_requests(port, writes, writers, max_seconds=3)
+            done = {}
+            thread = threading.Thread(target=lambda: done.update(zip(('result', 'seconds'), archive(port))))
+            thread.start()
+            chunks = []
+            while thread.is_alive():
+                chunks.append(run_requests(port, writes, writers, max_seconds=1))
+            thread.join()
+            during = merge_results(chunks)
+
+            after = run_load(port, LIST_PATHS, args.clients, args.duration)
+        finally:
+            stop_server(proc)
+        result = done['result']
+        print(f'Archiviert: {result["projects"]} Projekte, {result["tasks"]} Aufgaben '
+              f'in {done["seconds"]:.1f} s (übersprungen: {result["skipped"]})\n')
+        print(format_result('Listen vorher', before))
+        print(format_result('PUT ohne Archivierung', idle))
+        print(format_result('PUT während Archivierung', during))
+        print(format_result('Listen nachher', after))
+
+
+if __name__ == '__main__':
+    main()
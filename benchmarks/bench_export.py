@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Export ganzer Tabellen: /api/export/tasks (spaltenweises JSON, CSV, gzip)
+gegen die ungepaginierte Liste /api/tasks (ein dict je Zeile).
+
+Für jede Variante läuft ein frischer Server gegen denselben synthetischen
+Datensatz (siehe dataset.py) ohne Antwort-Cache. Gemessen werden Dauer und
+Größe der Antwort sowie der Speicherzuwachs des Servers (Höchstwert VmHWM
+aus /proc, nur unter Linux).
+
+    python benchmarks/bench_export.py --size medium
+    python benchmarks/bench_export.py --db /tmp/large.db
+"""
+
+import argparse
+import http.client
+import os
+import tempfile
+import time
+
+from common import start_server, stop_server
+from dataset import SIZES, generate_dataset
+
+VARIANTS = [
+    ('/api/tasks', '/api/tasks', {}),
+    ('/api/tasks (gzip)', '/api/tasks', {'Accept-Encoding': 'gzip'}),
+    ('export columns', '/api/export/tasks', {}),
+    ('export columns (gzip)', '/api/export/tasks', {'Accept-Encoding': 'gzip'}),
+    ('export csv', '/api/export/tasks?format=csv', {}),
+    ('export csv (gzip)', '/api/export/tasks?format=csv', {'Accept-Encoding': 'gzip'}),
+]
+
+# ohne Antwort-Cache; ohne mmap, da eingeblendete Seiten der Datenbank sonst
+# als Speicher des Servers zählen
+SERVER_ENV = {'RESPONSE_CACHE_ENTRIES': '0', 'DB_MMAP_SIZE_MB': '0'}
+
+
+def memory_kb(pid, field):
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def fetch(port, path, headers):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    start = time.perf_counter()
+    conn.request('GET', path, headers=headers)
+    resp = conn.getresponse()
+    size = 0
+    while True:
+        data = resp.read(1 << 16)
+        if not data:
+            break
+        size += len(data)
+    elapsed = time.perf_counter() - start
+    conn.close()
+    if resp.status != 200:
+        raise RuntimeError(f'{path}: {resp.status}')
+    return elapsed, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--db', help='vorhandene Datenbank (sonst wird --size erzeugt)')
+    parser.add_argument('--size', choices=SIZES, default='medium')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--gzip-level', type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = args.db
+        if not db_file:
+            db_file = os.path.join(tmp, 'bench.db')
+            generate_dataset(db_file, *SIZES[args.size])
+        print(f'{"":<24} {"Sekunden":>9} {"MB":>8} {"+RSS MB":>8}')
+        for name, path, headers in VARIANTS:
+            proc, port = start_server(db_file, dict(SERVER_ENV, EXPORT_GZIP_LEVEL=str(args.gzip_level)))
+            try:
+                before = memory_kb(proc.pid, 'VmRSS')
+                runs = [fetch(port, path, headers) for _ in range(args.repeat)]
+                peak = memory_kb(proc.pid, 'VmHWM')
+            finally:
+                stop_server(proc)
+            elapsed = min(r[0] for r in runs)
+            growth = f'{(peak - before) / 1024:>8.1f}' if peak and before else f'{"-":>8}'
+            print(f'{name:<24} {elapsed:>9.2f} {runs[0][1] / 1e6:>8.1f} {growth}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Query-Plan und Latenz der häufigsten Abfragen ohne und mit den Indizes aus
+Migration 2 (siehe server.MIGRATIONS).
+
+Die Datenbank wird mit allen Migrationen angelegt; für die Messung "ohne"
+werden die Indizes und Statistiken entfernt und user_version zurückgesetzt,
+danach wendet init_db() die Migration erneut an.
+
+    python benchmarks/bench_indexes.py --projects 2500 --tasks-per-project 50
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from common import seed_database, server
+
+QUERIES = [
+    ('Aufgaben eines Projekts', 'SELECT * FROM tasks WHERE project_id=?', (1234,)),
+    ('Projekte eines Kunden', 'SELECT * FROM projects WHERE customer_id=?', (17,)),
+    ('Aufgaben nach Status', 'SELECT * FROM tasks WHERE status=?', ('InBearbeitung',)),
+    ('Aufgaben fällig in einer Woche', 'SELECT * FROM tasks WHERE dueDate BETWEEN ? AND ?',
+     ('2025-03-01', '2025-03-07')),
+]
+
+
+def measure(db_file, repeat):
+    with sqlite3.connect(db_file) as conn:
+        results = []
+        for name, sql, args in QUERIES:
+            plan = ' / '.join(row[3] for row in conn.execute('EXPLAIN QUERY PLAN ' + sql, args))
+            start = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(sql, args).fetchall()
+            elapsed = (time.perf_counter() - start) / repeat * 1000
+            results.append((name, plan, elapsed))
+        return results
+
+
+def drop_indexes(db_file):
+    with sqlite3.connect(db_file) as conn:
+        for (name,) in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_%'").fetchall():
+            conn.execute(f'DROP INDEX {name}')
+        conn.execute('DROP TABLE IF EXISTS sqlite_stat1')
+        conn.execute('PRAGMA user_version = 1')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--projects', type=int, default=2500)
+    parser.add_argument('--tasks-per-project', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'bench.db')
+        seed_database(db_file, customers=200, projects=args.projects,
+                      tasks_per_project=args.tasks_per_project)
+        print(f'{args.projects * args.tasks_per_project} Aufgaben, {args.projects} Projekte\n')
+        drop_indexes(db_file)
+        before = measure(db_file, args.repeat)
+        server.init_db()
+        after = measure(db_file, args.repeat)
+
+    for (name, plan_before, ms_before), (_, plan_after, ms_after) in zip(before, after):
+        print(name)
+        print(f'  ohne Index: {ms_before:8.2f} ms  {plan_before}')
+        print(f'  mit Index:  {ms_after:8.2f} ms  {plan_after}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Mehraufwand der Kennzahlen (/api/metrics) je Anfrage, ohne Netzwerk.
+
+Anfragen laufen wie in bench_routing.py direkt durch handle_one_request,
+der Antwort-Cache ist aus, damit jede Anfrage SQLite abfragt. Verglichen
+werden die Verbindungen ohne TimedConnection (sqlite3.Connection) sowie
+METRICS_SAMPLE_RATE 0 und 1.
+
+    python benchmarks/bench_metrics.py --requests 1000 --rounds 5
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from bench_routing import handle
+from common import seed_database, server
+
+PATHS = [
+    ('Detail', '/api/projects/17'),
+    ('Liste (100)', '/api/tasks?limit=100'),
+    ('Übersicht', '/api/overview'),
+]
+
+CONFIGS = [
+    ('ohne Messung', sqlite3.Connection, 0),
+    ('Sampling 0', server.TimedConnection, 0),
+    ('Sampling 1', server.TimedConnection, 1),
+]
+
+
+def per_request_us(raw, requests):
+    start = time.perf_counter()
+    for _ in range(requests):
+        handle(raw)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def use(factory, rate):
+    """Neue Verbindungen mit ``factory`` öffnen und die Sampling-Rate setzen."""
+    server.db_pool.close()
+    server.TimedConnection = factory
+    server.metrics.sample_rate = rate
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=1000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    timed_connection = server.TimedConnection
+    server.response_cache.max_entries = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, 'bench.db'), customers=20, projects=200, tasks_per_project=20)
+        results = {}
+        # Konfigurationen je Runde abwechselnd messen, damit Schwankungen der
+        # Maschine alle gleich treffen; je Konfiguration zählt die beste Runde
+        for _ in range(args.rounds):
+            for name, factory, rate in CONFIGS:
+                use(factory, rate)
+                for label, path in PATHS:
+                    raw = f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode()
+                    handle(raw)
+                    elapsed = per_request_us(raw, args.requests)
+                    results[name, label] = min(results.get((name, label), elapsed), elapsed)
+        server.TimedConnection = timed_connection
+        server.db_pool.close()
+
+    print(f'{"µs/Anfrage":<16}' + ''.join(f'{name:>14}' for name, _, _ in CONFIGS))
+    for label, _ in PATHS:
+        print(f'{label:<16}' + ''.join(f'{results[name, label]:>14.1f}' for name, _, _ in CONFIGS))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Aufgabenansicht (open_tasks.js): bisher alle Aufgaben und alle Projekte je
+Laden, jetzt /api/tasks/open (nur offene, mit Projektname) und danach nur
+noch ?updated_since= bzw. 304 per ETag.
+
+Der Server läuft ohne Antwort-Cache gegen einen synthetischen Datensatz
+(siehe dataset.py); zwischen den Abrufen werden --edits Aufgaben geändert.
+Ausgegeben werden übertragene Bytes und die beste Dauer aus --repeat Abrufen.
+
+    python benchmarks/bench_open_tasks.py --size medium
+"""
+
+import argparse
+import http.client
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+from common import start_server, stop_server
+from dataset import SIZES, generate_dataset
+
+
+def get(port, path, headers=None):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    conn.request('GET', path, headers=headers or {})
+    resp = conn.getresponse()
+    body = resp.read()
+    conn.close()
+    return resp, body
+
+
+def measure(port, paths, repeat, headers=None):
+    """(Bytes, beste Dauer in ms) für das Laden aller ``paths`` nacheinander."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size = sum(len(get(port, path, headers)[1]) for path in paths)
+        best = min(best, time.perf_counter() - start)
+    return size, best * 1000
+
+
+def edit(port, task_ids, rnd):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+    for task_id in task_ids:
+        body = json.dumps({'status': rnd.choice(['ToDo', 'InBearbeitung', 'Done'])})
+        conn.request('PUT', f'/api/tasks/{task_id}', body=body, headers={'Content-Type': 'application/json'})
+        conn.getresponse().read()
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--db', help='vorhandene Datenbank (sonst wird --size erzeugt)')
+    parser.add_argument('--size', choices=SIZES, default='medium')
+    parser.add_argument('--edits', type=int, default=10)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rnd = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = args.db
+        if not db_file:
+            db_file = os.path.join(tmp, 'bench.db')
+            generate_dataset(db_file, *SIZES[args.size])
+        with sqlite3.connect(db_file) as conn:
+            tasks = conn.execute('SELECT max(id) FROM tasks').fetchone()[0]
+        proc, port = start_server(db_file, {'RESPONSE_CACHE_ENTRIES': '0'})
+        try:
+            results = [('bisher: /api/tasks + /api/projects',
+                        measure(port, ['/api/tasks', '/api/projects'], args.repeat))]
+            resp, _ = get(port, '/api/tasks/open')
+            token, etag = resp.getheader('X-Updated-At'), resp.getheader('ETag')
+            results.append(('/api/tasks/open', measure(port, ['/api/tasks/open'], args.repeat)))
+            results.append(('/api/tasks/open, If-None-Match (304)',
+                            measure(port, ['/api/tasks/open'], args.repeat, {'If-None-Match': etag})))
+            edit(port, rnd.sample(range(1, tasks + 1), args.edits), rnd)
+            results.append((f'updated_since nach {args.edits} Änderungen',
+                            measure(port, [f'/api/tasks/open?updated_since={token}'], args.repeat)))
+        finally:
+            stop_server(proc)
+    print(f'{"":<44} {"KB":>10} {"ms":>9}')
+    for name, (size, ms) in results:
+        print(f'{name:<44} {size / 1024:>10.1f} {ms:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Überlast: Latenz bei mehr Clients, als der Server bedienen kann, mit und
+ohne Lastbegrenzung (ADMISSION_*).
+
+Jeder Client lädt wie ein Browser am Morgen die Übersicht (HTML, CSS, JS,
+/api/customers, /api/overview) und fragt danach einzelne Projekte und
+kurze Aufgabenlisten ab, ohne Antwort-Cache und über Keep-Alive-
+Verbindungen mit --timeout Sekunden Timeout. Auf 503/429 wartet er so
+lange, wie Retry-After angibt.
+
+Ausgegeben werden je Art der Anfrage (statisch, klein, aufwendig) die
+Latenz-Perzentile der erfolgreichen Antworten sowie abgelehnte Anfragen
+(503/429) und Timeouts bzw. Verbindungsfehler. Ohne Lastbegrenzung wachsen
+p99 und Timeouts mit der Clientzahl, mit ihr bleibt p99 der erfolgreichen
+Anfragen etwa beim Zeitbudget ADMISSION_QUEUE_MS.
+
+    python benchmarks/bench_overload.py --size small --clients 200
+"""
+
+import argparse
+import http.client
+import os
+import random
+import tempfile
+import threading
+import time
+
+from common import percentile, start_server, stop_server
+from dataset import SIZES, generate_dataset
+
+# ohne: bisheriges Verhalten (Warteschlange 4 je Worker-Thread, keine Ablehnung)
+CONFIGS = [
+    ('ohne', {'ADMISSION_QUEUE': '64', 'ADMISSION_QUEUE_MS': '0', 'ADMISSION_HEAVY_MAX': '0'}),
+    ('mit', {}),
+]
+
+SERVER_ENV = {'RESPONSE_CACHE_ENTRIES': '0'}
+
+KINDS = ('statisch', 'klein', 'aufwendig')
+
+
+def page_requests(rnd, projects):
+    """Anfragen eines Clients: Seite der Übersicht laden, dann einzelne Abfragen."""
+    requests = [('statisch', path) for path in ('/', '/style.css', '/changes.js', '/overview.js')]
+    requests += [('aufwendig', '/api/customers'), ('aufwendig', '/api/overview')]
+    for _ in range(6):
+        requests.append(rnd.choice([
+            ('klein', f'/api/projects/{rnd.randint(1, projects)}'),
+            ('klein', f'/api/projects/{rnd.randint(1, projects)}/tasks'),
+            ('klein', '/api/tasks?status=ToDo&limit=50&sort=dueDate'),
+        ]))
+    return requests
+
+
+def run_overload(port, clients, duration, timeout, projects):
+    """Lässt ``clients`` Browser-Clients ``duration`` Sekunden lang Seiten laden."""
+    stats = {kind: {'ms': [], 'rejected': 0, 'failed': 0} for kind in KINDS}
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def client(idx):
+        rnd = random.Random(idx)
+        own = {kind: {'ms': [], 'rejected': 0, 'failed': 0} for kind in KINDS}
+        conn = None
+        while time.time() < stop_at:
+            for kind, path in page_requests(rnd, projects):
+                if time.time() >= stop_at:
+                    break
+                start = time.perf_counter()
+                try:
+                    if conn is None:
+                        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+                    conn.request('GET', path)
+                    resp = conn.getresponse()
+                    resp.read()
+                    if resp.will_close:
+                        conn.close()
+                        conn = None
+                except (OSError, http.client.HTTPException):
+                    own[kind]['failed'] += 1
+                    if conn is not None:
+                        conn.close()
+                    conn = None
+                    continue
+                if resp.status in (429, 503):
+                    own[kind]['rejected'] += 1
+                    time.sleep(int(resp.getheader('Retry-After') or 1))
+                    continue
+                own[kind]['ms'].append((time.perf_counter() - start) * 1000)
+        if conn is not None:
+            conn.close()
+        with lock:
+            for kind in KINDS:
+                stats[kind]['ms'] += own[kind]['ms']
+                stats[kind]['rejected'] += own[kind]['rejected']
+                stats[kind]['failed'] += own[kind]['failed']
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return stats, time.time() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', choices=SIZES, default='small')
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--duration', type=float, default=20)
+    parser.add_argument('--timeout', type=float, default=10, help='Timeout der Clients in Sekunden')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'bench.db')
+        generate_dataset(db_file, *SIZES[args.size])
+        projects = SIZES[args.size][1]
+        print(f'{args.clients} Clients, {args.duration:.0f} s, Timeout {args.timeout:.0f} s\n')
+        print(f'{"Lastbegrenzung":<15} {"Anfragen":<10} {"ok/s":>8} {"p50 ms":>9} {"p99 ms":>9} '
+              f'{"max ms":>9} {"503/429":>8} {"Fehler":>7}')
+        for name, env in CONFIGS:
+            proc, port = start_server(db_file, dict(SERVER_ENV, **env))
+            try:
+                stats, elapsed = run_overload(port, args.clients, args.duration, args.timeout, projects)
+            finally:
+                stop_server(proc)
+            for kind in KINDS:
+                s = stats[kind]
+                print(f'{name:<15} {kind:<10} {len(s["ms"]) / elapsed:>8.1f} {percentile(s["ms"], 50):>9.1f} '
+                      f'{percentile(s["ms"], 99):>9.1f} {max(s["ms"], default=0):>9.1f} '
+                      f'{s["rejected"]:>8} {s["failed"]:>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Prefork-Betrieb: Durchsatz in Abhängigkeit von WORKER_PROCESSES.
+
+Für jede Prozesszahl läuft ein frischer Server gegen dieselbe synthetische
+Datenbank und wird mit gemischten GET-Anfragen belastet (Einzelabfragen,
+gefilterte Listen, Übersicht). Der Antwort-Cache ist aus, damit jede Anfrage
+tatsächlich Python-Code und SQLite ausführt; mit --cache bleibt er an.
+
+Der Lastgenerator verteilt die Clients auf --client-processes Prozesse, damit
+nicht der GIL des Clients den Durchsatz begrenzt. Aussagekräftig ist der
+Vergleich nur mit mehreren freien CPU-Kernen (Anzahl wird mit ausgegeben).
+
+    python benchmarks/bench_prefork.py --processes 1 2 4 8 --clients 64
+"""
+
+import argparse
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from common import run_load, seed_database, start_server, stop_server
+
+PROJECTS = 300
+TASKS_PER_PROJECT = 20
+
+
+def request_paths(count=2000, seed=1):
+    rnd = random.Random(seed)
+    paths = []
+    for i in range(count):
+        kind = i % 5
+        if kind == 0:
+            paths.append(f'/api/tasks/{rnd.randint(1, PROJECTS * TASKS_PER_PROJECT)}')
+        elif kind == 1:
+            paths.append(f'/api/projects/{rnd.randint(1, PROJECTS)}')
+        elif kind == 2:
+            paths.append(f'/api/projects/{rnd.randint(1, PROJECTS)}/tasks')
+        elif kind == 3:
+            paths.append('/api/tasks?status=ToDo&limit=50&sort=dueDate')
+        else:
+            paths.append('/api/overview?limit=50')
+    return paths
+
+
+def _load(args):
+    port, paths, clients, duration = args
+    return run_load(port, paths, clients=clients, duration=duration)
+
+
+def parallel_load(port, paths, clients, duration, client_processes):
+    """run_load in mehreren Prozessen; summierter Durchsatz, schlechtestes p50/p99."""
+    per_process = max(1, clients // client_processes)
+    jobs = [(port, paths[i::client_processes], per_process, duration) for i in range(client_processes)]
+    with ProcessPoolExecutor(client_processes) as pool:
+        results = list(pool.map(_load, jobs))
+    return {
+        'rps': sum(r['rps'] for r in results),
+        'p50_ms': max(r['p50_ms'] for r in results),
+        'p99_ms': max(r['p99_ms'] for r in results),
+        'errors': sum(r['errors'] for r in results),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--threads', type=int, default=16, help='WORKER_THREADS je Prozess')
+    parser.add_argument('--clients', type=int, default=64)
+    parser.add_argument('--client-processes', type=int, default=4)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--cache', action='store_true', help='Antwort-Cache eingeschaltet lassen')
+    args = parser.parse_args()
+
+    paths = request_paths()
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'bench.db')
+        seed_database(db_file, customers=50, projects=PROJECTS, tasks_per_project=TASKS_PER_PROJECT)
+        print(f'{os.cpu_count()} CPU-Kerne, {args.clients} Clients in {args.client_processes} Prozessen, '
+              f'{args.threads} Worker-Threads je Prozess\n')
+        print(f'{"Prozesse":<10} {"req/s":>9} {"Faktor":>7} {"p50 ms":>8} {"p99 ms":>8} {"Fehler":>7}')
+        base = None
+        for processes in args.processes:
+            env = {'WORKER_PROCESSES': str(processes), 'WORKER_THREADS': str(args.threads)}
+            if not args.cache:
+                env['RESPONSE_CACHE_ENTRIES'] = '0'
+            proc, port = start_server(db_file, env)
+            try:
+                result = parallel_load(port, paths, args.clients, args.duration, args.client_processes)
+            finally:
+                stop_server(proc)
+            base = base or result['rps']
+            print(f'{processes:<10} {result["rps"]:>9.1f} {result["rps"] / base:>7.2f} '
+                  f'{result["p50_ms"]:>8.1f} {result["p99_ms"]:>8.1f} {result["errors"]:>7}')
+
+
+if __name__ == '__main__':
+    main()
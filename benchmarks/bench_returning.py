@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Schreibpfade: INSERT/UPDATE ... RETURNING gegen Schreiben plus zweites SELECT.
+
+Gemessen wird im selben Prozess direkt auf einer Pool-Verbindung, wie sie
+die Handler benutzen (inkl. Trigger für change_log, Volltextindex und
+project_stats), je Vorgang bis zum fertigen JSON. Alle Änderungen laufen in
+einem SAVEPOINT, der am Ende zurückgerollt wird.
+
+    python benchmarks/bench_returning.py --writes 5000
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from common import seed_database, server
+
+TASK = (1, 'Standplan prüfen', 'Beschreibung ' * 5, 'ToDo', '2025-03-01', 'Max Müller', 'Hoch')
+INSERT_TASK = ('INSERT INTO tasks (project_id, title, description, status, dueDate, assignee, priority) '
+               'VALUES (?, ?, ?, ?, ?, ?, ?)')
+
+
+def insert_select(conn, i):
+    cur = conn.cursor()
+    cur.execute(INSERT_TASK, TASK)
+    row = cur.execute('SELECT * FROM tasks WHERE id=?', (cur.lastrowid,)).fetchone()
+    return json.dumps(dict(zip([d[0] for d in cur.description], row)))
+
+
+def insert_returning(conn, i):
+    row = conn.execute(f'{INSERT_TASK} {server.RETURNING["tasks"]}', TASK).fetchone()
+    return server.json_encode(server.row_dict('tasks', row))
+
+
+def update_select(conn, i):
+    conn.execute('UPDATE tasks SET status=? WHERE id=?', ('Done' if i % 2 else 'ToDo', i))
+    return json.dumps(dict(conn.execute('SELECT * FROM tasks WHERE id=?', (i,)).fetchone()))
+
+
+def update_returning(conn, i):
+    row = conn.execute(f'UPDATE tasks SET status=? WHERE id=? {server.RETURNING["tasks"]}',
+                       ('Done' if i % 2 else 'ToDo', i)).fetchone()
+    return server.json_encode(server.row_dict('tasks', row))
+
+
+CASES = [
+    ('Aufgabe anlegen', insert_select, insert_returning),
+    ('Aufgabe ändern', update_select, update_returning),
+]
+
+
+def per_write_us(conn, func, writes):
+    conn.execute('SAVEPOINT bench')
+    start = time.perf_counter()
+    for i in range(1, writes + 1):
+        func(conn, i)
+    elapsed = time.perf_counter() - start
+    conn.execute('ROLLBACK TO bench')
+    conn.execute('RELEASE bench')
+    return elapsed / writes * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--writes', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, 'bench.db'), customers=50, projects=500, tasks_per_project=20)
+        conn = server.open_connection(isolation_level=None)
+        print(f'{"µs je Vorgang":<20} {"+ SELECT":>10} {"RETURNING":>10}')
+        for label, old, new in CASES:
+            # abwechselnd messen, je Variante zählt die beste Runde
+            best = [float('inf'), float('inf')]
+            for _ in range(args.rounds):
+                for k, func in enumerate((old, new)):
+                    best[k] = min(best[k], per_write_us(conn, func, args.writes))
+            print(f'{label:<20} {best[0]:>10.1f} {best[1]:>10.1f}')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Lasttest aller API-Routen mit maschinenlesbarer Baseline.
+
+Der Server läuft als eigener Prozess gegen eine Kopie eines synthetischen
+Datensatzes (siehe dataset.py). Jede Route aus server.ROUTES wird nacheinander
+mit --requests Anfragen über --clients parallele Keep-Alive-Verbindungen
+belastet: erst alle GET-Routen, dann POST, PUT, DELETE und zuletzt das
+Archivieren. Die Anfragen sind über --seed reproduzierbar. Ausgegeben werden
+je Route Durchsatz und Latenz-Perzentile, mit --output zusätzlich als JSON.
+
+Mit --compare wird das Ergebnis gegen eine frühere JSON-Datei verglichen;
+Routen, deren Durchsatz um mehr als --tolerance Prozent sinkt oder deren
+p99 um mehr steigt, gelten als Regression (Exit-Code 1).
+
+    python benchmarks/dataset.py --size large /tmp/large.db
+    python benchmarks/bench_routes.py --db /tmp/large.db --output baseline.json
+    python benchmarks/bench_routes.py --db /tmp/large.db --compare baseline.json
+    python benchmarks/bench_routes.py --results neu.json --compare baseline.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+from collections import namedtuple
+from urllib.parse import urlencode
+
+from common import ROOT_DIR, run_requests, server, start_server, stop_server
+from dataset import (FAIRS, FIRST_NAMES, LAST_NAMES, PRIORITIES, PROJECT_STATUSES, SIZES,
+                     TASK_ACTIONS, TASK_OBJECTS, TASK_STATUSES, generate_dataset)
+
+SERVER_ENV = {'ADMISSION_QUEUE_MS': '0', 'ADMISSION_HEAVY_MAX': '0'}
+
+# Höchste IDs im Datensatz vor dem Lauf
+Dataset = namedtuple('Dataset', 'customers projects tasks')
+
+
+def _one(make):
+    """Szenario aus einer Funktion, die eine einzelne Anfrage erzeugt."""
+    return lambda rnd, ds, n: [make(rnd, ds) for _ in range(n)]
+
+
+def _get(make_path):
+    return _one(lambda rnd, ds: ('GET', make_path(rnd, ds), None))
+
+
+def _delete(table):
+    """Löscht ``n`` verschiedene vorhandene Zeilen (jede ID nur einmal, sonst 404)."""
+    def build(rnd, ds, n):
+        ids = rnd.sample(range(1, getattr(ds, table) + 1), min(n, getattr(ds, table)))
+        return [('DELETE', f'/api/{table}/{row_id}', None) for row_id in ids]
+    return build
+
+
+def _url(path, **params):
+    return f'{path}?{urlencode(params)}'
+
+
+def _date(rnd):
+    return f'{rnd.randint(2024, 2027)}-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}'
+
+
+def _task_body(rnd):
+    return {'title': f'{rnd.choice(TASK_OBJECTS)} {rnd.choice(TASK_ACTIONS)}',
+            'description': 'Lasttest', 'status': rnd.choice(TASK_STATUSES), 'dueDate': _date(rnd),
+            'assignee': f'{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}',
+            'priority': rnd.choice(PRIORITIES)}
+
+
+def _project_body(rnd, ds):
+    return {'name': f'{rnd.choice(FAIRS)} Lasttest', 'customer': 'Lasttest',
+            'fair': rnd.choice(FAIRS), 'size': rnd.randint(9, 600), 'date': _date(rnd),
+            'priority': rnd.choice(PRIORITIES), 'status': rnd.choice(PROJECT_STATUSES),
+            'dueDate': _date(rnd), 'customer_id': rnd.randint(1, ds.customers)}
+
+
+def _tasks_page(rnd, ds):
+    variant = rnd.randrange(5)
+    if variant == 0:
+        return _url('/api/tasks', limit=100, status=rnd.choice(TASK_STATUSES))
+    if variant == 1:
+        return _url('/api/tasks', limit=100, assignee=f'{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}')
+    if variant == 2:
+        return _url('/api/tasks', limit=100, sort='dueDate', due_from=_date(rnd))
+    if variant == 3:
+        # tiefe Seite per Keyset-Cursor
+        row_id = rnd.randint(1, ds.tasks)
+        return _url('/api/tasks', limit=100, cursor=server.encode_cursor(row_id, row_id))
+    return _url('/api/tasks', limit=100, priority=rnd.choice(PRIORITIES), fields='id,title,status')
+
+
+def _search_path(rnd, ds):
+    words = [rnd.choice(TASK_OBJECTS), rnd.choice(FAIRS).split()[0], rnd.choice(LAST_NAMES)]
+    return _url('/api/search', q=' '.join(rnd.sample(words, rnd.randint(1, 2))))
+
+
+# Route -> Szenario(rnd, Datensatz, n) -> Liste von (Methode, Pfad, Body).
+# Reihenfolge = Reihenfolge der Läufe: lesende Routen vor schreibenden,
+# gelöscht wird zuletzt (Aufgaben vor Projekten vor Kunden), danach archiviert
+SCENARIOS = {
+    'GET /api/cache': _get(lambda rnd, ds: '/api/cache'),
+    'GET /api/metrics': _get(lambda rnd, ds: '/api/metrics'),
+    'GET /api/customers': _get(lambda rnd, ds: '/api/customers'),
+    'GET /api/customers/{id}': _get(lambda rnd, ds: f'/api/customers/{rnd.randint(1, ds.customers)}'),
+    'GET /api/customers/{id}/projects': _get(
+        lambda rnd, ds: f'/api/customers/{rnd.randint(1, ds.customers)}/projects'),
+    'GET /api/projects': _get(lambda rnd, ds: rnd.choice([
+        _url('/api/projects', limit=100, status=rnd.choice(PROJECT_STATUSES)),
+        _url('/api/projects', limit=100, sort='-date', date_to=_date(rnd)),
+        _url('/api/projects', limit=100, archive=1, customer_id=rnd.randint(1, ds.customers)),
+    ])),
+    'GET /api/projects/{id}': _get(lambda rnd, ds: f'/api/projects/{rnd.randint(1, ds.projects)}'),
+    'GET /api/projects/{id}/tasks': _get(
+        lambda rnd, ds: f'/api/projects/{rnd.randint(1, ds.projects)}/tasks'),
+    'GET /api/overview': _get(lambda rnd, ds: '/api/overview'),
+    'GET /api/timeline': _get(lambda rnd, ds: rnd.choice([
+        _url('/api/timeline', **{'from': _date(rnd)}),
+        _url('/api/timeline', open=1, limit=100, **{'from': _date(rnd)}),
+    ])),
+    'GET /api/unparsed-dates': _get(lambda rnd, ds: '/api/unparsed-dates'),
+    'GET /api/stats': _get(lambda rnd, ds: '/api/stats'),
+    'GET /api/search': _get(_search_path),
+    'GET /api/changes': _get(lambda rnd, ds: '/api/changes'),
+    'GET /api/export/customers': _get(lambda rnd, ds: _url('/api/export/customers', format='csv')),
+    'GET /api/export/projects': _get(lambda rnd, ds: _url(
+        '/api/export/projects', format=rnd.choice(['columns', 'csv']), status=rnd.choice(PROJECT_STATUSES))),
+    'GET /api/export/tasks': _get(lambda rnd, ds: _url(
+        '/api/export/tasks', format=rnd.choice(['columns', 'csv']), project_id=rnd.randint(1, ds.projects))),
+    'GET /api/tasks': _get(_tasks_page),
+    'GET /api/tasks/open': _get(lambda rnd, ds: rnd.choice([
+        _url('/api/tasks/open', project_id=rnd.randint(1, ds.projects)),
+        _url('/api/tasks/open', assignee=f'{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}'),
+        _url('/api/tasks/open', updated_since=datetime.datetime.now(datetime.timezone.utc).isoformat()),
+    ])),
+    'GET /api/tasks/{id}': _get(lambda rnd, ds: f'/api/tasks/{rnd.randint(1, ds.tasks)}'),
+    'POST /api/customers': _one(lambda rnd, ds: ('POST', '/api/customers', {
+        'name': f'{rnd.choice(LAST_NAMES)} Lasttest GmbH', 'contact_person': rnd.choice(FIRST_NAMES),
+        'email': 'lasttest@example.com'})),
+    'POST /api/projects': _one(lambda rnd, ds: ('POST', '/api/projects', _project_body(rnd, ds))),
+    'POST /api/projects/{id}/tasks': _one(lambda rnd, ds: (
+        'POST', f'/api/projects/{rnd.randint(1, ds.projects)}/tasks', _task_body(rnd))),
+    'POST /api/tasks/bulk': _one(lambda rnd, ds: ('POST', '/api/tasks/bulk', {'update': [
+        {'id': task_id, 'status': rnd.choice(TASK_STATUSES)}
+        for task_id in rnd.sample(range(1, ds.tasks + 1), min(10, ds.tasks))]})),
+    'POST /api/projects/bulk': _one(lambda rnd, ds: ('POST', '/api/projects/bulk', {'update': [
+        {'id': project_id, 'status': rnd.choice(PROJECT_STATUSES)}
+        for project_id in rnd.sample(range(1, ds.projects + 1), min(10, ds.projects))]})),
+    'POST /api/projects/{id}/tasks/bulk': _one(lambda rnd, ds: (
+        'POST', f'/api/projects/{rnd.randint(1, ds.projects)}/tasks/bulk',
+        [_task_body(rnd) for _ in range(10)])),
+    'PUT /api/metrics': _one(lambda rnd, ds: ('PUT', '/api/metrics', {})),
+    'PUT /api/customers/{id}': _one(lambda rnd, ds: (
+        'PUT', f'/api/customers/{rnd.randint(1, ds.customers)}',
+        {'phone': f'+49 30 {rnd.randint(100000, 999999)}'})),
+    'PUT /api/projects/{id}': _one(lambda rnd, ds: (
+        'PUT', f'/api/projects/{rnd.randint(1, ds.projects)}',
+        {'status': rnd.choice(PROJECT_STATUSES), 'dueDate': _date(rnd)})),
+    'PUT /api/tasks/{id}': _one(lambda rnd, ds: (
+        'PUT', f'/api/tasks/{rnd.randint(1, ds.tasks)}',
+        {'status': rnd.choice(TASK_STATUSES), 'assignee': rnd.choice(FIRST_NAMES)})),
+    'DELETE /api/tasks/{id}': _delete('tasks'),
+    'DELETE /api/projects/{id}': _delete('projects'),
+    'DELETE /api/customers/{id}': _delete('customers'),
+    'POST /api/archive': _one(lambda rnd, ds: ('POST', '/api/archive', None)),
+}
+
+
+def dataset_size(db_file):
+    with sqlite3.connect(db_file) as conn:
+        return Dataset(*(conn.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}').fetchone()[0]
+                         for table in Dataset._fields))
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'describe', '--always', '--dirty'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args, db_file):
+    routes = {r.name for r in server.ROUTES.values()}
+    missing = routes - SCENARIOS.keys()
+    if missing:
+        sys.exit(f'Kein Szenario für: {", ".join(sorted(missing))}')
+    ds = dataset_size(db_file)
+    if not all(ds):
+        sys.exit('Der Datensatz braucht mindestens einen Kunden, ein Projekt und eine Aufgabe')
+    # gemessen wird jede Route einzeln bis zur Sättigung, ohne Lastbegrenzung
+    # (die sonst aufwendige Routen mit 503 ablehnen würde, siehe bench_overload.py)
+    env = dict(SERVER_ENV, RESPONSE_CACHE_ENTRIES='0') if args.no_cache else dict(SERVER_ENV)
+    proc, port = start_server(db_file, env)
+    results = {}
+    try:
+        print(f'{"Route":<38} {"req/s":>9} {"p50":>8} {"p90":>8} {"p99":>8} {"max":>8}  Fehler')
+        for name, scenario in SCENARIOS.items():
+            if args.routes and not any(part in name for part in args.routes.split(',')):
+                continue
+            requests = scenario(random.Random(f'{args.seed}:{name}'), ds, args.requests)
+            result = run_requests(port, requests, args.clients, args.max_seconds)
+            results[name] = result
+            print(f'{name:<38} {result["rps"]:>9.1f} {result["p50_ms"]:>6.1f}ms {result["p90_ms"]:>6.1f}ms '
+                  f'{result["p99_ms"]:>6.1f}ms {result["max_ms"]:>6.1f}ms  {result["errors"]}')
+    finally:
+        stop_server(proc)
+    return {
+        'meta': {
+            'created': datetime.datetime.now().isoformat(timespec='seconds'),
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'dataset': ds._asdict(),
+            'seed': args.seed,
+            'clients': args.clients,
+            'requests_per_route': args.requests,
+            'response_cache': not args.no_cache,
+        },
+        'routes': results,
+    }
+
+
+def compare(baseline, current, tolerance):
+    """Gibt die Veränderung je Route aus und liefert die Namen der Regressionen."""
+    for key in ('dataset', 'clients', 'requests_per_route', 'response_cache'):
+        if baseline['meta'].get(key) != current['meta'].get(key):
+            print(f'Achtung: {key} weicht ab ({baseline["meta"].get(key)} -> {current["meta"].get(key)})')
+    print(f'\n{"Route":<38} {"req/s":>17} {"p99 ms":>17}')
+    regressions = []
+    for name, new in current['routes'].items():
+        old = baseline['routes'].get(name)
+        if old is None:
+            print(f'{name:<38} {"neu":>17}')
+            continue
+        rps_change = (new['rps'] / old['rps'] - 1) * 100 if old['rps'] else 0.0
+        p99_change = (new['p99_ms'] / old['p99_ms'] - 1) * 100 if old['p99_ms'] else 0.0
+        regressed = rps_change < -tolerance or p99_change > tolerance or new['errors'] > old['errors']
+        if regressed:
+            regressions.append(name)
+        print(f'{name:<38} {new["rps"]:>9.1f} {rps_change:>+6.1f}% {new["p99_ms"]:>9.1f} {p99_change:>+6.1f}%'
+              f'{"  REGRESSION" if regressed else ""}')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--db', help='Datensatz aus dataset.py (wird kopiert, nicht verändert)')
+    parser.add_argument('--size', choices=SIZES, default='small',
+                        help='ohne --db: Datensatz dieser Größe erzeugen (Standard: small)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=1000, help='Anfragen je Route')
+    parser.add_argument('--max-seconds', type=float, default=30,
+                        help='Höchstdauer je Route (danach keine neuen Anfragen)')
+    parser.add_argument('--routes', help='nur Routen, deren Name einen dieser Teile enthält (a,b,...)')
+    parser.add_argument('--no-cache', action='store_true', help='Antwort-Cache des Servers abschalten')
+    parser.add_argument('--output', help='Ergebnis als JSON speichern')
+    parser.add_argument('--results', help='kein Lauf: dieses gespeicherte Ergebnis verwenden')
+    parser.add_argument('--compare', help='mit dieser Baseline (JSON) vergleichen')
+    parser.add_argument('--tolerance', type=float, default=15,
+                        help='erlaubte Verschlechterung in Prozent (Standard: 15)')
+    args = parser.parse_args()
+
+    if args.results:
+        with open(args.results) as f:
+            current = json.load(f)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            db_file = os.path.join(tmp, 'bench.db')
+            if args.db:
+                with sqlite3.connect(args.db) as src, sqlite3.connect(db_file) as dst:
+                    src.backup(dst)
+            else:
+                generate_dataset(db_file, *SIZES[args.size], seed=args.seed)
+            current = run(args, db_file)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(baseline, current, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Kosten für Routing und Dispatch je Anfrage, ohne Netzwerk.
+
+1. Routenauflösung: server.resolve_route (Tabelle, ein Dictionary-Zugriff)
+   gegen die frühere if-Kette aus do_GET, die hier nachgebildet ist.
+2. Kompletter Durchlauf von handle_one_request im selben Prozess (Anfrage
+   aus einem BytesIO, Antwort in ein BytesIO) für Routen ohne
+   Datenbankzugriff: Cache-Statistik, Cache-Treffer, 404.
+
+    python benchmarks/bench_routing.py --repeat 50000
+"""
+
+import argparse
+import io
+import os
+import tempfile
+import time
+
+from common import seed_database, server
+
+PATHS = [
+    ('erste Route', '/api/cache'),
+    ('Detail', '/api/projects/17'),
+    ('verschachtelt', '/api/projects/17/tasks'),
+    ('letzte Route', '/api/tasks/42'),
+    ('unbekannt', '/api/unknown/1'),
+]
+
+
+def legacy_resolve(path):
+    """Nachbildung der if-Kette aus do_GET vor der Routing-Tabelle."""
+    parts = path.strip('/').split('/')
+    if len(parts) == 2 and parts[1] == 'cache':
+        return 'get_cache_stats'
+    if len(parts) == 2 and parts[1] == 'customers':
+        return 'list_customers'
+    if len(parts) == 3 and parts[1] == 'customers' and parts[2].isdigit():
+        return 'get_customer'
+    if len(parts) == 4 and parts[1] == 'customers' and parts[2].isdigit() and parts[3] == 'projects':
+        return 'list_customer_projects'
+    if len(parts) == 2 and parts[1] == 'projects':
+        return 'list_projects'
+    if len(parts) == 3 and parts[1] == 'projects' and parts[2].isdigit():
+        return 'get_project'
+    if len(parts) == 4 and parts[1] == 'projects' and parts[2].isdigit() and parts[3] == 'tasks':
+        return 'list_project_tasks'
+    if len(parts) == 2 and parts[1] == 'overview':
+        return 'get_overview'
+    if len(parts) == 2 and parts[1] == 'tasks':
+        return 'list_tasks'
+    if len(parts) == 3 and parts[1] == 'tasks' and parts[2].isdigit():
+        return 'get_task'
+    return None
+
+
+def per_call_ns(func, arg, repeat, rounds=5):
+    """Bester Wert aus ``rounds`` Durchläufen, um Störungen durch andere Prozesse auszublenden."""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best / repeat * 1e9
+
+
+def table_resolve(path):
+    route = server.resolve_route('GET', path)[0]
+    return route.handler.__name__ if route else None
+
+
+class FakeServer:
+    """Minimaler Ersatz für PooledHTTPServer im Handler."""
+
+    def should_release_connection(self):
+        return False
+
+
+def handle(raw):
+    """Verarbeitet eine rohe HTTP-Anfrage mit ProjectHandler und liefert die Antwort."""
+    handler = server.ProjectHandler.__new__(server.ProjectHandler)
+    handler.server = FakeServer()
+    handler.client_address = ('127.0.0.1', 0)
+    handler.rfile = io.BytesIO(raw)
+    handler.wfile = io.BytesIO()
+    handler.log_message = lambda *args: None
+    handler.handle_one_request()
+    return handler.wfile.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--repeat', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f'{"Routenauflösung":<16} {"if-Kette":>10} {"Tabelle":>10}')
+    for name, path in PATHS:
+        assert legacy_resolve(path) == table_resolve(path), path
+        legacy = per_call_ns(legacy_resolve, path, args.repeat)
+        table = per_call_ns(table_resolve, path, args.repeat)
+        print(f'{name:<16} {legacy:>8.0f}ns {table:>8.0f}ns')
+
+    with tempfile.TemporaryDirectory() as tmp:
+        seed_database(os.path.join(tmp, 'bench.db'), customers=5, projects=50, tasks_per_project=10)
+        print(f'\n{"Dispatch":<16} {"µs/Anfrage":>10}  Antwort')
+        for name, path in [('Cache-Statistik', '/api/cache'),
+                           ('Cache-Treffer', '/api/tasks/42'),
+                           ('404', '/api/unknown/1')]:
+            raw = f'GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n'.encode()
+            status = handle(raw).split(b'\r\n', 1)[0].decode()  # füllt den Cache
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                handle(raw)
+            elapsed = (time.perf_counter() - start) / args.requests * 1e6
+            print(f'{name:<16} {elapsed:>10.1f}  {status}')
+        server.db_pool.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Suche über ein großes Archiv: FTS5-Index (/api/search) gegen das bisherige
+Vorgehen der Frontends (komplette Listen laden und im Client filtern) und
+gegen eine LIKE-Abfrage ohne Index.
+
+Gemessen wird im selben Prozess direkt auf der Datenbank; für den Client-Fall
+zählt die JSON-Kodierung und -Dekodierung der vollständigen Listen mit.
+
+    python benchmarks/bench_search.py --projects 2500 --tasks-per-project 50
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import time
+
+from common import seed_database, server
+
+QUERIES = ['Messe 12', 'Mitarbeiter 3', 'Aufgabe 17', 'Kunde 4']
+
+
+def best_ms(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def fts_search(conn, q):
+    sql, args, _ = server.build_search_query({'q': q})
+    return [server.search_result(row) for row in conn.execute(sql, args).fetchall()]
+
+
+def client_filter(conn, q):
+    """Nachbildung der Frontends: alle Projekte und Aufgaben laden, dann filtern."""
+    tasks = json.loads(json.dumps([dict(r) for r in conn.execute('SELECT * FROM tasks')]))
+    projects = json.loads(json.dumps([dict(r) for r in conn.execute('SELECT * FROM projects')]))
+    term = q.lower()
+    return ([t for t in tasks if term in (t['title'] or '').lower()] +
+            [p for p in projects if term in (p['name'] or '').lower()
+             or term in (p['fair'] or '').lower()])
+
+
+def like_search(conn, q):
+    pattern = f'%{q}%'
+    return (conn.execute('SELECT * FROM tasks WHERE title LIKE ? OR description LIKE ? OR assignee LIKE ? '
+                         'LIMIT 20', (pattern, pattern, pattern)).fetchall() +
+            conn.execute('SELECT * FROM projects WHERE name LIKE ? OR fair LIKE ? OR customer LIKE ? '
+                         'LIMIT 20', (pattern, pattern, pattern)).fetchall())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--projects', type=int, default=2500)
+    parser.add_argument('--tasks-per-project', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'bench.db')
+        seed_database(db_file, customers=200, projects=args.projects,
+                      tasks_per_project=args.tasks_per_project)
+        conn = sqlite3.connect(db_file)
+        conn.row_factory = sqlite3.Row
+        print(f'{args.projects} Projekte, {args.projects * args.tasks_per_project} Aufgaben\n')
+        print(f'{"Suche":<16} {"FTS5":>9} {"LIKE":>9} {"Client":>9}  Treffer (erste Seite)')
+        for q in QUERIES:
+            fts_ms, hits = best_ms(lambda: fts_search(conn, q), args.repeat)
+            like_ms, _ = best_ms(lambda: like_search(conn, q), args.repeat)
+            client_ms, _ = best_ms(lambda: client_filter(conn, q), max(1, args.repeat // 2))
+            print(f'{q:<16} {fts_ms:>7.1f}ms {like_ms:>7.1f}ms {client_ms:>7.1f}ms  {len(hits)}')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Lasttest: Worker-Pool-Server gegen den bisherigen single-threaded HTTPServer.
+
+Beide Server laufen als eigener Prozess gegen dieselbe synthetische Datenbank.
+Gemessen werden Durchsatz und p50/p99-Latenz bei gemischten Anfragen
+(kleine Einzelabfragen plus große Listen). Optional halten "langsame Clients"
+Verbindungen offen, ohne ihre Anfrage fertig zu senden.
+
+    python benchmarks/bench_server.py --clients 32 --duration 10
+"""
+
+import argparse
+import os
+import socket
+import tempfile
+import time
+
+from common import format_result, run_load, seed_database, start_server, stop_server
+
+# Der bisherige Server: unveränderte Kopie von server.py vor dem Worker-Pool
+# (baseline_server.py, HTTPServer ohne Threads, eine Verbindung pro Anfrage),
+# damit sich der Vergleichswert mit späteren Änderungen an server.py nicht
+# verschiebt. Nur Datenbank und Verzeichnis der statischen Dateien werden gesetzt.
+BASELINE_CODE = (
+    'import os, sys\n'
+    'sys.path.insert(0, "benchmarks")\n'
+    'import baseline_server\n'
+    'baseline_server.DB_FILE = os.environ["DB_FILE"]\n'
+    'baseline_server.STATIC_DIR = os.getcwd()\n'
+    'baseline_server.run_server()\n'
+)
+
+
+def open_slow_clients(port, count):
+    """Öffnet Verbindungen, die nur einen Teil der Anfragezeile senden."""
+    socks = []
+    for _ in range(count):
+        s = socket.create_connection(('127.0.0.1', port))
+        s.sendall(b'GET /api/projects HT')
+        socks.append(s)
+    return socks
+
+
+def bench(name, db_file, args, env=None, code=None):
+    proc, port = start_server(db_file, env=env, code=code)
+    slow = []
+    try:
+        slow = open_slow_clients(port, args.slow_clients)
+        time.sleep(0.2)
+        paths = ['/api/projects/1', '/api/tasks/1', '/api/customers', '/api/projects/2/tasks',
+                 '/api/projects']
+        if args.with_task_dump:
+            paths.append('/api/tasks')
+        result = run_load(port, paths, clients=args.clients, duration=args.duration)
+        print(format_result(name, result))
+        return result
+    finally:
+        for s in slow:
+            s.close()
+        stop_server(proc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--workers', type=int, default=16)
+    parser.add_argument('--slow-clients', type=int, default=0)
+    parser.add_argument('--with-task-dump', action='store_true',
+                        help='auch /api/tasks (alle Aufgaben) abfragen')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'bench.db')
+        seed_database(db_file)
+        base = bench('HTTPServer (bisher)', db_file, args, code=BASELINE_CODE)
+        pooled = bench(f'Worker-Pool ({args.workers} Threads)', db_file, args,
+                       env={'WORKER_THREADS': str(args.workers)})
+    if base['rps']:
+        print(f'Durchsatz: x{pooled["rps"] / base["rps"]:.2f}, '
+              f'p99: {base["p99_ms"]:.1f} ms -> {pooled["p99_ms"]:.1f} ms')
+
+
+if __name__ == '__main__':
+    main()
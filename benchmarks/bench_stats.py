@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Übersicht und Dashboard-Zahlen: vorberechnete project_stats gegen die
+bisherige Gruppierung aller Aufgaben bei jeder Anfrage.
+
+Gemessen wird im selben Prozess direkt auf der Datenbank (ohne Cache),
+außerdem der Mehraufwand der Zähler-Trigger beim Schreiben von Aufgaben.
+
+    python benchmarks/bench_stats.py --projects 2500 --tasks-per-project 50
+"""
+
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from common import seed_database, server
+
+# Übersicht vor project_stats: alle Aufgaben je Anfrage gruppieren
+LEGACY_OVERVIEW_SQL = """
+    SELECT p.*,
+           COALESCE(c.totalTasks, 0) AS totalTasks,
+           COALESCE(c.todoTasks, 0) AS todoTasks,
+           COALESCE(c.inProgressTasks, 0) AS inProgressTasks,
+           COALESCE(c.doneTasks, 0) AS doneTasks,
+           COALESCE(c.totalTasks - c.doneTasks, 0) AS openTasks
+    FROM projects p
+    LEFT JOIN (
+        SELECT project_id,
+               COUNT(*) AS totalTasks,
+               SUM(status = 'ToDo') AS todoTasks,
+               SUM(status = 'InBearbeitung') AS inProgressTasks,
+               SUM(status = 'Done') AS doneTasks
+        FROM tasks
+        GROUP BY project_id
+    ) c ON c.project_id = p.id
+"""
+
+
+def best_ms(func, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def write_ms(conn, count, drop_triggers):
+    """Aktualisiert ``count`` Aufgaben einzeln und liefert ms je Schreibvorgang."""
+    conn.execute('SAVEPOINT bench')
+    if drop_triggers:
+        for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' "
+                                    "AND name LIKE '%\\_stats' ESCAPE '\\'").fetchall():
+            conn.execute(f'DROP TRIGGER {name}')
+    start = time.perf_counter()
+    for task_id in range(1, count + 1):
+        conn.execute("UPDATE tasks SET status = CASE status WHEN 'Done' THEN 'ToDo' ELSE 'Done' END, "
+                     "dueDate = '2025-03-01' WHERE id = ?", (task_id,))
+    elapsed = time.perf_counter() - start
+    conn.execute('ROLLBACK TO bench')
+    conn.execute('RELEASE bench')
+    return elapsed / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--projects', type=int, default=2500)
+    parser.add_argument('--tasks-per-project', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--writes', type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'bench.db')
+        seed_database(db_file, customers=200, projects=args.projects,
+                      tasks_per_project=args.tasks_per_project)
+        conn = sqlite3.connect(db_file, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        today = server.today_iso()
+        print(f'{args.projects} Projekte, {args.projects * args.tasks_per_project} Aufgaben\n')
+
+        legacy = best_ms(lambda: conn.execute(LEGACY_OVERVIEW_SQL).fetchall(), args.repeat)
+        overview = best_ms(lambda: conn.execute(server.OVERVIEW_SQL, (today,)).fetchall(), args.repeat)
+        stats = best_ms(lambda: server.summarize_stats(
+            [dict(r) for r in conn.execute(server.STATS_SQL, (today,))]), args.repeat)
+        print(f'{"Übersicht (GROUP BY über alle Aufgaben)":<44} {legacy:>8.1f}ms')
+        print(f'{"Übersicht (project_stats + überfällig)":<44} {overview:>8.1f}ms')
+        print(f'{"/api/stats (project_stats + Summen)":<44} {stats:>8.1f}ms')
+
+        with_triggers = write_ms(conn, args.writes, drop_triggers=False)
+        without = write_ms(conn, args.writes, drop_triggers=True)
+        print(f'\n{"Aufgabe ändern mit Zähler-Triggern":<44} {with_triggers * 1000:>8.1f}µs')
+        print(f'{"Aufgabe ändern ohne Zähler-Trigger":<44} {without * 1000:>8.1f}µs')
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Vergleicht gestreamte und gepufferte Antworten für große Listen (/api/tasks).
+
+Gemessen werden Time-to-first-Byte, Gesamtdauer und der Spitzen-Speicherbedarf
+(VmHWM) des Serverprozesses. Die gepufferte Variante baut wie früher die
+komplette Liste und einen JSON-String im Speicher auf.
+
+    python benchmarks/bench_streaming.py --projects 2000 --tasks-per-project 100
+"""
+
+import argparse
+import http.client
+import os
+import tempfile
+import time
+
+from common import seed_database, start_server, stop_server
+
+BUFFERED_CODE = (
+    'import json, server\n'
+    'def buffered(self, cursor, fields):\n'
+    '    body = json.dumps([dict(zip(fields, row)) for row in cursor.fetchall()]).encode()\n'
+    '    self._set_headers(content_length=len(body))\n'
+    '    self.wfile.write(body)\n'
+    'server.ProjectHandler._stream_rows = buffered\n'
+    'server.run_server()\n'
+)
+
+
+def peak_rss_mb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def measure(port, path, accept='application/json'):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+    start = time.perf_counter()
+    conn.request('GET', path, headers={'Accept': accept})
+    resp = conn.getresponse()
+    resp.read(1)
+    ttfb = time.perf_counter() - start
+    size = 1 + len(resp.read())
+    total = time.perf_counter() - start
+    conn.close()
+    return ttfb * 1000, total * 1000, size
+
+
+def bench(name, db_file, code=None, accept='application/json'):
+    proc, port = start_server(db_file, code=code)
+    try:
+        ttfb, total, size = measure(port, '/api/tasks', accept)
+        rss = peak_rss_mb(proc.pid)
+        print(f'{name:<22} TTFB {ttfb:>8.1f} ms  gesamt {total:>8.1f} ms  '
+              f'{size / 1e6:>7.1f} MB  Server-RSS (Spitze) {rss:>7.1f} MB')
+    finally:
+        stop_server(proc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--projects', type=int, default=2000)
+    parser.add_argument('--tasks-per-project', type=int, default=100)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'bench.db')
+        seed_database(db_file, projects=args.projects, tasks_per_project=args.tasks_per_project)
+        bench('gepuffert (bisher)', db_file, code=BUFFERED_CODE)
+        bench('gestreamt (JSON)', db_file)
+        bench('gestreamt (NDJSON)', db_file, accept='application/x-ndjson')
+
+
+if __name__ == '__main__':
+    main()
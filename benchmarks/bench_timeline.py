@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Termine: /api/timeline gegen Laden aller Aufgaben und Projekte mit Filtern
+im Client (wie bisher in den Frontends).
+
+Verglichen werden "diese Woche fällig" und "überfällig" auf einem
+synthetischen Datensatz (siehe dataset.py) ohne Antwort-Cache: Dauer bis
+zur fertigen Liste und übertragene Bytes. Der bisherige Weg lädt
+/api/tasks und /api/projects komplett, filtert und sortiert nach Datum.
+
+    python benchmarks/bench_timeline.py --size medium
+"""
+
+import argparse
+import datetime
+import http.client
+import json
+import os
+import statistics
+import tempfile
+import time
+
+from common import start_server, stop_server
+from dataset import SIZES, generate_dataset
+
+SERVER_ENV = {'RESPONSE_CACHE_ENTRIES': '0'}
+
+
+def fetch(port, path):
+    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+    conn.request('GET', path)
+    resp = conn.getresponse()
+    body = resp.read()
+    conn.close()
+    if resp.status != 200:
+        raise RuntimeError(f'{path}: {resp.status}')
+    return body
+
+
+def client_side(port, start, end, open_only):
+    """Bisheriger Weg: alles laden, im Client filtern und sortieren."""
+    tasks = fetch(port, '/api/tasks')
+    projects = fetch(port, '/api/projects')
+    names = {p['id']: p['name'] for p in json.loads(projects)}
+    items = [('task', t['id'], t['dueDate'], names.get(t['project_id'])) for t in json.loads(tasks)
+             if t['dueDate'] and (start is None or t['dueDate'] >= start) and t['dueDate'] <= end
+             and not (open_only and t['status'] == 'Done')]
+    items += [('project', p['id'], p['dueDate'], p['name']) for p in json.loads(projects)
+              if p['dueDate'] and (start is None or p['dueDate'] >= start) and p['dueDate'] <= end
+              and not (open_only and p['status'] == 'Abgeschlossen')]
+    items.sort(key=lambda item: (item[2], item[0], item[1]))
+    return len(tasks) + len(projects), len(items)
+
+
+def timeline(port, start, end, open_only):
+    """Neuer Weg: alle Seiten von /api/timeline."""
+    path = f'/api/timeline?to={end}&limit=1000' + (f'&from={start}' if start else '') + ('&open=1' if open_only else '')
+    size = count = 0
+    while path:
+        conn = http.client.HTTPConnection('127.0.0.1', port, timeout=600)
+        conn.request('GET', path)
+        resp = conn.getresponse()
+        body = resp.read()
+        link = resp.getheader('Link')
+        conn.close()
+        size += len(body)
+        count += len(json.loads(body))
+        path = link[1:link.index('>')] if link else None
+    return size, count
+
+
+def measure(func, repeat, *args):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        size, count = func(*args)
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times), size, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size', choices=SIZES, default='medium')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    today = datetime.date.today()
+    cases = [
+        ('diese Woche fällig', today.isoformat(), (today + datetime.timedelta(days=6)).isoformat(), False),
+        ('überfällig (offen)', None, (today - datetime.timedelta(days=1)).isoformat(), True),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        db_file = os.path.join(tmp, 'bench.db')
+        generate_dataset(db_file, *SIZES[args.size])
+        proc, port = start_server(db_file, SERVER_ENV)
+        try:
+            print(f'{"":<22} {"Weg":<10} {"ms":>9} {"KB":>10} {"Termine":>8}')
+            for label, start, end, open_only in cases:
+                for name, func in (('Client', client_side), ('timeline', timeline)):
+                    ms, size, count = measure(func, args.repeat, port, start, end, open_only)
+                    print(f'{label:<22} {name:<10} {ms:>9.1f} {size / 1024:>10.1f} {count:>8}')
+        finally:
+            stop_server(proc)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Schreibdurchsatz: Commit je Anfrage gegen Group Commit (WriteQueue).
+
+Viele Clients ändern und legen gleichzeitig Aufgaben an (PUT /api/tasks/{id},
+POST /api/projects/{id}/tasks). Verglichen werden WRITE_BATCH_MAX=0 (jede
+Anfrage committet selbst über den Verbindungspool) und der Schreib-Thread
+mit verschiedenen Sammelfenstern, jeweils mit DB_SYNCHRONOUS NORMAL und
+FULL (ein fsync je Commit). Jede Konfiguration startet auf einer frischen
+Kopie derselben Datenbank.
+
+    python benchmarks/bench_writes.py --clients 32 --requests 4000
+"""
+
+import argparse
+import os
+import random
+import re
+import shutil
+import tempfile
+import urllib.request
+
+from common import format_result, run_requests, seed_database, start_server, stop_server
+
+CONFIGS = [
+    ('Commit je Anfrage', {'WRITE_BATCH_MAX': '0'}),
+    ('Group Commit, 0 ms', {'WRITE_BATCH_MAX': '64', 'WRITE_BATCH_MS': '0'}),
+    ('Group Commit, 1 ms', {'WRITE_BATCH_MAX': '64', 'WRITE_BATCH_MS': '1'}),
+]
+
+PROJECTS = 300
+TASKS_PER_PROJECT = 20
+
+
+def write_requests(count, seed=1):
+    rnd = random.Random(seed)
+    requests = []
+    for i in range(count):
+        if i % 4 == 3:
+            requests.append(('POST', f'/api/projects/{rnd.randint(1, PROJECTS)}/tasks',
+                             {'title': f'Neue Aufgabe {i}', 'priority': 'Mittel'}))
+        else:
+            requests.append(('PUT', f'/api/tasks/{rnd.randint(1, PROJECTS * TASKS_PER_PROJECT)}',
+                             {'status': rnd.choice(['ToDo', 'InBearbeitung', 'Done'])}))
+    return requests
+
+
+def batch_ratio(port):
+    """Schreibanfragen je Transaktion laut /api/metrics (None ohne Schreib-Thread)."""
+    with urllib.request.urlopen(f'http://127.0.0.1:{port}/api/metrics') as resp:
+        text = resp.read().decode()
+    values = dict(re.findall(r'^messebau_(write_\w+_total) (\S+)$', text, re.M))
+    batches = float(values.get('write_batches_total', 0))
+    return float(values['write_jobs_total']) / batches if batches else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=4000)
+    parser.add_argument('--synchronous', nargs='+', default=['NORMAL', 'FULL'])
+    args = parser.parse_args()
+
+    requests = write_requests(args.requests)
+    with tempfile.TemporaryDirectory() as tmp:
+        template = os.path.join(tmp, 'template.db')
+        seed_database(template, customers=50, projects=PROJECTS, tasks_per_project=TASKS_PER_PROJECT)
+        print(f'{args.requests} Schreibanfragen, {args.clients} Clients\n')
+        for synchronous in args.synchronous:
+            print(f'DB_SYNCHRONOUS={synchronous}')
+            for name, env in CONFIGS:
+                db_file = os.path.join(tmp, 'bench.db')
+                shutil.copyfile(template, db_file)
+                proc, port = start_server(db_file, dict(env, DB_SYNCHRONOUS=synchronous))
+                try:
+                    result = run_requests(port, requests, args.clients)
+                    ratio = batch_ratio(port)
+                finally:
+                    stop_server(proc)
+                for suffix in ('', '-wal', '-shm'):
+                    if os.path.exists(db_file + suffix):
+                        os.remove(db_file + suffix)
+                print(format_result(name, result)
+                      + (f'  {ratio:.1f} je Commit' if ratio is not None else ''))
+            print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,229 @@
+"""
+Gemeinsame Hilfsfunktionen für die Benchmarks.
+
+Die Benchmarks starten den Server immer als eigenen Prozess gegen eine
+temporäre Datenbank, damit Client-Threads und Server nicht um dieselbe
+GIL konkurrieren und projects.db unangetastet bleibt.
+"""
+
+import http.client
+import json
+import os
+import random
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import server  # noqa: E402
+
+
+def free_port():
+    """Liefert einen freien TCP-Port auf localhost."""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def seed_database(db_file, customers=50, projects=300, tasks_per_project=40, seed=1):
+    """Legt eine Datenbank mit synthetischen Kunden, Projekten und Aufgaben an."""
+    rnd = random.Random(seed)
+    server.DB_FILE = db_file
+    server.init_db()
+    statuses = ['Anfrage', 'Angebot', 'Auftrag', 'Design', 'Produktion',
+                'Logistik', 'Montage', 'Abbau', 'Abgeschlossen']
+    task_statuses = ['ToDo', 'InBearbeitung', 'Done']
+    with sqlite3.connect(db_file) as conn:
+        conn.executemany(
+            'INSERT INTO customers (name, contact_person, email) VALUES (?, ?, ?)',
+            [(f'Kunde {i}', f'Ansprechpartner {i}', f'kunde{i}@example.com')
+             for i in range(customers)]
+        )
+        conn.executemany(
+            'INSERT INTO projects (name, customer, fair, size, date, status, dueDate, customer_id) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [(f'Projekt {i}', f'Kunde {i % customers}', f'Messe {i % 17}', rnd.randint(9, 400),
+              f'2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}', rnd.choice(statuses),
+              f'2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}', i % customers + 1)
+             for i in range(projects)]
+        )
+        conn.executemany(
+            'INSERT INTO tasks (project_id, title, description, status, dueDate, assignee, priority) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(p + 1, f'Aufgabe {t}', 'Beschreibung ' * 5, rnd.choice(task_statuses),
+              f'2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}', f'Mitarbeiter {t % 7}',
+              rnd.choice(['Hoch', 'Mittel', 'Niedrig']))
+             for p in range(projects) for t in range(tasks_per_project)]
+        )
+        conn.commit()
+
+
+def start_server(db_file, env=None, code=None):
+    """
+    Startet den Server als Subprozess und wartet, bis er Verbindungen annimmt.
+
+    ``code`` ersetzt optional den Startbefehl (z.B. für einen Vergleichsserver).
+    Gibt ``(process, port)`` zurück.
+    """
+    port = free_port()
+    full_env = dict(os.environ, PORT=str(port), DB_FILE=db_file)
+    full_env.update(env or {})
+    args = [sys.executable, '-c', code] if code else [sys.executable, 'server.py']
+    proc = subprocess.Popen(args, cwd=ROOT_DIR, env=full_env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 15
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return proc, port
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError('Server ist nicht gestartet')
+
+
+def stop_server(proc):
+    proc.terminate()
+    try:
+        proc.wait(10)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def percentile(values, pct):
+    """Perzentil (0–100) einer Liste von Messwerten."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    k = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def run_load(port, paths, clients=16, duration=5.0, keep_alive=True):
+    """
+    Lässt ``clients`` Threads für ``duration`` Sekunden GET-Anfragen auf ``paths``
+    senden und liefert Durchsatz und Latenzen (ms).
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.time() + duration
+
+    def client(idx):
+        own = []
+        conn = None
+        i = idx
+        while time.time() < stop_at:
+            path = paths[i % len(paths)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+                conn.request('GET', path, headers={} if keep_alive else {'Connection': 'close'})
+                resp = conn.getresponse()
+                resp.read()
+                if resp.status >= 400:
+                    raise RuntimeError(resp.status)
+                if not keep_alive or resp.will_close:
+                    conn.close()
+                    conn = None
+            except Exception:
+                with lock:
+                    errors[0] += 1
+                if conn is not None:
+                    conn.close()
+                conn = None
+                continue
+            own.append((time.perf_counter() - start) * 1000)
+        if conn is not None:
+            conn.close()
+        with lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(latencies, errors[0], time.time() - started)
+
+
+def run_requests(port, requests, clients=16, max_seconds=None):
+    """
+    Sendet die Anfragen ``requests`` (Liste von ``(Methode, Pfad, JSON-Body
+    oder None)``) über ``clients`` Keep-Alive-Verbindungen parallel; Client i
+    übernimmt jede ``clients``-te Anfrage ab i. Nach ``max_seconds`` werden
+    keine neuen Anfragen mehr gestartet. Liefert Durchsatz und Latenzen (ms).
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    stop_at = time.time() + max_seconds if max_seconds else float('inf')
+
+    def client(idx):
+        own = []
+        failed = 0
+        conn = None
+        for method, path, body in requests[idx::clients]:
+            if time.time() >= stop_at:
+                break
+            data = json.dumps(body).encode() if body is not None else None
+            headers = {'Content-Type': 'application/json'} if data is not None else {}
+            start = time.perf_counter()
+            try:
+                if conn is None:
+                    conn = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                conn.request(method, path, body=data, headers=headers)
+                resp = conn.getresponse()
+                resp.read()
+                if resp.will_close:
+                    conn.close()
+                    conn = None
+                if resp.status >= 400:
+                    raise RuntimeError(resp.status)
+            except Exception:
+                failed += 1
+                if conn is not None:
+                    conn.close()
+                conn = None
+                continue
+            own.append((time.perf_counter() - start) * 1000)
+        if conn is not None:
+            conn.close()
+        with lock:
+            latencies.extend(own)
+            errors[0] += failed
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    started = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return summarize(latencies, errors[0], time.time() - started)
+
+
+def summarize(latencies, errors, elapsed):
+    """Durchsatz (erfolgreiche Anfragen/s) und Latenz-Perzentile in ms."""
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': len(latencies) / elapsed if elapsed else 0.0,
+        'mean_ms': sum(latencies) / len(latencies) if latencies else 0.0,
+        'p50_ms': percentile(latencies, 50),
+        'p90_ms': percentile(latencies, 90),
+        'p99_ms': percentile(latencies, 99),
+        'max_ms': max(latencies) if latencies else 0.0,
+    }
+
+
+def format_result(name, result):
+    return (f'{name:<28} {result["rps"]:>9.1f} req/s  p50 {result["p50_ms"]:>8.1f} ms  '
+            f'p99 {result["p99_ms"]:>8.1f} ms  Fehler {result["errors"]}')
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Erzeugt eine synthetische Datenbank mit Kunden, Projekten und Aufgaben in
+wählbarer Größe, reproduzierbar über --seed.
+
+Die Zeilen werden ohne Trigger in das Basisschema (Migration 1) geladen;
+danach bringt server.init_db() die Datenbank wie eine bestehende
+Produktionsdatenbank auf den aktuellen Stand (Indizes, Volltextindex,
+Zähler). Aufgaben verteilen sich ungleich auf die Projekte, Texte stammen
+aus einem kleinen Messebau-Wortschatz, damit Suche und Filter realistische
+Trefferzahlen liefern.
+
+    python benchmarks/dataset.py --size large /tmp/large.db
+    python benchmarks/dataset.py --customers 1000 --projects 20000 --tasks 1000000 /tmp/large.db
+"""
+
+import argparse
+import datetime
+import itertools
+import os
+import random
+import sqlite3
+import sys
+import time
+
+from common import server
+
+# Voreinstellungen: (Kunden, Projekte, Aufgaben)
+SIZES = {
+    'small': (100, 1000, 20000),
+    'medium': (500, 5000, 200000),
+    'large': (1000, 20000, 1000000),
+}
+
+PROJECT_STATUSES = ['Anfrage', 'Angebot', 'Auftrag', 'Design', 'Produktion',
+                    'Logistik', 'Montage', 'Abbau', 'Abgeschlossen']
+TASK_STATUSES = ['ToDo', 'InBearbeitung', 'Done']
+TASK_STATUS_WEIGHTS = [40, 25, 35]
+PRIORITIES = ['Hoch', 'Mittel', 'Niedrig']
+
+FAIRS = ['Hannover Messe', 'IAA Mobility', 'bauma', 'drupa', 'EuroShop', 'Anuga', 'ISPO',
+         'interpack', 'MEDICA', 'Light + Building', 'ITB', 'Fruit Logistica', 'gamescom',
+         'Ambiente', 'IFA', 'Agritechnica', 'BAU', 'Intersolar', 'FIBO', 'boot']
+CITIES = ['Berlin', 'Hamburg', 'München', 'Köln', 'Frankfurt', 'Stuttgart', 'Düsseldorf',
+          'Leipzig', 'Hannover', 'Nürnberg', 'Essen', 'Dresden']
+FIRST_NAMES = ['Anna', 'Ben', 'Clara', 'David', 'Emma', 'Felix', 'Greta', 'Hannah', 'Jonas',
+               'Julia', 'Lena', 'Lukas', 'Marie', 'Max', 'Mia', 'Noah', 'Paul', 'Sophie', 'Tim',
+               'Zoe']
+LAST_NAMES = ['Müller', 'Schmidt', 'Schneider', 'Fischer', 'Weber', 'Meyer', 'Wagner',
+              'Becker', 'Schulz', 'Hoffmann', 'Koch', 'Richter', 'Klein', 'Wolf', 'Schröder',
+              'Neumann', 'Schwarz', 'Braun', 'Zimmermann', 'Krüger']
+COMPANY_KINDS = ['Messebau', 'Technik', 'Foods', 'Systems', 'Design']
+COMPANY_FORMS = ['GmbH', 'AG', 'KG', 'GmbH & Co. KG', 'SE']
+NEXT_STEPS = [None, 'Angebot senden', 'Entwurf abstimmen', 'Aufbau planen', 'Rechnung stellen']
+# Gegenstände und Tätigkeiten für Aufgabentitel und Beschreibungen
+TASK_OBJECTS = ['Standplan', 'Grafik', 'Beleuchtung', 'Bodenbelag', 'Transport', 'Elektro',
+                'Möbel', 'Catering', 'Genehmigung', 'Statik', 'Druckdaten', 'Rigging',
+                'Lagerfläche', 'Wasseranschluss', 'Bildschirme', 'Theke', 'Teppich',
+                'Hängepunkte', 'Brandschutz', 'Reinigung']
+TASK_ACTIONS = ['prüfen', 'bestellen', 'freigeben', 'abstimmen', 'planen', 'liefern',
+                'aufbauen', 'abbauen', 'anfragen', 'korrigieren']
+FILLER_WORDS = ['Kunde', 'Messe', 'Halle', 'Stand', 'Termin', 'Angebot', 'Rechnung',
+                'Aufbau', 'Abbau', 'Spedition', 'Layout', 'Freigabe', 'Nachtrag', 'dringend']
+
+# Termine liegen in diesem Zeitraum (fest, damit Datensätze reproduzierbar bleiben)
+FIRST_DAY = datetime.date(2024, 1, 1).toordinal()
+DAYS = 4 * 365
+
+BATCH_ROWS = 10000
+
+
+def _date(rnd):
+    return datetime.date.fromordinal(FIRST_DAY + rnd.randrange(DAYS)).isoformat()
+
+
+def _customers(rnd, count):
+    for i in range(count):
+        first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+        company = (f'{rnd.choice(LAST_NAMES)} {rnd.choice(COMPANY_KINDS)} '
+                   f'{rnd.choice(COMPANY_FORMS)} {i + 1}')
+        yield (company, f'{first} {last}', f'{first.lower()}.{last.lower()}@kunde{i + 1}.example',
+               f'+49 {rnd.randint(30, 999)} {rnd.randint(100000, 9999999)}',
+               f'{rnd.choice(LAST_NAMES)}straße {rnd.randint(1, 200)}, {rnd.choice(CITIES)}',
+               rnd.choice([None, None, 'Hausfarben beachten', 'Logo nur in Weiß', 'offenes Standkonzept']))
+
+
+def _projects(rnd, count, customer_names):
+    for i in range(count):
+        customer_id = rnd.randrange(len(customer_names)) + 1
+        fair = rnd.choice(FAIRS)
+        yield (f'{fair} {rnd.randint(2024, 2027)} – Stand {i + 1}', customer_names[customer_id - 1], fair,
+               rnd.choice([None, rnd.randint(9, 600)]), _date(rnd), rnd.choice(PRIORITIES),
+               rnd.choice(PROJECT_STATUSES), rnd.choice(NEXT_STEPS),
+               _date(rnd) if rnd.random() < 0.9 else None, customer_id)
+
+
+def _tasks(rnd, count, projects):
+    # ungleich große Projekte: Gewichte log-normalverteilt
+    weights = list(itertools.accumulate(rnd.lognormvariate(0, 1) for _ in range(projects)))
+    project_ids = rnd.choices(range(1, projects + 1), cum_weights=weights, k=count)
+    for project_id in project_ids:
+        obj, action = rnd.choice(TASK_OBJECTS), rnd.choice(TASK_ACTIONS)
+        description = ' '.join(rnd.choices(FILLER_WORDS + TASK_OBJECTS, k=rnd.randint(0, 30))) or None
+        yield (project_id, f'{obj} {action}', description,
+               rnd.choices(TASK_STATUSES, TASK_STATUS_WEIGHTS)[0],
+               _date(rnd) if rnd.random() < 0.85 else None,
+               f'{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)}' if rnd.random() < 0.8 else None,
+               rnd.choice(PRIORITIES))
+
+
+def _insert(conn, sql, rows):
+    while True:
+        batch = list(itertools.islice(rows, BATCH_ROWS))
+        if not batch:
+            return
+        conn.executemany(sql, batch)
+
+
+def generate_dataset(db_file, customers, projects, tasks, seed=1):
+    """
+    Legt ``db_file`` (darf noch nicht existieren) mit der angegebenen Anzahl
+    Kunden, Projekte und Aufgaben an und migriert es auf den aktuellen Stand.
+    """
+    if os.path.exists(db_file):
+        raise FileExistsError(db_file)
+    rnd = random.Random(seed)
+    conn = sqlite3.connect(db_file, isolation_level=None)
+    try:
+        conn.execute('PRAGMA journal_mode = WAL')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('BEGIN')
+        _, _, migrate_base_schema = server.MIGRATIONS[0]
+        migrate_base_schema(conn)
+        conn.execute(f'PRAGMA user_version = {server.MIGRATIONS[0][0]}')
+        customer_rows = list(_customers(rnd, customers))
+        conn.executemany('INSERT INTO customers (name, contact_person, email, phone, address, design_note) '
+                         'VALUES (?, ?, ?, ?, ?, ?)', customer_rows)
+        if customers:
+            _insert(conn, 'INSERT INTO projects (name, customer, fair, size, date, priority, status, '
+                          'nextStep, dueDate, customer_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    _projects(rnd, projects, [row[0] for row in customer_rows]))
+        if projects:
+            _insert(conn, 'INSERT INTO tasks (project_id, title, description, status, dueDate, '
+                          'assignee, priority) VALUES (?, ?, ?, ?, ?, ?, ?)', _tasks(rnd, tasks, projects))
+        conn.execute('COMMIT')
+    finally:
+        conn.close()
+    server.DB_FILE = db_file
+    server.init_db()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('db_file')
+    parser.add_argument('--size', choices=SIZES, default='small',
+                        help='Voreinstellung für Kunden/Projekte/Aufgaben (Standard: small)')
+    parser.add_argument('--customers', type=int)
+    parser.add_argument('--projects', type=int)
+    parser.add_argument('--tasks', type=int)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--force', action='store_true', help='vorhandene Datei überschreiben')
+    args = parser.parse_args()
+
+    customers, projects, tasks = SIZES[args.size]
+    customers = customers if args.customers is None else args.customers
+    projects = projects if args.projects is None else args.projects
+    tasks = tasks if args.tasks is None else args.tasks
+    if os.path.exists(args.db_file):
+        if not args.force:
+            sys.exit(f'{args.db_file} existiert bereits (--force zum Überschreiben)')
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(args.db_file + suffix):
+                os.remove(args.db_file + suffix)
+    start = time.perf_counter()
+    generate_dataset(args.db_file, customers, projects, tasks, args.seed)
+    print(f'{customers} Kunden, {projects} Projekte, {tasks} Aufgaben in '
+          f'{time.perf_counter() - start:.1f} s nach {args.db_file}')
+
+
+if __name__ == '__main__':
+    main()
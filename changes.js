@@ -0,0 +1,80 @@
+// Live‑Aktualisierung über das Änderungsprotokoll des Servers
+//
+// Listen liefern im Header X-Change-Seq ihren Stand. Mit ?since=<seq> gibt
+// der Server danach nur die geänderten Zeilen ({seq, rows, removed}) zurück,
+// /api/changes meldet neue Änderungen per Server‑Sent Events.
+
+// Stand einer Listenantwort (null, wenn der Server ihn nicht mitsendet)
+function changeSeqOf(resp) {
+  return resp.headers.get('X-Change-Seq');
+}
+
+// Lädt die Änderungen einer Liste seit `seq`. Liefert null, wenn der Server
+// sie nicht mehr kennt – dann muss die Liste komplett neu geladen werden.
+async function fetchDelta(url, seq) {
+  const sep = url.includes('?') ? '&' : '?';
+  const resp = await fetch(`${url}${sep}since=${encodeURIComponent(seq)}`);
+  if (resp.status === 410) return null;
+  if (!resp.ok) throw new Error('Änderungen konnten nicht geladen werden');
+  return resp.json();
+}
+
+// Übernimmt geänderte Zeilen (nach id) in `items` und entfernt gelöschte
+function mergeDelta(items, delta) {
+  const removed = new Set(delta.removed);
+  const changed = new Map(delta.rows.map(row => [row.id, row]));
+  const merged = [];
+  items.forEach(item => {
+    if (removed.has(item.id)) return;
+    if (changed.has(item.id)) {
+      merged.push(changed.get(item.id));
+      changed.delete(item.id);
+    } else {
+      merged.push(item);
+    }
+  });
+  return merged.concat(Array.from(changed.values()));
+}
+
+// Verhindert überlappende Aktualisierungen: Aufrufe während eines Laufs
+// werden zu einem weiteren Lauf danach zusammengefasst
+function serialized(fn) {
+  let running = null;
+  let again = false;
+  return function run() {
+    if (running) {
+      again = true;
+      return running;
+    }
+    running = (async () => {
+      try {
+        do {
+          again = false;
+          await fn();
+        } while (again);
+      } finally {
+        running = null;
+      }
+    })();
+    return running;
+  };
+}
+
+// Ruft onChange auf, sobald sich eine der `tables` nach `seq` ändert
+// (mehrere Ereignisse kurz hintereinander nur einmal). onReset: der Server
+// kennt `seq` nicht mehr, die Seite sollte alles neu laden.
+function subscribeChanges(seq, tables, onChange, onReset) {
+  if (!window.EventSource || seq === null) return null;
+  const source = new EventSource(`/api/changes?since=${encodeURIComponent(seq)}`);
+  let pending = null;
+  source.addEventListener('change', (e) => {
+    const change = JSON.parse(e.data);
+    if (!tables.includes(change.table) || pending) return;
+    pending = setTimeout(() => {
+      pending = null;
+      onChange();
+    }, 100);
+  });
+  source.addEventListener('reset', () => onReset());
+  return source;
+}
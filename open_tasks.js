@@ -1,15 +1,19 @@
-// Kanban‑Ansicht für alle Aufgaben
+// Kanban‑Ansicht für alle offenen Aufgaben
 
-const taskStatuses = ['ToDo', 'InBearbeitung', 'Done'];
+const taskStatuses = ['ToDo', 'InBearbeitung'];
 const statusLabels = {
   'ToDo': 'Offen',
   'InBearbeitung': 'In Bearbeitung',
   'Done': 'Erledigt'
 };
 
-// Merker für alle Aufgaben und Projekte, um Filter anwenden zu können
+// Merker für alle offenen Aufgaben (inkl. project_name), um Filter anwenden zu können
 let allTasks = [];
-let projectMapGlobal = {};
+// Stand für ?updated_since= (Header X-Updated-At) und für die Live-Aktualisierung
+let updatedAt = null;
+let changeSeq = null;
+// IDs der markierten Aufgaben für Sammelaktionen
+const selectedTaskIds = new Set();
 
 function showAlert(message, type = 'error') {
   const alerts = document.getElementById('alerts');
@@ -25,24 +29,35 @@ function showAlert(message, type = 'error') {
 
 async function fetchData() {
   try {
-    const [tasksResp, projectsResp] = await Promise.all([
-      fetch('/api/tasks'),
-      fetch('/api/projects')
-    ]);
-    if (!tasksResp.ok || !projectsResp.ok) throw new Error('Daten konnten nicht geladen werden');
-    allTasks = await tasksResp.json();
-    const projects = await projectsResp.json();
-    // Erstelle ein Mapping der Projekte für schnellen Zugriff
-    projectMapGlobal = {};
-    projects.forEach(p => {
-      projectMapGlobal[p.id] = p;
-    });
+    // Der Server filtert auf nicht erledigte Aufgaben und liefert den Projektnamen mit
+    const resp = await fetch('/api/tasks/open');
+    if (!resp.ok) throw new Error('Daten konnten nicht geladen werden');
+    updatedAt = resp.headers.get('X-Updated-At');
+    changeSeq = changeSeqOf(resp);
+    allTasks = await resp.json();
     applyFilters();
   } catch (err) {
     showAlert(err.message || 'Unbekannter Fehler');
   }
 }
 
+// Nur die seit dem letzten Laden geänderten offenen Aufgaben nachladen;
+// erledigte und gelöschte meldet der Server unter `removed`
+const refreshData = serialized(async () => {
+  if (updatedAt === null) return fetchData();
+  try {
+    const resp = await fetch(`/api/tasks/open?updated_since=${encodeURIComponent(updatedAt)}`);
+    if (resp.status === 410) return fetchData();
+    if (!resp.ok) throw new Error('Änderungen konnten nicht geladen werden');
+    const delta = await resp.json();
+    allTasks = mergeDelta(allTasks, delta);
+    updatedAt = delta.updated_at;
+    applyFilters();
+  } catch (err) {
+    showAlert(err.message || 'Unbekannter Fehler');
+  }
+});
+
 // Filterlogik anwenden und Board neu rendern
 function applyFilters() {
   const statusSel = document.getElementById('status-filter');
@@ -54,16 +69,15 @@ function applyFilters() {
   if (searchInput && searchInput.value.trim()) {
     const term = searchInput.value.trim().toLowerCase();
     filtered = filtered.filter(t => {
-      const proj = projectMapGlobal[t.project_id];
       const titleMatch = t.title && t.title.toLowerCase().includes(term);
-      const projMatch = proj && proj.name && proj.name.toLowerCase().includes(term);
+      const projMatch = t.project_name && t.project_name.toLowerCase().includes(term);
       return titleMatch || projMatch;
     });
   }
-  renderKanban(filtered, projectMapGlobal);
+  renderKanban(filtered);
 }
 
-function renderKanban(tasks, projectMap) {
+function renderKanban(tasks) {
   const board = document.getElementById('kanban');
   board.innerHTML = '';
   taskStatuses.forEach(status => {
@@ -77,16 +91,28 @@ function renderKanban(tasks, projectMap) {
     tasksForStatus.forEach(t => {
       const card = document.createElement('div');
       card.className = 'task-card';
-      // Titel
+      // Titel mit Auswahlkästchen für Sammelaktionen
       const title = document.createElement('div');
       title.className = 'title';
-      title.textContent = t.title;
+      const check = document.createElement('input');
+      check.type = 'checkbox';
+      check.className = 'select-task';
+      check.checked = selectedTaskIds.has(t.id);
+      check.addEventListener('change', () => {
+        if (check.checked) {
+          selectedTaskIds.add(t.id);
+        } else {
+          selectedTaskIds.delete(t.id);
+        }
+        updateBulkCount();
+      });
+      title.appendChild(check);
+      title.appendChild(document.createTextNode(t.title));
       card.appendChild(title);
       // Projektname
       const projName = document.createElement('div');
       projName.className = 'project';
-      const project = projectMap[t.project_id];
-      projName.textContent = project ? project.name : '';
+      projName.textContent = t.project_name || '';
       card.appendChild(projName);
       // Assignee
       if (t.assignee) {
@@ -109,7 +135,7 @@ function renderKanban(tasks, projectMap) {
         due.textContent = `Fällig: ${t.dueDate}`;
         // Überfällige Aufgaben hervorheben
         const today = new Date().toISOString().split('T')[0];
-        if (t.status !== 'Done' && t.dueDate < today) {
+        if (t.dueDate < today) {
           card.classList.add('overdue');
         }
         card.appendChild(due);
@@ -117,17 +143,15 @@ function renderKanban(tasks, projectMap) {
       // Aktionsbuttons
       const actionsDiv = document.createElement('div');
       actionsDiv.className = 'actions';
-      // Statuswechselbutton, nur wenn nicht Done
-      if (t.status !== 'Done') {
-        const nextStatus = t.status === 'ToDo' ? 'InBearbeitung' : 'Done';
-        const btn = document.createElement('button');
-        btn.className = 'change-status';
-        btn.textContent = nextStatus === 'InBearbeitung' ? 'Starten' : 'Erledigt';
-        btn.addEventListener('click', () => {
-          updateTaskStatus(t.id, nextStatus);
-        });
-        actionsDiv.appendChild(btn);
-      }
+      // Statuswechselbutton (erledigte Aufgaben verschwinden aus der Ansicht)
+      const nextStatus = t.status === 'ToDo' ? 'InBearbeitung' : 'Done';
+      const btn = document.createElement('button');
+      btn.className = 'change-status';
+      btn.textContent = nextStatus === 'InBearbeitung' ? 'Starten' : 'Erledigt';
+      btn.addEventListener('click', () => {
+        updateTaskStatus(t.id, nextStatus);
+      });
+      actionsDiv.appendChild(btn);
       // Löschbutton
       const delBtn = document.createElement('button');
       delBtn.className = 'delete-task';
@@ -153,7 +177,41 @@ async function updateTaskStatus(id, newStatus) {
       body: JSON.stringify({ status: newStatus })
     });
     if (!resp.ok) throw new Error('Aufgabe konnte nicht aktualisiert werden');
-    await fetchData();
+    await refreshData();
+  } catch (err) {
+    showAlert(err.message || 'Fehler beim Aktualisieren');
+  }
+}
+
+function updateBulkCount() {
+  const countEl = document.getElementById('bulk-count');
+  if (countEl) countEl.textContent = `${selectedTaskIds.size} markiert`;
+}
+
+// Status aller markierten Aufgaben mit einer Anfrage ändern
+async function updateSelectedStatus(newStatus) {
+  if (!selectedTaskIds.size) {
+    showAlert('Keine Aufgaben markiert');
+    return;
+  }
+  try {
+    const resp = await fetch('/api/tasks/bulk', {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        update: Array.from(selectedTaskIds).map(id => ({ id: id, status: newStatus }))
+      })
+    });
+    const result = await resp.json();
+    if (!resp.ok && resp.status !== 207) throw new Error('Aufgaben konnten nicht aktualisiert werden');
+    selectedTaskIds.clear();
+    updateBulkCount();
+    await refreshData();
+    if (result.errors && result.errors.length) {
+      showAlert(`${result.updated.length} Aufgaben aktualisiert, ${result.errors.length} fehlgeschlagen`);
+    } else {
+      showAlert(`${result.updated.length} Aufgaben aktualisiert`, 'success');
+    }
   } catch (err) {
     showAlert(err.message || 'Fehler beim Aktualisieren');
   }
@@ -163,7 +221,7 @@ async function deleteTask(id) {
   try {
     const resp = await fetch(`/api/tasks/${id}`, { method: 'DELETE' });
     if (!resp.ok && resp.status !== 204) throw new Error('Aufgabe konnte nicht gelöscht werden');
-    await fetchData();
+    await refreshData();
     showAlert('Aufgabe gelöscht', 'success');
   } catch (err) {
     showAlert(err.message || 'Fehler beim Löschen');
@@ -171,8 +229,11 @@ async function deleteTask(id) {
 }
 
 document.addEventListener('DOMContentLoaded', () => {
-  // Lade Daten initial
-  fetchData();
+  // Lade Daten initial, danach nur noch Änderungen
+  fetchData().then(() => {
+    if (changeSeq === null) return;
+    subscribeChanges(changeSeq, ['tasks', 'projects'], refreshData, fetchData);
+  });
   // Filterevents
   const statusSel = document.getElementById('status-filter');
   const searchInput = document.getElementById('search-task');
@@ -182,4 +243,10 @@ document.addEventListener('DOMContentLoaded', () => {
   if (searchInput) {
     searchInput.addEventListener('input', applyFilters);
   }
+  const bulkBtn = document.getElementById('bulk-apply');
+  if (bulkBtn) {
+    bulkBtn.addEventListener('click', () => {
+      updateSelectedStatus(document.getElementById('bulk-status').value);
+    });
+  }
 });
\ No newline at end of file
@@ -95,6 +95,8 @@ function showAlert(message, type = 'error') {
 let allProjects = [];
 let allCustomers = [];
 let customerMap = {};
+// Stand der Projektliste im Änderungsprotokoll (siehe changes.js)
+let overviewSeq = null;
 
 // -------------------------
 // Kunden laden
@@ -133,25 +135,31 @@ function populateCustomerFilter(customers) {
 // -------------------------
 async function fetchProjects() {
   try {
-    const resp = await fetch('/api/projects');
+    // Projekte inkl. Anzahl offener Aufgaben in einer Anfrage laden
+    const resp = await fetch('/api/overview');
     if (!resp.ok) throw new Error('Projekte konnten nicht geladen werden');
-    const projects = await resp.json();
-    // Offene Aufgaben zählen
-    allProjects = await Promise.all(projects.map(async (proj) => {
-      const tasksResp = await fetch(`/api/projects/${proj.id}/tasks`);
-      let tasks = [];
-      if (tasksResp.ok) {
-        tasks = await tasksResp.json();
-      }
-      const openCount = tasks.filter(t => t.status !== 'Done').length;
-      return { ...proj, openTasks: openCount };
-    }));
+    overviewSeq = changeSeqOf(resp);
+    allProjects = await resp.json();
     applyProjectFilters();
   } catch (err) {
     showAlert(err.message || 'Unbekannter Fehler');
   }
 }
 
+// Nur die seit dem letzten Laden geänderten Projekte nachladen
+const refreshProjects = serialized(async () => {
+  if (overviewSeq === null) return fetchProjects();
+  try {
+    const delta = await fetchDelta('/api/overview', overviewSeq);
+    if (!delta) return fetchProjects();
+    allProjects = mergeDelta(allProjects, delta);
+    overviewSeq = delta.seq;
+    applyProjectFilters();
+  } catch (err) {
+    showAlert(err.message || 'Unbekannter Fehler');
+  }
+});
+
 // -------------------------
 // Filter anwenden
 // -------------------------
@@ -210,7 +218,7 @@ function renderProjects(projects) {
       <td>${project.fair || '-'}</td>
       <td>${project.size ? project.size + ' m²' : '-'}</td>
       <td></td>
-      <td>${project.openTasks}</td>
+      <td>${project.openTasks}${project.overdueTasks ? ` (${project.overdueTasks} überfällig)` : ''}</td>
       <td>${project.nextStep || '-'}</td>
       <td>${project.dueDate || '-'}</td>
       <td class="actions"></td>
@@ -277,7 +285,7 @@ async function updateProjectStatus(id, newStatus) {
       body: JSON.stringify({ status: newStatus, nextStep: nextStep })
     });
     if (!resp.ok) throw new Error('Status konnte nicht aktualisiert werden');
-    await fetchProjects();
+    await refreshProjects();
   } catch (err) {
     showAlert(err.message || 'Fehler beim Aktualisieren');
   }
@@ -290,7 +298,7 @@ async function deleteProject(id) {
   try {
     const resp = await fetch(`/api/projects/${id}`, { method: 'DELETE' });
     if (!resp.ok && resp.status !== 204) throw new Error('Projekt konnte nicht gelöscht werden');
-    await fetchProjects();
+    await refreshProjects();
     showAlert('Projekt gelöscht', 'success');
   } catch (err) {
     showAlert(err.message || 'Fehler beim Löschen');
@@ -374,5 +382,7 @@ document.addEventListener('DOMContentLoaded', () => {
   (async () => {
     await fetchCustomers();
     await fetchProjects();
+    // Änderungen anderer Nutzer (auch an Aufgaben, wegen der Zähler) übernehmen
+    subscribeChanges(overviewSeq, ['projects', 'tasks'], refreshProjects, fetchProjects);
   })();
 });
@@ -23,6 +23,9 @@ let currentProjectId = null;
 let currentProjectName = '';
 // Aktuelle zu bearbeitende Aufgabe (ID) – null wenn es sich um eine neue Aufgabe handelt
 let editTaskId = null;
+// Geladene Aufgaben und ihr Stand im Änderungsprotokoll (siehe changes.js)
+let currentTasks = [];
+let tasksSeq = null;
 
 async function init() {
   // Hole Projekt‑ID aus URL
@@ -35,6 +38,7 @@ async function init() {
   currentProjectId = id;
   await fetchProject(id);
   await fetchTasks();
+  subscribeChanges(tasksSeq, ['tasks'], refreshTasks, fetchTasks);
   // Formular submit
   const form = document.getElementById('task-form');
   form.addEventListener('submit', (e) => {
@@ -64,13 +68,28 @@ async function fetchTasks() {
   try {
     const resp = await fetch(`/api/projects/${currentProjectId}/tasks`);
     if (!resp.ok) throw new Error('Aufgaben konnten nicht geladen werden');
-    const tasks = await resp.json();
-    renderBoard(tasks);
+    tasksSeq = changeSeqOf(resp);
+    currentTasks = await resp.json();
+    renderBoard(currentTasks);
   } catch (err) {
     showAlert(err.message || 'Fehler beim Laden der Aufgaben');
   }
 }
 
+// Nur die seit dem letzten Laden geänderten Aufgaben nachladen
+const refreshTasks = serialized(async () => {
+  if (tasksSeq === null) return fetchTasks();
+  try {
+    const delta = await fetchDelta(`/api/projects/${currentProjectId}/tasks`, tasksSeq);
+    if (!delta) return fetchTasks();
+    currentTasks = mergeDelta(currentTasks, delta);
+    tasksSeq = delta.seq;
+    renderBoard(currentTasks);
+  } catch (err) {
+    showAlert(err.message || 'Fehler beim Laden der Aufgaben');
+  }
+});
+
 function renderBoard(tasks) {
   const board = document.getElementById('kanban');
   board.innerHTML = '';
@@ -183,7 +202,7 @@ async function addTask() {
     if (!resp.ok) throw new Error('Aufgabe konnte nicht angelegt werden');
     document.getElementById('task-form').reset();
     showAlert('Aufgabe gespeichert', 'success');
-    await fetchTasks();
+    await refreshTasks();
   } catch (err) {
     showAlert(err.message || 'Fehler beim Speichern');
   }
@@ -219,7 +238,7 @@ async function updateTask() {
     // Schaltflächen zurücksetzen
     document.querySelector('#task-form button[type="submit"]').textContent = 'Aufgabe speichern';
     document.getElementById('task-form').reset();
-    await fetchTasks();
+    await refreshTasks();
   } catch (err) {
     showAlert(err.message || 'Fehler beim Aktualisieren');
   }
@@ -246,7 +265,7 @@ async function updateTaskStatus(id, newStatus) {
       body: JSON.stringify({ status: newStatus })
     });
     if (!resp.ok) throw new Error('Aufgabe konnte nicht aktualisiert werden');
-    await fetchTasks();
+    await refreshTasks();
   } catch (err) {
     showAlert(err.message || 'Fehler beim Aktualisieren');
   }
@@ -257,7 +276,7 @@ async function deleteTask(id) {
     const resp = await fetch(`/api/tasks/${id}`, { method: 'DELETE' });
     if (!resp.ok && resp.status !== 204) throw new Error('Aufgabe konnte nicht gelöscht werden');
     showAlert('Aufgabe gelöscht', 'success');
-    await fetchTasks();
+    await refreshTasks();
   } catch (err) {
     showAlert(err.message || 'Fehler beim Löschen');
   }
@@ -7,595 +7,4294 @@ Funktionen:
 - Auslieferung der statischen Frontend-Dateien (HTML, CSS, JS)
 - Speicherung in SQLite, inkl. Beziehung:
     Kunde 1:n Projekte, Projekt 1:n Aufgaben
+- Live-Aktualisierung: Änderungsprotokoll mit since=-Abfragen auf den Listen
+  und Server-Sent Events unter /api/changes
+- Volltextsuche (SQLite FTS5) über Kunden, Projekte und Aufgaben unter /api/search
+- Export ganzer Tabellen als spaltenweises JSON oder CSV unter /api/export/...
+- Offene Aufgaben mit Projektnamen unter /api/tasks/open, danach nur die
+  Änderungen per updated_since=
+- Archiv abgeschlossener Messen in einer eigenen SQLite-Datei (POST
+  /api/archive); Listen mit archive=1 schließen es ein
+- Termine (Projekt- und Aufgabenfälligkeiten) nach Datum unter /api/timeline;
+  Datumsangaben werden beim Speichern als JJJJ-MM-TT abgelegt
+- Kennzahlen (Laufzeiten je Route, Zeit in SQLite, Antwortgrößen) im
+  Prometheus-Format unter /api/metrics
 
 Zum Starten des Servers lokal:
     python server.py
 
 Anschließend die Anwendung im Browser unter http://localhost:8000 öffnen.
+
+Anfragen werden parallel von einem festen Pool an Worker-Threads bearbeitet
+(Umgebungsvariable WORKER_THREADS, Standard 16). Verbindungen bleiben per
+HTTP/1.1 Keep-Alive offen, bis sie KEEPALIVE_TIMEOUT Sekunden ungenutzt sind.
+Schreibzugriffe laufen über einen einzigen Schreib-Thread, der gleichzeitige
+Änderungen zu einer Transaktion zusammenfasst (WRITE_BATCH_MAX, WRITE_BATCH_MS).
+Mit WORKER_PROCESSES > 1 teilen sich mehrere Prozesse den Listen-Socket; ein
+Supervisor startet abgestürzte Prozesse neu. Bei Überlast lehnt der Server
+API-Anfragen schnell mit 503 bzw. 429 und Retry-After ab (ADMISSION_*).
 """
 
 from http.server import BaseHTTPRequestHandler, HTTPServer
+import base64
+import bisect
+import csv
+import datetime
+import email.utils
+import gzip
+import hashlib
+import heapq
+import io
 import json
+import math
+import multiprocessing
 import os
+import queue
+import random
+import re
+import signal
+import socket
 import sqlite3
-from urllib.parse import urlparse
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import zlib
+from collections import OrderedDict, defaultdict, namedtuple
+from concurrent.futures import Future
+from contextlib import contextmanager
+from urllib.parse import parse_qs, urlencode, urlparse
+
+try:
+    # optional: Brotli-Varianten der statischen Dateien (pip install brotli)
+    import brotli
+except ImportError:
+    brotli = None
 
 # Port:
 # - lokal: default 8000
 # - bei Render: Port wird über Umgebungsvariable PORT gesetzt
 PORT = int(os.environ.get("PORT", 8000))
 
-DB_FILE = os.path.join(os.path.dirname(__file__), 'projects.db')
+# Anzahl Worker-Threads, die Verbindungen parallel bearbeiten
+WORKER_THREADS = int(os.environ.get("WORKER_THREADS", 16))
+# Sekunden, die eine Keep-Alive-Verbindung ungenutzt offen bleiben darf
+KEEPALIVE_TIMEOUT = float(os.environ.get("KEEPALIVE_TIMEOUT", 5))
+# Sekunden, die beim Beenden auf laufende Anfragen gewartet wird
+SHUTDOWN_TIMEOUT = float(os.environ.get("SHUTDOWN_TIMEOUT", 10))
+
+# Prefork-Betrieb:
+# - WORKER_PROCESSES: so viele Prozesse nehmen Verbindungen vom selben
+#   Listen-Socket an, jeder mit eigenen WORKER_THREADS, Verbindungspool,
+#   Schreib-Thread und Antwort-Cache (1 = ein einzelner Prozess).
+#   Ein Supervisor startet abgestürzte Prozesse neu.
+# - PROCESS_SYNC_MS: so oft prüft jeder Prozess, ob ein anderer geschrieben
+#   hat, und weckt daraufhin seine SSE-Streams und Long-Polls
+WORKER_PROCESSES = max(1, int(os.environ.get("WORKER_PROCESSES", 1)))
+PROCESS_SYNC_MS = float(os.environ.get("PROCESS_SYNC_MS", 50))
+
+DB_FILE = os.environ.get("DB_FILE", os.path.join(os.path.dirname(__file__), 'projects.db'))
 STATIC_DIR = os.path.dirname(__file__)
 
+# SQLite-Verbindungspool:
+# - DB_POOL_SIZE: maximale Anzahl offener Verbindungen (Standard: ein pro Worker)
+# - DB_STATEMENT_CACHE: vorbereitete Statements, die je Verbindung gecacht werden
+# - DB_SYNCHRONOUS: OFF / NORMAL / FULL (NORMAL ist im WAL-Modus sicher)
+# - DB_CACHE_SIZE_KB / DB_MMAP_SIZE_MB: Page-Cache bzw. Memory-Mapping je Verbindung
+DB_POOL_SIZE = int(os.environ.get("DB_POOL_SIZE", WORKER_THREADS))
+DB_STATEMENT_CACHE = int(os.environ.get("DB_STATEMENT_CACHE", 256))
+DB_SYNCHRONOUS = os.environ.get("DB_SYNCHRONOUS", "NORMAL")
+DB_CACHE_SIZE_KB = int(os.environ.get("DB_CACHE_SIZE_KB", 16384))
+DB_MMAP_SIZE_MB = int(os.environ.get("DB_MMAP_SIZE_MB", 128))
+
+# Statische Dateien:
+# - bis STATIC_MAX_CACHED_KB werden sie im Speicher gehalten (inkl. gzip/br),
+#   größere Dateien per sendfile() direkt von der Platte gesendet
+# - STATIC_CHECK_INTERVAL: Sekunden zwischen zwei Prüfungen auf Änderungen
+# - STATIC_MAX_AGE: Sekunden, die Browser CSS/JS/Bilder ohne Nachfrage nutzen
+STATIC_MAX_CACHED_KB = int(os.environ.get("STATIC_MAX_CACHED_KB", 1024))
+STATIC_CHECK_INTERVAL = float(os.environ.get("STATIC_CHECK_INTERVAL", 1))
+STATIC_MAX_AGE = int(os.environ.get("STATIC_MAX_AGE", 300))
+
+# Cache für GET-Antworten der API (0 Einträge = aus)
+RESPONSE_CACHE_ENTRIES = int(os.environ.get("RESPONSE_CACHE_ENTRIES", 512))
+RESPONSE_CACHE_MB = float(os.environ.get("RESPONSE_CACHE_MB", 64))
+
+# Änderungsprotokoll (change_log) für Live-Aktualisierung und since=-Abfragen:
+# - CHANGE_LOG_RETAIN: so viele der neuesten Einträge bleiben erhalten
+# - CHANGE_STREAM_SECONDS: Höchstdauer eines SSE-Streams bzw. Long-Polls,
+#   danach verbindet sich der Browser neu
+# - CHANGE_STREAM_MAX: gleichzeitige Streams/Long-Polls (jeder belegt einen Worker)
+CHANGE_LOG_RETAIN = max(1, int(os.environ.get("CHANGE_LOG_RETAIN", 10000)))
+CHANGE_STREAM_SECONDS = float(os.environ.get("CHANGE_STREAM_SECONDS", 60))
+CHANGE_STREAM_MAX = int(os.environ.get("CHANGE_STREAM_MAX", max(1, WORKER_THREADS // 4)))
+
+# Kennzahlen unter /api/metrics (Prometheus-Textformat):
+# - METRICS_SAMPLE_RATE: Anteil der Anfragen (0..1), für die Laufzeit, Zeit in
+#   SQLite, Serialisierung und Antwortgröße gemessen werden (0 = aus).
+#   Zähler für Anfragen, Bytes und laufende Anfragen werden immer geführt.
+#   Zur Laufzeit änderbar per PUT /api/metrics {"sampleRate": ...}
+# - SLOW_QUERY_MS: gemessene SQL-Aufrufe ab dieser Dauer auf stderr protokollieren (0 = aus)
+METRICS_SAMPLE_RATE = min(1.0, max(0.0, float(os.environ.get("METRICS_SAMPLE_RATE", 1))))
+SLOW_QUERY_MS = float(os.environ.get("SLOW_QUERY_MS", 100))
+
+# Schreibzugriffe der API (Group Commit, siehe WriteQueue):
+# - WRITE_BATCH_MAX: höchstens so viele Schreibanfragen je Transaktion;
+#   0 = aus, jede Anfrage schreibt und committet über den Verbindungspool
+# - WRITE_BATCH_MS: so lange sammelt der Schreib-Thread nach der ersten
+#   Anfrage weitere ein (0 = nur die bereits wartenden, die sich während
+#   des vorigen Commits angesammelt haben)
+WRITE_BATCH_MAX = int(os.environ.get("WRITE_BATCH_MAX", 64))
+WRITE_BATCH_MS = float(os.environ.get("WRITE_BATCH_MS", 0))
+
+# Export ganzer Tabellen (/api/export/...): beim spaltenweisen JSON wird jede
+# Spalte zunächst in eine temporäre Datei geschrieben, die erst ab dieser
+# Größe auf die Platte ausgelagert wird; gzip-Stufe für Accept-Encoding: gzip
+# (1 = schnell, der Export wird während des Lesens komprimiert)
+EXPORT_SPOOL_KB = int(os.environ.get("EXPORT_SPOOL_KB", 512))
+EXPORT_GZIP_LEVEL = int(os.environ.get("EXPORT_GZIP_LEVEL", 1))
+
+# Archiv abgeschlossener Messen (POST /api/archive): Projekte mit einem Status
+# aus ARCHIVE_STATUSES (kommagetrennt), die samt ihren Aufgaben seit
+# ARCHIVE_AFTER_DAYS Tagen nicht geändert wurden, wandern in die per ATTACH
+# angehängte Datei ARCHIVE_FILE (Standard: neben DB_FILE, "<name>-archive.db").
+# Verschoben wird in Schüben von ARCHIVE_BATCH Projekten mit ARCHIVE_PAUSE_MS
+# Pause, damit andere Schreibzugriffe nicht lange warten. Listen liefern
+# archivierte Zeilen nur mit archive=1.
+ARCHIVE_FILE = os.environ.get("ARCHIVE_FILE")
+ARCHIVE_STATUSES = tuple(s.strip() for s in os.environ.get("ARCHIVE_STATUSES", "Abgeschlossen").split(',')
+                         if s.strip())
+ARCHIVE_AFTER_DAYS = float(os.environ.get("ARCHIVE_AFTER_DAYS", 30))
+ARCHIVE_BATCH = max(1, int(os.environ.get("ARCHIVE_BATCH", 20)))
+ARCHIVE_PAUSE_MS = float(os.environ.get("ARCHIVE_PAUSE_MS", 10))
+
+# Lastbegrenzung bei Überlast (siehe Admission):
+# - ADMISSION_QUEUE: so viele angenommene Verbindungen warten höchstens auf
+#   einen Worker, weitere bleiben im Listen-Backlog des Betriebssystems
+# - ADMISSION_QUEUE_MS: hat eine Verbindung länger auf einen Worker gewartet,
+#   bekommen ihre API-Anfragen sofort 503 mit Retry-After, statt den Stau zu
+#   verlängern; statische Dateien werden trotzdem ausgeliefert (0 = aus)
+# - ADMISSION_HEAVY_MAX: gleichzeitig laufende aufwendige Anfragen (Exporte,
+#   Listen ohne limit, Übersicht, Suche, Sammel-Operationen, ...); weitere
+#   warten höchstens bis ADMISSION_QUEUE_MS und bekommen dann 503, damit
+#   Worker für kleine Anfragen frei bleiben (0 = unbegrenzt)
+# - ADMISSION_CLIENT_RATE / ADMISSION_CLIENT_BURST: API-Anfragen je Sekunde
+#   und Client (Token Bucket je Adresse, 0 = aus), darüber 429 mit Retry-After.
+#   Im Prefork-Betrieb gilt die Grenze je Prozess.
+# - ADMISSION_CLIENT_HEADER: Client-Adresse aus diesem Header statt der
+#   Gegenstelle, z.B. X-Forwarded-For hinter einem Proxy
+# - ADMISSION_RETRY_AFTER: Sekunden für Retry-After bei 503
+ADMISSION_QUEUE = max(1, int(os.environ.get("ADMISSION_QUEUE", WORKER_THREADS * 16)))
+ADMISSION_QUEUE_MS = float(os.environ.get("ADMISSION_QUEUE_MS", 500))
+ADMISSION_HEAVY_MAX = int(os.environ.get("ADMISSION_HEAVY_MAX", max(1, WORKER_THREADS // 2)))
+ADMISSION_CLIENT_RATE = float(os.environ.get("ADMISSION_CLIENT_RATE", 0))
+ADMISSION_CLIENT_BURST = max(1.0, float(os.environ.get("ADMISSION_CLIENT_BURST", 50)))
+ADMISSION_CLIENT_HEADER = os.environ.get("ADMISSION_CLIENT_HEADER", "")
+ADMISSION_RETRY_AFTER = max(1, int(os.environ.get("ADMISSION_RETRY_AFTER", 1)))
+
+
+# ----------------------
+#   Kennzahlen
+# ----------------------
+
+METRICS_PREFIX = 'messebau_'
+
+# Bucket-Grenzen der Histogramme (Sekunden bzw. Bytes)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# Histogramme je Route: Name -> (Beschreibung, Bucket-Grenzen)
+METRIC_HISTOGRAMS = {
+    'request_duration_seconds': ('Dauer der Anfragen', LATENCY_BUCKETS),
+    'db_duration_seconds': ('Zeit in SQLite (execute und Lesen der Zeilen) je Anfrage', LATENCY_BUCKETS),
+    'encode_duration_seconds': ('Zeit für die JSON-Serialisierung je Anfrage', LATENCY_BUCKETS),
+    'response_size_bytes': ('Größe der Antworten inkl. Header', SIZE_BUCKETS),
+}
+
+
+def _label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Histogram:
+    """Histogramm mit festen Bucket-Grenzen (Zugriff nur unter dem Lock von RequestMetrics)."""
+
+    __slots__ = ('bounds', 'counts', 'sum')
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0
+
+    def observe(self, value):
+        # Prometheus-Buckets sind nach oben inklusive (le = "kleiner oder gleich")
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def render(self, name, labels):
+        lines = []
+        total = 0
+        for bound, count in zip(self.bounds + ('+Inf',), self.counts):
+            total += count
+            lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {total}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {total}')
+        return lines
+
+
+class RequestSample:
+    """Messwerte einer gesampelten Anfrage (siehe RequestMetrics.begin)."""
+
+    __slots__ = ('route', 'start', 'db_seconds', 'db_statements', 'encode_seconds')
+
+    def __init__(self, route):
+        self.route = route
+        self.start = time.perf_counter()
+        self.db_seconds = 0.0
+        self.db_statements = 0
+        self.encode_seconds = 0.0
+
+    def add_db_time(self, sql, seconds):
+        self.db_seconds += seconds
+        if 0 < metrics.slow_query_seconds <= seconds:
+            metrics.log_slow_query(self.route, sql, seconds)
+
+
+class _RequestState(threading.local):
+    # Messung der Anfrage, die dieser Thread gerade bearbeitet (None: keine)
+    sample = None
+    # Zeitpunkt (monotonic), zu dem die Verbindung angenommen wurde; nur bis
+    # zur ersten Anfrage auf ihr gesetzt (siehe PooledHTTPServer._worker)
+    accepted = None
+
+
+current_request = _RequestState()
+
+
+class RequestMetrics:
+    """
+    Kennzahlen aller Anfragen für /api/metrics.
+
+    Anfragen je Route und Status, gesendete Bytes und laufende Anfragen
+    werden immer gezählt. Für den Anteil ``sample_rate`` der Anfragen liefert
+    begin() zusätzlich ein RequestSample, in dem TimedCursor die Zeit in
+    SQLite und encode_json die Serialisierung mitschreiben; finish() trägt
+    es in die Histogramme je Route ein.
+    """
+
+    def __init__(self, sample_rate=METRICS_SAMPLE_RATE, slow_query_ms=SLOW_QUERY_MS):
+        self.sample_rate = sample_rate
+        self.slow_query_seconds = slow_query_ms / 1000
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.slow_queries = 0
+        self._requests = defaultdict(int)       # (Route, Status) -> Anzahl
+        self._bytes = defaultdict(int)          # Route -> gesendete Bytes
+        self._db_statements = defaultdict(int)  # Route -> SQL-Aufrufe (gesampelt)
+        self._histograms = {}                   # (Name, Route) -> Histogram
+
+    def begin(self, route):
+        """Zu Beginn einer Anfrage; liefert ein RequestSample oder None."""
+        with self._lock:
+            self.in_flight += 1
+        rate = self.sample_rate
+        if rate >= 1 or (rate > 0 and random.random() < rate):
+            return RequestSample(route)
+        return None
+
+    def finish(self, route, status, bytes_out, sample):
+        """Nach der Anfrage (auch wenn der Handler eine Exception geworfen hat)."""
+        duration = time.perf_counter() - sample.start if sample else 0
+        with self._lock:
+            self.in_flight -= 1
+            self._requests[route, status] += 1
+            self._bytes[route] += bytes_out
+            if sample is None:
+                return
+            self._db_statements[route] += sample.db_statements
+            self._observe('request_duration_seconds', route, duration)
+            self._observe('db_duration_seconds', route, sample.db_seconds)
+            self._observe('encode_duration_seconds', route, sample.encode_seconds)
+            self._observe('response_size_bytes', route, bytes_out)
+
+    def _observe(self, name, route, value):
+        histogram = self._histograms.get((name, route))
+        if histogram is None:
+            histogram = self._histograms[name, route] = Histogram(METRIC_HISTOGRAMS[name][1])
+        histogram.observe(value)
+
+    def log_slow_query(self, route, sql, seconds):
+        with self._lock:
+            self.slow_queries += 1
+        print(f'Langsame Abfrage ({seconds * 1000:.1f} ms, {route}): {" ".join(sql.split())[:500]}',
+              file=sys.stderr, flush=True)
+
+    def render(self, extra=()):
+        """
+        Alle Kennzahlen im Prometheus-Textformat. ``extra``: weitere
+        ``(Name, Typ, Beschreibung, Wert)`` ohne Labels.
+        """
+        p = METRICS_PREFIX
+        lines = []
+
+        def header(name, kind, help_text):
+            lines.append(f'# HELP {p}{name} {help_text}')
+            lines.append(f'# TYPE {p}{name} {kind}')
+
+        with self._lock:
+            header('requests_total', 'counter', 'Beantwortete Anfragen je Route und Statuscode')
+            for (route, status), count in sorted(self._requests.items(), key=str):
+                lines.append(f'{p}requests_total{{route="{_label_value(route)}",code="{status}"}} {count}')
+            header('response_bytes_total', 'counter', 'Gesendete Bytes inkl. Header je Route')
+            for route, count in sorted(self._bytes.items()):
+                lines.append(f'{p}response_bytes_total{{route="{_label_value(route)}"}} {count}')
+            header('db_statements_total', 'counter', 'SQL-Aufrufe je Route (nur gesampelte Anfragen)')
+            for route, count in sorted(self._db_statements.items()):
+                lines.append(f'{p}db_statements_total{{route="{_label_value(route)}"}} {count}')
+            for name, (help_text, _) in METRIC_HISTOGRAMS.items():
+                header(name, 'histogram', f'{help_text} (nur gesampelte Anfragen)')
+                for (hist_name, route), histogram in sorted(self._histograms.items()):
+                    if hist_name == name:
+                        lines.extend(histogram.render(p + name, f'route="{_label_value(route)}"'))
+            values = [
+                ('requests_in_flight', 'gauge', 'Gerade bearbeitete Anfragen', self.in_flight),
+                ('slow_queries_total', 'counter', 'SQL-Aufrufe über SLOW_QUERY_MS', self.slow_queries),
+                ('metrics_sample_rate', 'gauge', 'Anteil der gemessenen Anfragen', self.sample_rate),
+            ]
+        for name, kind, help_text, value in values + list(extra):
+            header(name, kind, help_text)
+            lines.append(f'{p}{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+metrics = RequestMetrics()
+
+
+# Gleiche Ausgabe wie json.dumps(obj), aber ohne dessen Argumentprüfung je Aufruf
+json_encode = json.JSONEncoder().encode
+
+
+def encode_json(payload):
+    """json.dumps als UTF-8; bei gesampelten Anfragen mit Zeitmessung."""
+    sample = current_request.sample
+    if sample is None:
+        return json_encode(payload).encode()
+    start = time.perf_counter()
+    body = json_encode(payload).encode()
+    sample.encode_seconds += time.perf_counter() - start
+    return body
+
+
+class CountingWriter:
+    """Hülle um ``wfile`` des Handlers, die die gesendeten Bytes zählt."""
+
+    def __init__(self, raw):
+        self.raw = raw
+        self.bytes_written = 0
+
+    def write(self, data):
+        self.bytes_written += len(data)
+        return self.raw.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self.raw, name)
+
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    Cursor, der bei gesampelten Anfragen die Zeit in SQLite misst: execute
+    und das Lesen der Zeilen (fetch*, Iteration). Ohne Messung laufen die
+    C-Methoden von sqlite3.Cursor, Iteration ohne zusätzlichen Aufwand je Zeile.
+    """
+
+    sql = ''
+
+    def _timed(self, sample, func, *args):
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            sample.add_db_time(self.sql, time.perf_counter() - start)
+
+    def execute(self, sql, parameters=()):
+        sample = current_request.sample
+        if sample is None:
+            return super().execute(sql, parameters)
+        self.sql = sql
+        sample.db_statements += 1
+        return self._timed(sample, super().execute, sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        sample = current_request.sample
+        if sample is None:
+            return super().executemany(sql, seq_of_parameters)
+        self.sql = sql
+        sample.db_statements += 1
+        return self._timed(sample, super().executemany, sql, seq_of_parameters)
+
+    def fetchone(self):
+        sample = current_request.sample
+        if sample is None:
+            return super().fetchone()
+        return self._timed(sample, super().fetchone)
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        sample = current_request.sample
+        if sample is None:
+            return super().fetchmany(size)
+        return self._timed(sample, super().fetchmany, size)
+
+    def fetchall(self):
+        sample = current_request.sample
+        if sample is None:
+            return super().fetchall()
+        return self._timed(sample, super().fetchall)
+
+    def __iter__(self):
+        if current_request.sample is None:
+            return self
+        return self._timed_rows()
+
+    def _timed_rows(self):
+        while True:
+            rows = self.fetchmany(STREAM_BATCH_ROWS)
+            if not rows:
+                return
+            yield from rows
+
+
+class TimedConnection(sqlite3.Connection):
+    """sqlite3-Verbindung, deren Cursor (auch die von execute()) TimedCursor sind."""
+
+    def cursor(self, factory=TimedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def open_connection(isolation_level=''):
+    """Neue SQLite-Verbindung mit den PRAGMAs des Servers (für Pool und WriteQueue)."""
+    conn = sqlite3.connect(DB_FILE, check_same_thread=False, isolation_level=isolation_level,
+                           cached_statements=DB_STATEMENT_CACHE, factory=TimedConnection)
+    conn.row_factory = sqlite3.Row
+    conn.execute('PRAGMA foreign_keys = ON')
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute(f'PRAGMA synchronous = {DB_SYNCHRONOUS}')
+    conn.execute(f'PRAGMA cache_size = -{DB_CACHE_SIZE_KB}')
+    conn.execute(f'PRAGMA mmap_size = {DB_MMAP_SIZE_MB * 1024 * 1024}')
+    attach_archive(conn)
+    return conn
+
+
+def attach_archive(conn):
+    """Hängt ARCHIVE_FILE als Schema ``archive`` an (siehe Abschnitt Archiv)."""
+    path = ARCHIVE_FILE or os.path.splitext(DB_FILE)[0] + '-archive.db'
+    conn.execute('ATTACH DATABASE ? AS archive', (path,))
+    conn.execute('PRAGMA archive.journal_mode = WAL')
+    # die Kopie im Archiv muss auf der Platte sein, bevor archive_remove die
+    # Zeilen aus der aktiven Datenbank löscht
+    conn.execute('PRAGMA archive.synchronous = FULL')
+
+
+class ConnectionPool:
+    """
+    Pool wiederverwendbarer SQLite-Verbindungen für alle Handler-Threads.
+
+    Verbindungen werden bei Bedarf geöffnet (höchstens ``size`` Stück), die
+    PRAGMAs dabei einmalig gesetzt. Da die Verbindungen erhalten bleiben,
+    greift auch der Statement-Cache von sqlite3 über Anfragen hinweg.
+    """
+
+    def __init__(self, size=DB_POOL_SIZE):
+        self.size = max(1, size)
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.size
+            if create:
+                self._created += 1
+        if not create:
+            # Pool ausgeschöpft: auf eine zurückgegebene Verbindung warten
+            return self._idle.get()
+        try:
+            return open_connection()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    @contextmanager
+    def connection(self):
+        """
+        Leiht eine Verbindung aus. Wie ``with sqlite3.connect(...)``: bei
+        Erfolg wird committet, bei einer Exception zurückgerollt.
+        """
+        conn = self._acquire()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        """Schließt alle gerade unbenutzten Verbindungen."""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+db_pool = ConnectionPool()
+
+
+class WriteQueue:
+    """
+    Führt die Schreibzugriffe der Handler in einem einzigen Schreib-Thread
+    aus und fasst gleichzeitige zu einer Transaktion zusammen (Group Commit).
+
+    ``run(func)`` stellt ``func(conn)`` in die Warteschlange und blockiert, bis
+    die Transaktion committet ist. Der Schreib-Thread nimmt die erste wartende
+    Funktion, sammelt bis zu ``window`` Sekunden (höchstens ``max_batch``)
+    weitere ein und führt alle nach BEGIN IMMEDIATE jeweils in einem eigenen
+    SAVEPOINT aus. Wirft eine davon eine Exception, wird nur ihr SAVEPOINT
+    zurückgerollt und die Exception an ihren Aufrufer weitergegeben; die
+    übrigen erhalten ihr Ergebnis nach dem gemeinsamen COMMIT.
+
+    So wartet nie mehr als ein Thread auf die Schreibsperre von SQLite, und
+    bei DB_SYNCHRONOUS=FULL teilen sich alle Anfragen eines Schubs ein fsync.
+    ``func`` darf selbst weder committen noch zurückrollen.
+    """
+
+    def __init__(self, max_batch=WRITE_BATCH_MAX, window_ms=WRITE_BATCH_MS):
+        self.max_batch = max_batch
+        self.window = window_ms / 1000
+        self._jobs = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.jobs = 0
+
+    @property
+    def enabled(self):
+        return self.max_batch > 0
+
+    def pending(self):
+        return self._jobs.qsize()
+
+    def run(self, func):
+        """Führt ``func(conn)`` in einer Schreibtransaktion aus und liefert ihr Ergebnis."""
+        if not self.enabled:
+            with db_pool.connection() as conn:
+                changes = conn.total_changes
+                result = func(conn)
+                changed = conn.total_changes != changes
+            if changed and change_feed.notify():
+                threading.Thread(target=self._prune_pooled, name='change-log-prune', daemon=True).start()
+            return result
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    # hier statt im Schreib-Thread öffnen: schlägt es fehl, erhält
+                    # der Aufrufer die Exception und der nächste Aufruf versucht
+                    # es erneut, statt auf einen toten Schreib-Thread zu warten
+                    conn = open_connection(isolation_level=None)
+                    self._thread = threading.Thread(target=self._writer, args=(conn,),
+                                                    name='db-writer', daemon=True)
+                    self._thread.start()
+        future = Future()
+        self._jobs.put((future, func, current_request.sample))
+        return future.result()
+
+    def close(self):
+        """Beendet den Schreib-Thread, nachdem die wartenden Aufträge erledigt sind."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._jobs.put(None)
+            thread.join(SHUTDOWN_TIMEOUT)
+
+    def _writer(self, conn):
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    return
+                batch = [job]
+                stop = self._collect(batch)
+                self._commit(conn, batch)
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _collect(self, batch):
+        """Ergänzt ``batch`` um weitere Aufträge; True, wenn close() aufgerufen wurde."""
+        deadline = time.monotonic() + self.window
+        while len(batch) < self.max_batch:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                try:
+                    job = self._jobs.get(timeout=remaining)
+                except queue.Empty:
+                    return False
+            if job is None:
+                return True
+            batch.append(job)
+        return False
+
+    def _commit(self, conn, batch):
+        outcomes = []
+        changes = conn.total_changes
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            for future, func, sample in batch:
+                # Messwerte (DB-Zeit, langsame Abfragen) der auftraggebenden Anfrage zuordnen
+                current_request.sample = sample
+                conn.execute('SAVEPOINT write_job')
+                try:
+                    outcomes.append((future, func(conn), None))
+                    conn.execute('RELEASE write_job')
+                except Exception as exc:
+                    conn.execute('ROLLBACK TO write_job')
+                    conn.execute('RELEASE write_job')
+                    outcomes.append((future, None, exc))
+            current_request.sample = None
+            conn.execute('COMMIT')
+        except Exception as exc:
+            current_request.sample = None
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            for future, _, _ in batch:
+                future.set_exception(exc)
+            return
+        with self._lock:
+            self.batches += 1
+            self.jobs += len(batch)
+        # Wartende und andere Prozesse erfahren vom Commit, bevor ein Aufrufer antwortet
+        prune = conn.total_changes != changes and change_feed.notify()
+        for future, result, exc in outcomes:
+            if exc is None:
+                future.set_result(result)
+            else:
+                future.set_exception(exc)
+        if prune:
+            self._prune(conn)
+
+    @staticmethod
+    def _prune(conn):
+        """Kürzt das Änderungsprotokoll im Schreib-Thread, nachdem alle Aufrufer ihr Ergebnis haben."""
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            prune_change_log(conn)
+            conn.execute('COMMIT')
+        except sqlite3.Error as exc:
+            if conn.in_transaction:
+                conn.execute('ROLLBACK')
+            print(f'Änderungsprotokoll nicht gekürzt: {exc}', file=sys.stderr, flush=True)
+
+    @staticmethod
+    def _prune_pooled():
+        """Wie _prune ohne Schreib-Thread (WRITE_BATCH_MAX=0), in einem eigenen Thread."""
+        try:
+            with db_pool.connection() as conn:
+                prune_change_log(conn)
+        except sqlite3.Error as exc:
+            print(f'Änderungsprotokoll nicht gekürzt: {exc}', file=sys.stderr, flush=True)
+
+
+write_queue = WriteQueue()
+
+
+# ----------------------
+#   Schema-Migrationen
+# ----------------------
+
+def _migrate_base_schema(conn):
+    """
+    Legt die Tabellen an bzw. ergänzt fehlende Spalten alter Datenbanken:
+
+    - customers (Kunden)
+    - projects (Projekte/Messen, inkl. customer_id)
+    - tasks (Aufgaben, inkl. assignee, priority)
+    """
+    cur = conn.cursor()
+
+    # Tabelle für Kunden
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS customers (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            contact_person TEXT,
+            email TEXT,
+            phone TEXT,
+            address TEXT,
+            design_note TEXT
+        )
+        """
+    )
+
+    # Tabelle für Projekte (Messen)
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS projects (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            customer TEXT NOT NULL,
+            fair TEXT,
+            size INTEGER,
+            date TEXT,
+            priority TEXT,
+            status TEXT,
+            nextStep TEXT,
+            dueDate TEXT
+        )
+        """
+    )
+
+    # Prüfen, ob Spalte customer_id vorhanden ist, sonst hinzufügen
+    cur.execute("PRAGMA table_info(projects)")
+    project_cols = [row[1] for row in cur.fetchall()]
+    if 'customer_id' not in project_cols:
+        # optional FK (nicht zwingend, da ALTER TABLE FK komplex ist)
+        cur.execute("ALTER TABLE projects ADD COLUMN customer_id INTEGER")
+
+    # Tabelle für Aufgaben mit zusätzlichen Feldern
+    cur.execute(
+        """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            status TEXT NOT NULL DEFAULT 'ToDo',
+            dueDate TEXT,
+            assignee TEXT,
+            priority TEXT,
+            FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE
+        )
+        """
+    )
+
+    # Prüfen, ob Spalten assignee/priority existieren (Migration für alte DBs)
+    cur.execute("PRAGMA table_info(tasks)")
+    task_cols = [row[1] for row in cur.fetchall()]
+    if 'assignee' not in task_cols:
+        cur.execute("ALTER TABLE tasks ADD COLUMN assignee TEXT")
+    if 'priority' not in task_cols:
+        cur.execute("ALTER TABLE tasks ADD COLUMN priority TEXT")
+
+
+def _migrate_list_indexes(conn):
+    """Indizes für Fremdschlüssel und Listenfilter, danach Statistiken für den Planer."""
+    for sql in LIST_INDEXES:
+        conn.execute(sql)
+    conn.execute('ANALYZE')
+
+
+def _migrate_change_log(conn):
+    """
+    Änderungsprotokoll: Trigger schreiben jede eingefügte, geänderte oder
+    gelöschte Zeile mit fortlaufender Sequenznummer (seq) in change_log.
+    Damit sind auch Sammel-Operationen und ON DELETE CASCADE erfasst.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS change_log (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            tbl TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            project_id INTEGER
+        )
+        """
+    )
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_change_log_tbl ON change_log(tbl, seq)')
+    for table, project in CHANGE_LOG_PROJECT.items():
+        for event, row, op in (('INSERT', 'NEW', 'upsert'), ('UPDATE', 'NEW', 'upsert'),
+                               ('DELETE', 'OLD', 'delete')):
+            conn.execute(
+                f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_{event.lower()}_log
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO change_log (tbl, row_id, op, project_id)
+                    VALUES ('{table}', {row}.id, '{op}', {project.format(row=row)});
+                END
+                """
+            )
+    # Wechselt eine Aufgabe das Projekt, ändert sich auch das bisherige Projekt
+    conn.execute(
+        """
+        CREATE TRIGGER IF NOT EXISTS trg_tasks_move_log
+        AFTER UPDATE OF project_id ON tasks
+        WHEN OLD.project_id IS NOT NEW.project_id
+        BEGIN
+            INSERT INTO change_log (tbl, row_id, op, project_id)
+            VALUES ('tasks', OLD.id, 'upsert', OLD.project_id);
+        END
+        """
+    )
+
+
+def _search_values(code, title, body, project, row=''):
+    """Spaltenwerte (rowid, title, body, project_id) für search_index aus einer Zeile."""
+    p = f'{row}.' if row else ''
+    text = " || ' ' || ".join(f"COALESCE({p}{col}, '')" for col in body)
+    project_value = f'{p}{project}' if project else 'NULL'
+    return f'{p}id * {SEARCH_KIND_SLOTS} + {code}, {p}{title}, {text}, {project_value}'
+
+
+def _create_search_index(conn, schema='main'):
+    """Legt die FTS5-Tabelle search_index in ``schema`` an (aktive Datenbank bzw. Archiv)."""
+    conn.execute(
+        f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {schema}.search_index USING fts5(
+            title, body, project_id UNINDEXED,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+        """
+    )
+    # Treffer im Titel zählen zehnmal so viel wie im übrigen Text
+    conn.execute(f"INSERT INTO {schema}.search_index(search_index, rank) VALUES('rank', 'bm25(10.0, 1.0, 0.0)')")
+
+
+def _migrate_search_index(conn):
+    """
+    Volltextindex search_index (FTS5) über Kunden, Projekte und Aufgaben
+    (siehe SEARCH_SOURCES). Trigger halten ihn aktuell, vorhandene Zeilen
+    werden einmalig übernommen.
+    """
+    _create_search_index(conn)
+    for table, (code, title, body, project) in SEARCH_SOURCES.items():
+        columns = ', '.join((title,) + body + ((project,) if project and project != 'id' else ()))
+        new_values = _search_values(code, title, body, project, 'NEW')
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_insert_search AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO search_index(rowid, title, body, project_id) VALUES ({new_values});
+            END
+            """
+        )
+        # nur wenn sich indizierte Spalten ändern (nicht z.B. beim Status)
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_update_search AFTER UPDATE OF {columns} ON {table}
+            BEGIN
+                DELETE FROM search_index WHERE rowid = OLD.id * {SEARCH_KIND_SLOTS} + {code};
+                INSERT INTO search_index(rowid, title, body, project_id) VALUES ({new_values});
+            END
+            """
+        )
+        conn.execute(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_delete_search AFTER DELETE ON {table}
+            BEGIN
+                DELETE FROM search_index WHERE rowid = OLD.id * {SEARCH_KIND_SLOTS} + {code};
+            END
+            """
+        )
+        conn.execute(
+            f'INSERT INTO search_index(rowid, title, body, project_id) '
+            f'SELECT {_search_values(code, title, body, project)} FROM {table}'
+        )
+    conn.execute("INSERT INTO search_index(search_index) VALUES('optimize')")
+
+
+# Zähler in project_stats für eine Aufgabenzeile ({row} = NEW bzw. OLD)
+# hinzufügen (sign = +) bzw. abziehen (sign = -)
+_STATS_COUNTERS = """
+    total = total {sign} 1,
+    todo = todo {sign} ({row}.status IS 'ToDo'),
+    in_progress = in_progress {sign} ({row}.status IS 'InBearbeitung'),
+    done = done {sign} ({row}.status IS 'Done')
+"""
+
+
+def _migrate_project_stats(conn):
+    """
+    Vorberechnete Aufgabenzähler je Projekt (project_stats), die Trigger bei
+    jeder Änderung an Aufgaben fortschreiben, statt sie pro Abfrage über alle
+    Aufgaben zu gruppieren. next_due ist das früheste Fälligkeitsdatum einer
+    offenen Aufgabe; neu berechnet (per Index über die Aufgaben des Projekts)
+    wird es nur, wenn genau diese Aufgabe erledigt, gelöscht oder verschoben wird.
+
+    Überfällige Aufgaben hängen vom heutigen Datum ab und werden daher nicht
+    gespeichert, sondern über den Teilindex idx_tasks_open_due gezählt.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS project_stats (
+            project_id INTEGER PRIMARY KEY,
+            total INTEGER NOT NULL DEFAULT 0,
+            todo INTEGER NOT NULL DEFAULT 0,
+            in_progress INTEGER NOT NULL DEFAULT 0,
+            done INTEGER NOT NULL DEFAULT 0,
+            next_due TEXT
+        )
+        """
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_open_due ON tasks(dueDate, project_id) "
+        "WHERE status != 'Done'"
+    )
+    add = 'UPDATE project_stats SET ' + _STATS_COUNTERS.format(sign='+', row='NEW') + """,
+            next_due = CASE WHEN NEW.status IS NOT 'Done' AND NEW.dueDate IS NOT NULL
+                                 AND (next_due IS NULL OR NEW.dueDate < next_due)
+                            THEN NEW.dueDate ELSE next_due END
+        WHERE project_id = NEW.project_id;"""
+    remove = 'UPDATE project_stats SET ' + _STATS_COUNTERS.format(sign='-', row='OLD') + """,
+            next_due = CASE WHEN OLD.dueDate IS next_due
+                            THEN (SELECT min(dueDate) FROM tasks
+                                  WHERE project_id = OLD.project_id AND status != 'Done')
+                            ELSE next_due END
+        WHERE project_id = OLD.project_id;"""
+    ensure = 'INSERT OR IGNORE INTO project_stats (project_id) VALUES (NEW.project_id);'
+    triggers = {
+        'trg_tasks_insert_stats': ('AFTER INSERT ON tasks', ensure + add),
+        'trg_tasks_delete_stats': ('AFTER DELETE ON tasks', remove),
+        'trg_tasks_update_stats': ('AFTER UPDATE OF project_id, status, dueDate ON tasks',
+                                   ensure + remove + add),
+        'trg_projects_insert_stats': (
+            'AFTER INSERT ON projects',
+            'INSERT OR IGNORE INTO project_stats (project_id) VALUES (NEW.id);'),
+        'trg_projects_delete_stats': (
+            'AFTER DELETE ON projects',
+            'DELETE FROM project_stats WHERE project_id = OLD.id;'),
+    }
+    for name, (event, body) in triggers.items():
+        conn.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END')
+    conn.execute(
+        """
+        INSERT OR REPLACE INTO project_stats (project_id, total, todo, in_progress, done, next_due)
+        SELECT p.id,
+               COUNT(t.id),
+               COALESCE(SUM(t.status IS 'ToDo'), 0),
+               COALESCE(SUM(t.status IS 'InBearbeitung'), 0),
+               COALESCE(SUM(t.status IS 'Done'), 0),
+               MIN(CASE WHEN t.status IS NOT 'Done' THEN t.dueDate END)
+        FROM projects p
+        LEFT JOIN tasks t ON t.project_id = p.id
+        GROUP BY p.id
+        """
+    )
+
+
+# Änderungszeitpunkt für updated_at/changed_at: UTC, ISO 8601 mit Millisekunden,
+# als Text sortierbar. SQLite wertet 'now' erst beim Ausführen unter der
+# Schreibsperre aus, spätere Commits haben daher nie kleinere Zeitstempel.
+NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+
+def _migrate_updated_at(conn):
+    """
+    Spalte updated_at in customers, projects und tasks, die die
+    Schreib-Handler bei jedem INSERT/UPDATE auf NOW_SQL setzen (bestehende
+    Zeilen bleiben NULL). change_log erhält changed_at, damit updated_since=
+    auch gelöschte Zeilen findet; dazu werden die Protokoll-Trigger aus
+    Migration 3 mit Zeitstempel neu angelegt.
+    """
+    for table in CHANGE_LOG_PROJECT:
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN updated_at TEXT')
+        conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{table}_updated_at ON {table}(updated_at)')
+    conn.execute('ALTER TABLE change_log ADD COLUMN changed_at TEXT')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_change_log_changed_at ON change_log(changed_at)')
+    for table, project in CHANGE_LOG_PROJECT.items():
+        for event, row, op in (('INSERT', 'NEW', 'upsert'), ('UPDATE', 'NEW', 'upsert'),
+                               ('DELETE', 'OLD', 'delete')):
+            name = f'trg_{table}_{event.lower()}_log'
+            conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+            conn.execute(
+                f"""
+                CREATE TRIGGER {name}
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO change_log (tbl, row_id, op, project_id, changed_at)
+                    VALUES ('{table}', {row}.id, '{op}', {project.format(row=row)}, {NOW_SQL});
+                END
+                """
+            )
+    conn.execute('DROP TRIGGER IF EXISTS trg_tasks_move_log')
+    conn.execute(
+        f"""
+        CREATE TRIGGER trg_tasks_move_log
+        AFTER UPDATE OF project_id ON tasks
+        WHEN OLD.project_id IS NOT NEW.project_id
+        BEGIN
+            INSERT INTO change_log (tbl, row_id, op, project_id, changed_at)
+            VALUES ('tasks', OLD.id, 'upsert', OLD.project_id, {NOW_SQL});
+        END
+        """
+    )
+
+
+# Datumsspalten, gespeichert als JJJJ-MM-TT: sortiert und vergleicht als Text
+# wie als Datum, Filter und Indizes arbeiten direkt darauf
+DATE_COLUMNS = (('projects', 'date'), ('projects', 'dueDate'), ('tasks', 'dueDate'))
+# Felder im JSON-Body, die normalize_dates umschreibt
+DATE_FIELDS = ('date', 'dueDate')
+
+ISO_DATE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})(?:[T ].*)?$')
+GERMAN_DATE = re.compile(r'(\d{1,2})\.(\d{1,2})\.(\d{4}|\d{2})$')
+
+
+def normalize_date(value, name='Datum'):
+    """
+    Datum als JJJJ-MM-TT, None für leere Werte. Akzeptiert außerdem
+    TT.MM.JJJJ, TT.MM.JJ und ISO-Zeitpunkte; alles andere löst ValueError aus.
+    """
+    if value is None or isinstance(value, str) and not value.strip():
+        return None
+    if isinstance(value, str):
+        text = value.strip()
+        match = ISO_DATE.match(text)
+        if match:
+            year, month, day = map(int, match.groups())
+        else:
+            match = GERMAN_DATE.match(text)
+            if match:
+                day, month, year = map(int, match.groups())
+                year += 2000 if year < 100 else 0
+        if match:
+            try:
+                return datetime.date(year, month, day).isoformat()
+            except ValueError:
+                pass
+    raise ValueError(f'{name} muss ein Datum sein (JJJJ-MM-TT)')
+
+
+def normalize_dates(data):
+    """Normalisiert die DATE_FIELDS im JSON-Body, auch in Listen (Sammel-Operationen)."""
+    if isinstance(data, list):
+        return [normalize_dates(item) for item in data]
+    if isinstance(data, dict):
+        return {key: normalize_date(value, key) if key in DATE_FIELDS else normalize_dates(value)
+                for key, value in data.items()}
+    return data
+
+
+def _migrate_date_columns(conn):
+    """
+    Bringt die DATE_COLUMNS auf JJJJ-MM-TT; bisher wurde jeder Text gespeichert.
+
+    Erkennbare Werte (siehe normalize_date) werden umgeschrieben, leere auf
+    NULL gesetzt. Nicht erkennbare bleiben in unparsed_dates erhalten und
+    werden in der Spalte ebenfalls NULL, damit Vergleiche und Indexbereiche
+    stimmen; init_db meldet sie bei jedem Start, GET /api/unparsed-dates
+    listet sie zum Nachtragen. Dazu ein Index auf projects.dueDate für
+    /api/timeline.
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS unparsed_dates (
+            tbl TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            field TEXT NOT NULL,
+            value TEXT,
+            PRIMARY KEY (tbl, row_id, field)
+        )
+        """
+    )
+    for table, column in DATE_COLUMNS:
+        # date(..., '+0 days') liefert nur für gültige JJJJ-MM-TT den Wert selbst
+        # (ohne Modifikator bliebe z.B. 2025-02-30 unverändert)
+        rows = conn.execute(
+            f"SELECT id, {column} FROM {table} "
+            f"WHERE {column} IS NOT NULL AND date({column}, '+0 days') IS NOT {column}"
+        ).fetchall()
+        for row_id, value in rows:
+            try:
+                normalized = normalize_date(value)
+            except ValueError:
+                normalized = None
+                conn.execute('INSERT OR REPLACE INTO unparsed_dates VALUES (?, ?, ?, ?)',
+                             (table, row_id, column, value))
+            conn.execute(f'UPDATE {table} SET {column} = ?, updated_at = {NOW_SQL} WHERE id = ?',
+                         (normalized, row_id))
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_projects_dueDate ON projects(dueDate)')
+
+
+def _migrate_legacy_updated_at(conn):
+    """
+    Merkt in schema_meta den Zeitpunkt dieser Migration als
+    ``legacy_updated_at``: Zeilen, die seit Migration 6 ohne updated_at
+    geblieben sind, gelten als zu diesem Zeitpunkt geändert (siehe
+    ARCHIVE_CANDIDATES_SQL). Ein UPDATE der Zeilen selbst würde für jede
+    einen Eintrag im Änderungsprotokoll erzeugen.
+    """
+    conn.execute('CREATE TABLE IF NOT EXISTS schema_meta (key TEXT PRIMARY KEY, value TEXT)')
+    conn.execute(f"INSERT OR REPLACE INTO schema_meta VALUES ('legacy_updated_at', {NOW_SQL})")
+
+
+# Versionierte Migrationen: (Version, Beschreibung, Funktion).
+# Die aktuelle Version steht in PRAGMA user_version der Datenbank; neue
+# Migrationen werden nur hinten angehängt, bestehende nie verändert.
+MIGRATIONS = [
+    (1, 'Basisschema customers/projects/tasks', _migrate_base_schema),
+    (2, 'Indizes für Listenfilter und ANALYZE', _migrate_list_indexes),
+    (3, 'Änderungsprotokoll change_log mit Triggern', _migrate_change_log),
+    (4, 'Volltextindex search_index (FTS5)', _migrate_search_index),
+    (5, 'Vorberechnete Aufgabenzähler project_stats', _migrate_project_stats),
+    (6, 'Änderungszeitpunkt updated_at und change_log.changed_at', _migrate_updated_at),
+    (7, 'Datumsspalten als JJJJ-MM-TT, Index auf projects.dueDate', _migrate_date_columns),
+    (8, 'Änderungszeitpunkt für Zeilen ohne updated_at', _migrate_legacy_updated_at),
+]
+
 
 def init_db():
     """
-    Initialisiert die SQLite-Datenbank und legt/aktualisiert die Tabellen:
+    Bringt die SQLite-Datenbank auf den aktuellen Schemastand.
+
+    Jede noch nicht angewendete Migration aus MIGRATIONS läuft in einer
+    eigenen Transaktion zusammen mit dem Hochsetzen von user_version. Bricht
+    eine Migration ab, bleibt die Datenbank auf der vorherigen Version.
+    """
+    conn = sqlite3.connect(DB_FILE, isolation_level=None)
+    try:
+        conn.execute('PRAGMA foreign_keys = ON')
+        for version, description, migrate in MIGRATIONS:
+            # IMMEDIATE sperrt für Schreiber, damit parallel startende
+            # Prozesse dieselbe Migration nicht doppelt ausführen
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                current = conn.execute('PRAGMA user_version').fetchone()[0]
+                if current >= version:
+                    conn.execute('ROLLBACK')
+                    continue
+                migrate(conn)
+                conn.execute(f'PRAGMA user_version = {version}')
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            print(f'Datenbank migriert auf Version {version}: {description}')
+        counts = defaultdict(int)
+        for table, _, _, field, _ in conn.execute(UNPARSED_DATES_SQL):
+            counts[f'{table}.{field}'] += 1
+        for column, count in counts.items():
+            print(f'{column}: {count} nicht erkennbare Datumswerte, die Spalte ist leer '
+                  f'(Originalwerte unter GET /api/unparsed-dates)', file=sys.stderr)
+        attach_archive(conn)
+        init_archive(conn)
+    finally:
+        conn.close()
+
+
+# ----------------------
+#   Listen-Abfragen
+# ----------------------
+
+# Spalten je Tabelle; erlaubt für fields= (Projektion) und sort=
+TABLE_COLUMNS = {
+    'customers': ('id', 'name', 'contact_person', 'email', 'phone', 'address', 'design_note',
+                  'updated_at'),
+    'projects': ('id', 'name', 'customer', 'fair', 'size', 'date', 'priority', 'status',
+                 'nextStep', 'dueDate', 'customer_id', 'updated_at'),
+    'tasks': ('id', 'project_id', 'title', 'description', 'status', 'dueDate',
+              'assignee', 'priority', 'updated_at'),
+}
+
+# INSERT/UPDATE ... RETURNING liefert die Zeile ohne zweites SELECT, in der
+# Spaltenreihenfolge von TABLE_COLUMNS
+RETURNING = {table: 'RETURNING ' + ', '.join(columns) for table, columns in TABLE_COLUMNS.items()}
+
+
+def row_dict(table, row):
+    """Zeile aus einer RETURNING-Klausel (oder None) als dict wie bei SELECT *."""
+    return None if row is None else dict(zip(TABLE_COLUMNS[table], row))
+
+# Filter je Tabelle: Query-Parameter -> SQL-Bedingung
+LIST_FILTERS = {
+    'customers': {},
+    'projects': {
+        'status': 'status = ?',
+        'customer_id': 'customer_id = ?',
+        'date_from': 'date >= ?',
+        'date_to': 'date <= ?',
+    },
+    'tasks': {
+        'project_id': 'project_id = ?',
+        'status': 'status = ?',
+        'assignee': 'assignee = ?',
+        'priority': 'priority = ?',
+        'due_from': 'dueDate >= ?',
+        'due_to': 'dueDate <= ?',
+    },
+}
+
+# Passende Indizes zu LIST_FILTERS und den Unterlisten je Kunde/Projekt
+# (angelegt durch Migration 2)
+LIST_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_projects_status ON projects(status)',
+    'CREATE INDEX IF NOT EXISTS idx_projects_customer_id ON projects(customer_id)',
+    'CREATE INDEX IF NOT EXISTS idx_projects_date ON projects(date)',
+    'CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks(project_id)',
+    'CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)',
+    'CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks(assignee)',
+    'CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority)',
+    'CREATE INDEX IF NOT EXISTS idx_tasks_dueDate ON tasks(dueDate)',
+)
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Zeilen je Chunk beim Streamen ungepaginierter Listen
+STREAM_BATCH_ROWS = 500
+
+ListQuery = namedtuple('ListQuery', 'sql args fields sort_col desc limit')
+
+
+def encode_cursor(sort_value, row_id):
+    """Kodiert die Position nach der letzten Zeile einer Seite als URL-sicheren String."""
+    return base64.urlsafe_b64encode(json.dumps([sort_value, row_id]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Ungültiger Cursor')
+    if not isinstance(row_id, int):
+        raise ValueError('Ungültiger Cursor')
+    return sort_value, row_id
+
+
+def parse_limit(value):
+    if not value.isdigit() or not 0 < int(value) <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit muss zwischen 1 und {MAX_PAGE_SIZE} liegen')
+    return int(value)
+
+
+def _keyset_condition(sort_col, desc, sort_value, row_id):
+    """
+    Bedingung für "Zeilen nach (sort_value, row_id)" bei ORDER BY sort_col, id.
+
+    SQLite sortiert NULL bei ASC zuerst und bei DESC zuletzt, daher die
+    Sonderfälle für NULL-Werte.
+    """
+    op = '<' if desc else '>'
+    if sort_col == 'id':
+        return f'id {op} ?', [row_id]
+    if sort_value is None:
+        if desc:
+            return f'{sort_col} IS NULL AND id < ?', [row_id]
+        return f'({sort_col} IS NULL AND id > ?) OR {sort_col} IS NOT NULL', [row_id]
+    cond = f'{sort_col} {op} ? OR ({sort_col} = ? AND id {op} ?)'
+    if desc:
+        cond += f' OR {sort_col} IS NULL'
+    return cond, [sort_value, sort_value, row_id]
+
+
+def build_list_query(table, params, where=(), args=()):
+    """
+    Baut die SELECT-Abfrage für einen Listen-Endpunkt.
+
+    Unterstützte Query-Parameter:
+    - Filter laut LIST_FILTERS[table]
+    - fields=a,b,c   nur diese Spalten ausgeben
+    - sort=spalte    aufsteigend, sort=-spalte absteigend (Standard: id)
+    - limit=n        Seitengröße (max. MAX_PAGE_SIZE); ohne limit/cursor alle Zeilen
+    - cursor=...     Position aus dem Header X-Next-Cursor der vorigen Seite
+    - archive=1      auch archivierte Zeilen (siehe table_source)
+
+    ``where``/``args`` sind feste Bedingungen des Endpunkts (z.B. project_id=?).
+    Ungültige Parameter lösen ValueError aus.
+    """
+    columns = TABLE_COLUMNS[table]
+    source = table_source(table, params)
+    where = list(where)
+    args = list(args)
+    for name, cond in LIST_FILTERS[table].items():
+        if params.get(name):
+            where.append(cond)
+            args.append(params[name])
+
+    fields = columns
+    if params.get('fields'):
+        fields = tuple(dict.fromkeys(f for f in params['fields'].split(',') if f))
+        for f in fields:
+            if f not in columns:
+                raise ValueError(f'Unbekanntes Feld: {f}')
+
+    sort = params.get('sort') or 'id'
+    desc = sort.startswith('-')
+    sort_col = sort.lstrip('-')
+    if sort_col not in columns:
+        raise ValueError(f'Unbekannte Sortierung: {sort}')
+
+    limit = parse_limit(params['limit']) if params.get('limit') else None
+    if params.get('cursor'):
+        cond, cond_args = _keyset_condition(sort_col, desc, *decode_cursor(params['cursor']))
+        where.append(cond)
+        args.extend(cond_args)
+        limit = limit or DEFAULT_PAGE_SIZE
+
+    # id und Sortierspalte werden immer gelesen, damit ein Cursor gebildet werden kann
+    select = list(fields) + [c for c in ('id', sort_col) if c not in fields]
+    direction = 'DESC' if desc else 'ASC'
+    sql = f'SELECT {", ".join(select)} FROM {source}'
+    if where:
+        sql += ' WHERE ' + ' AND '.join(f'({w})' for w in where)
+    if sort_col == 'id':
+        sql += f' ORDER BY id {direction}'
+    else:
+        sql += f' ORDER BY {sort_col} {direction}, id {direction}'
+    if limit:
+        # eine Zeile mehr lesen, um zu erkennen, ob es eine weitere Seite gibt
+        sql += ' LIMIT ?'
+        args.append(limit + 1)
+    return ListQuery(sql, args, fields, sort_col, desc, limit)
+
+
+# Offene, überfällige Aufgaben je Projekt (Parameter: heutiges Datum). Liest
+# nur den Teilindex idx_tasks_open_due bis zum Stichtag, nicht alle Aufgaben.
+OVERDUE_SQL = """
+    SELECT project_id, COUNT(*) AS overdue
+    FROM tasks INDEXED BY idx_tasks_open_due
+    WHERE status != 'Done' AND dueDate < ?
+    GROUP BY project_id
+"""
+
+# Projekte mit Aufgabenzählern für die Übersichtsseite, aus den von Triggern
+# gepflegten project_stats (Aufwand je Projekt, nicht je Aufgabe).
+# Parameter: heutiges Datum (siehe OVERDUE_SQL).
+OVERVIEW_SQL = f"""
+    SELECT p.*,
+           COALESCE(s.total, 0) AS totalTasks,
+           COALESCE(s.todo, 0) AS todoTasks,
+           COALESCE(s.in_progress, 0) AS inProgressTasks,
+           COALESCE(s.done, 0) AS doneTasks,
+           COALESCE(s.total - s.done, 0) AS openTasks,
+           COALESCE(o.overdue, 0) AS overdueTasks,
+           s.next_due AS nextDue
+    FROM projects p
+    LEFT JOIN project_stats s ON s.project_id = p.id
+    LEFT JOIN ({OVERDUE_SQL}) o ON o.project_id = p.id
+"""
+
+# Zähler je Projekt für /api/stats
+STATS_SQL = f"""
+    SELECT p.id AS project_id, p.customer_id, p.status,
+           COALESCE(s.total, 0) AS totalTasks,
+           COALESCE(s.todo, 0) AS todoTasks,
+           COALESCE(s.in_progress, 0) AS inProgressTasks,
+           COALESCE(s.done, 0) AS doneTasks,
+           COALESCE(s.total - s.done, 0) AS openTasks,
+           COALESCE(o.overdue, 0) AS overdueTasks,
+           s.next_due AS nextDue
+    FROM projects p
+    LEFT JOIN project_stats s ON s.project_id = p.id
+    LEFT JOIN ({OVERDUE_SQL}) o ON o.project_id = p.id
+    ORDER BY p.id
+"""
+
+STATS_COUNTERS = ('totalTasks', 'todoTasks', 'inProgressTasks', 'doneTasks', 'openTasks', 'overdueTasks')
+
+
+def today_iso():
+    """Heutiges Datum wie in dueDate gespeichert (JJJJ-MM-TT)."""
+    return time.strftime('%Y-%m-%d')
+
+
+def summarize_stats(projects):
+    """
+    Fasst die Zeilen aus STATS_SQL je Kunde und insgesamt zusammen: Summen
+    der Zähler, frühestes nextDue und Anzahl Projekte je Projektstatus.
+    """
+    def empty():
+        return dict({c: 0 for c in STATS_COUNTERS}, projects=0, nextDue=None, projectsByStatus={})
+
+    totals = empty()
+    customers = defaultdict(empty)
+    for row in projects:
+        for summary in (totals, customers[row['customer_id']]):
+            summary['projects'] += 1
+            for c in STATS_COUNTERS:
+                summary[c] += row[c]
+            if row['nextDue'] and (summary['nextDue'] is None or row['nextDue'] < summary['nextDue']):
+                summary['nextDue'] = row['nextDue']
+            status = row['status'] or ''
+            summary['projectsByStatus'][status] = summary['projectsByStatus'].get(status, 0) + 1
+    return totals, [dict(summary, customer_id=customer_id) for customer_id, summary in customers.items()]
+
+
+# ----------------------
+#   Änderungsprotokoll
+# ----------------------
+
+# Projekt, zu dem ein change_log-Eintrag gehört ({row} = NEW bzw. OLD), damit
+# Übersicht und Aufgabenlisten je Projekt ihre Änderungen finden
+CHANGE_LOG_PROJECT = {
+    'customers': 'NULL',
+    'projects': '{row}.id',
+    'tasks': '{row}.project_id',
+}
+
+# Höchstzahl Einträge je Antwort von /api/changes
+CHANGE_FEED_BATCH = 500
+# Sekunden, nach denen Wartende auch ohne Benachrichtigung erneut nachsehen
+# (z.B. für Änderungen aus anderen Prozessen)
+CHANGE_POLL_INTERVAL = 1
+# Sekunden ohne Ereignis, nach denen ein SSE-Stream einen Kommentar sendet
+CHANGE_PING_INTERVAL = 15
+# Wartezeit des Browsers vor dem Neuverbinden eines SSE-Streams
+CHANGE_RETRY_MS = 2000
+# Alle so viele Schreibzugriffe werden alte Einträge gelöscht
+CHANGE_PRUNE_EVERY = 100
+
+# IDs der Zeilen einer Liste, die sich nach einer Sequenznummer geändert
+# haben. Für die Übersicht zählen auch Aufgaben, da sie die Zähler ändern.
+DELTA_KEYS = {
+    'customers': "SELECT row_id FROM change_log WHERE tbl = 'customers' AND seq > ?",
+    'projects': "SELECT row_id FROM change_log WHERE tbl = 'projects' AND seq > ?",
+    'tasks': "SELECT row_id FROM change_log WHERE tbl = 'tasks' AND seq > ?",
+    'overview': "SELECT project_id FROM change_log WHERE tbl IN ('projects', 'tasks') AND seq > ?",
+}
+
+
+def parse_since(value):
+    if not value.isdigit():
+        raise ValueError('since muss eine Sequenznummer sein')
+    return int(value)
+
+
+def change_log_range(conn):
+    """(kleinste, größte) Sequenznummer im Änderungsprotokoll, (0, 0) wenn es leer ist."""
+    low, high = conn.execute('SELECT min(seq), max(seq) FROM change_log').fetchone()
+    return low or 0, high or 0
+
+
+def _since_available(conn, since):
+    """Liegen alle Änderungen nach ``since`` noch vor? Liefert sonst None, ansonsten die größte seq."""
+    low, high = change_log_range(conn)
+    if since > high or since < low - 1:
+        return None
+    return high
+
+
+def read_changes(conn, since, limit=CHANGE_FEED_BATCH):
+    """
+    Einträge des Änderungsprotokolls nach ``since`` in Reihenfolge, oder
+    None, wenn sie nicht mehr vollständig vorliegen (bereits gelöscht oder
+    ``since`` stammt aus einer anderen Datenbank).
+    """
+    if _since_available(conn, since) is None:
+        return None
+    rows = conn.execute(
+        'SELECT seq, tbl, row_id, op, project_id FROM change_log WHERE seq > ? ORDER BY seq LIMIT ?',
+        (since, limit)
+    ).fetchall()
+    return [{'seq': seq, 'table': tbl, 'id': row_id, 'op': op, 'project_id': project_id}
+            for seq, tbl, row_id, op, project_id in rows]
+
+
+def read_delta(conn, key, since, sql, args, fields=None):
+    """
+    Änderungen einer Liste seit ``since`` als
+    ``{'seq': ..., 'rows': [...], 'removed': [...]}``.
+
+    ``sql``/``args`` liefern den aktuellen Stand der geänderten Zeilen (die
+    Abfrage ist auf ``id IN (DELTA_KEYS[key])`` eingeschränkt). Geänderte
+    IDs, die sie nicht mehr liefert, wurden gelöscht oder passen nicht mehr
+    zu den Filtern und stehen in ``removed``. None, wenn die Änderungen
+    nicht mehr vorliegen (siehe read_changes).
+    """
+    high = _since_available(conn, since)
+    if high is None:
+        return None
+    changed = {row[0] for row in conn.execute(DELTA_KEYS[key], (since,))}
+    rows = conn.execute(sql, args).fetchall() if changed else []
+    present = {row['id'] for row in rows}
+    if fields:
+        rows = [{f: row[f] for f in fields} for row in rows]
+    else:
+        rows = [dict(row) for row in rows]
+    return {'seq': high, 'rows': rows, 'removed': sorted(changed - present - {None})}
+
+
+# ----------------------
+#   Offene Aufgaben
+# ----------------------
+
+# Aufgaben mit dem Namen ihres Projekts für /api/tasks/open
+OPEN_TASKS_SQL = """
+    SELECT t.*, p.name AS project_name
+    FROM tasks t
+    JOIN projects p ON p.id = t.project_id
+"""
+
+OPEN_TASK_FILTERS = {
+    'project_id': 't.project_id = ?',
+    'assignee': 't.assignee = ?',
+    'priority': 't.priority = ?',
+}
+
+# Aufgaben, die sich selbst oder deren Projekt sich seit ? geändert haben
+CHANGED_TASKS_SQL = """
+    SELECT id FROM tasks WHERE updated_at >= ?
+    UNION
+    SELECT id FROM tasks WHERE project_id IN (SELECT id FROM projects WHERE updated_at >= ?)
+"""
+
+# Stand für den nächsten updated_since=-Abruf: jüngster Zeitstempel von
+# Aufgaben, Projekten und Löschungen (je ein Indexzugriff)
+LATEST_UPDATE_SQL = """
+    SELECT COALESCE(max(ts), '1970-01-01T00:00:00.000Z') FROM (
+        SELECT max(updated_at) AS ts FROM tasks
+        UNION ALL SELECT max(updated_at) FROM projects
+        UNION ALL SELECT max(changed_at) FROM change_log
+    )
+"""
+
+
+def parse_updated_since(value):
+    """ISO-8601-Zeitpunkt (ohne Zeitzone: UTC) im Format von NOW_SQL."""
+    try:
+        moment = datetime.datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError('updated_since muss ein ISO-8601-Zeitpunkt sein')
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(datetime.timezone.utc)
+    return f'{moment:%Y-%m-%dT%H:%M:%S}.{moment.microsecond // 1000:03d}Z'
+
+
+def open_tasks_filter(params):
+    """
+    Bedingungen und Argumente für /api/tasks/open. ``status=a,b`` wählt diese
+    Status, ``status!=a,b`` alle anderen; ohne beides alle außer 'Done'.
+    Dazu die Filter aus OPEN_TASK_FILTERS.
+    """
+    where = []
+    args = []
+    if 'status' in params and 'status!' in params:
+        raise ValueError('status und status! schließen sich aus')
+    for name, op in (('status', 'IN'), ('status!', 'NOT IN')):
+        if name in params:
+            values = [v for v in params[name].split(',') if v]
+            if not values:
+                raise ValueError(f'{name} braucht mindestens einen Status')
+            where.append(f't.status {op} ({", ".join("?" * len(values))})')
+            args.extend(values)
+    if not where:
+        where.append("t.status != 'Done'")
+    for name, cond in OPEN_TASK_FILTERS.items():
+        if params.get(name):
+            where.append(cond)
+            args.append(params[name])
+    return where, args
+
+
+def read_open_tasks_delta(conn, where, args, since):
+    """
+    Änderungen der offenen Aufgaben seit ``since`` (Zeitstempel wie
+    updated_at) als ``{'updated_at': ..., 'rows': [...], 'removed': [...]}``.
+
+    ``rows`` sind die passenden Aufgaben, die selbst oder deren Projekt sich
+    seitdem geändert haben; ``removed`` die geänderten, die nicht mehr
+    passen (z.B. erledigt), und die gelöschten laut change_log. None, wenn
+    das Änderungsprotokoll nicht mehr bis ``since`` zurückreicht.
+    """
+    low = change_log_range(conn)[0]
+    if low > 1:
+        # Einträge wurden schon gelöscht: nur sicher, solange since jünger ist
+        # als der älteste verbliebene (gleiche Millisekunde kann fehlen)
+        oldest = conn.execute('SELECT min(changed_at) FROM change_log').fetchone()[0]
+        if oldest is None or since <= oldest:
+            return None
+    # vor den Zeilen lesen: was danach geschrieben wird, kommt beim nächsten Mal erneut
+    latest = conn.execute(LATEST_UPDATE_SQL).fetchone()[0]
+    changed = {row[0] for row in conn.execute(CHANGED_TASKS_SQL, (since, since))}
+    rows = []
+    if changed:
+        rows = conn.execute(
+            f'{OPEN_TASKS_SQL} WHERE {" AND ".join(where)} AND t.id IN ({CHANGED_TASKS_SQL}) '
+            f'ORDER BY t.id', args + [since, since]).fetchall()
+    present = {row['id'] for row in rows}
+    deleted = {row[0] for row in conn.execute(
+        "SELECT row_id FROM change_log WHERE tbl = 'tasks' AND op = 'delete' AND changed_at >= ?",
+        (since,))}
+    return {'updated_at': latest, 'rows': [dict(row) for row in rows],
+            'removed': sorted((changed | deleted) - present)}
+
+
+def prune_change_log(conn):
+    """Löscht alles bis auf die neuesten CHANGE_LOG_RETAIN Einträge."""
+    conn.execute(
+        'DELETE FROM change_log WHERE seq <= (SELECT max(seq) FROM change_log) - ?',
+        (CHANGE_LOG_RETAIN,)
+    )
+
+
+class ChangeFeed:
+    """
+    Weckt wartende Long-Poll-/SSE-Anfragen nach Schreibzugriffen und
+    begrenzt, wie viele davon gleichzeitig einen Worker-Thread belegen.
+
+    Die Einträge selbst schreiben die Trigger aus Migration 3; ``version``
+    zählt nur die Benachrichtigungen, damit Wartende keine verpassen.
+    """
+
+    def __init__(self, max_streams=CHANGE_STREAM_MAX):
+        self.version = 0
+        self.streams = 0
+        self._cond = threading.Condition()
+        self._streams = threading.BoundedSemaphore(max(1, max_streams))
+
+    def notify(self):
+        """
+        Nach jedem Commit mit Änderungen aufrufen (aus WriteQueue, bevor der
+        schreibende Handler antwortet). True, wenn es Zeit ist, alte Einträge
+        zu löschen (alle CHANGE_PRUNE_EVERY Commits, siehe prune_change_log).
+        """
+        process_sync.publish()
+        return self.wake() % CHANGE_PRUNE_EVERY == 0
+
+    def wake(self):
+        """Weckt alle Wartenden (auch für Änderungen aus anderen Prozessen)."""
+        with self._cond:
+            self.version += 1
+            self._cond.notify_all()
+            return self.version
+
+    def wait(self, version, timeout):
+        """Wartet höchstens ``timeout`` Sekunden, solange ``version`` aktuell ist."""
+        with self._cond:
+            if self.version == version:
+                self._cond.wait(timeout)
+
+    def try_open_stream(self):
+        if not self._streams.acquire(blocking=False):
+            return False
+        with self._cond:
+            self.streams += 1
+        return True
+
+    def close_stream(self):
+        with self._cond:
+            self.streams -= 1
+        self._streams.release()
+
+
+change_feed = ChangeFeed()
+
+
+# ----------------------
+#   Termine
+# ----------------------
+
+# Zeitraum von /api/timeline ohne from/to: heute und die folgenden Tage
+TIMELINE_DEFAULT_DAYS = 7
+
+# Art -> (Abfrage, Datumsspalte, ID-Spalte, Bedingung und Parameter für
+# open=1). Sortiert nach Datum und ID liest jede Abfrage nur ihren Bereich
+# des Index auf der Datumsspalte (für offene Aufgaben idx_tasks_open_due).
+TIMELINE_SOURCES = {
+    'project': (
+        "SELECT 'project' AS kind, id, dueDate AS date, name AS title, status, "
+        "id AS project_id, name AS project_name FROM projects",
+        'dueDate', 'id',
+        f'(status IS NULL OR status NOT IN ({", ".join("?" * len(ARCHIVE_STATUSES))}))', ARCHIVE_STATUSES,
+    ),
+    'task': (
+        "SELECT 'task' AS kind, t.id, t.dueDate AS date, t.title, t.status, "
+        "t.project_id, p.name AS project_name FROM tasks t JOIN projects p ON p.id = t.project_id",
+        't.dueDate', 't.id',
+        "t.status != 'Done'", (),
+    ),
+}
+
+
+def parse_timeline_cursor(cursor):
+    """(Datum, Art, ID) der letzten Zeile aus einem Cursor von /api/timeline."""
+    sort_value, row_id = decode_cursor(cursor)
+    if (not isinstance(sort_value, list) or len(sort_value) != 2
+            or not isinstance(sort_value[0], str) or sort_value[1] not in TIMELINE_SOURCES):
+        raise ValueError('Ungültiger Cursor')
+    return sort_value[0], sort_value[1], row_id
+
+
+def read_timeline(conn, start, end, kinds, open_only, limit, after=None):
+    """
+    Termine mit Datum zwischen ``start`` und ``end`` (JJJJ-MM-TT, jeweils
+    einschließlich, None = unbegrenzt), sortiert nach (date, kind, id).
+    Liefert höchstens ``limit`` + 1 Zeilen, die letzte zeigt nur an, dass es
+    weitere gibt. ``after`` ist (Datum, Art, ID) der letzten Zeile der
+    vorigen Seite.
+
+    Jede Art wird getrennt per Indexbereich gelesen (höchstens ``limit`` + 1
+    Zeilen) und die sortierten Teilergebnisse werden zusammengeführt.
+    """
+    runs = []
+    for kind in kinds:
+        sql, column, id_column, open_cond, open_args = TIMELINE_SOURCES[kind]
+        where, args = [f'{column} IS NOT NULL'], []
+        if start:
+            where.append(f'{column} >= ?')
+            args.append(start)
+        if end:
+            where.append(f'{column} <= ?')
+            args.append(end)
+        if open_only:
+            where.append(open_cond)
+            args.extend(open_args)
+        if after:
+            day, last_kind, last_id = after
+            if kind > last_kind:
+                where.append(f'{column} >= ?')
+                args.append(day)
+            elif kind < last_kind:
+                where.append(f'{column} > ?')
+                args.append(day)
+            else:
+                where.append(f'({column} > ? OR ({column} = ? AND {id_column} > ?))')
+                args.extend([day, day, last_id])
+        runs.append(conn.execute(
+            f'{sql} WHERE {" AND ".join(where)} ORDER BY {column}, {id_column} LIMIT ?', args + [limit + 1]
+        ).fetchall())
+    merged = heapq.merge(*runs, key=lambda row: (row['date'], row['kind'], row['id']))
+    return [row for row, _ in zip(merged, range(limit + 1))]
+
+
+# Von Migration 7 zurückgestellte Datumswerte (unparsed_dates), solange die
+# Spalte der Zeile noch leer ist; wird dort per PUT ein Datum eingetragen,
+# verschwindet der Eintrag aus der Liste
+UNPARSED_DATES_SQL = ' UNION ALL '.join(
+    f"SELECT u.tbl AS \"table\", u.row_id AS id, r.{'title' if table == 'tasks' else 'name'} AS title, "
+    f"u.field, u.value FROM unparsed_dates u JOIN {table} r ON r.id = u.row_id "
+    f"WHERE u.tbl = '{table}' AND u.field = '{column}' AND r.{column} IS NULL"
+    for table, column in DATE_COLUMNS
+) + ' ORDER BY 1, 2, 4'
+
+
+def read_unparsed_dates(conn):
+    """Einträge von UNPARSED_DATES_SQL als Liste von dicts (table, id, title, field, value)."""
+    return [dict(row) for row in conn.execute(UNPARSED_DATES_SQL)]
+
+
+# ----------------------
+#   Volltextsuche
+# ----------------------
+
+# Tabelle -> (Kennziffer, Titelspalte, weitere Textspalten, Projektspalte).
+# Die rowid im Index ist id * SEARCH_KIND_SLOTS + Kennziffer, daraus ergeben
+# sich Tabelle und id eines Treffers ohne weitere Abfrage.
+SEARCH_SOURCES = {
+    'customers': (1, 'name', ('contact_person', 'design_note'), None),
+    'projects': (2, 'name', ('customer', 'fair', 'nextStep'), 'id'),
+    'tasks': (3, 'title', ('description', 'assignee'), 'project_id'),
+}
+SEARCH_KIND_SLOTS = 4
+SEARCH_KINDS = {code: table for table, (code, *_) in SEARCH_SOURCES.items()}
+
+SEARCH_PAGE_SIZE = 20
+SEARCH_MAX_TERMS = 10
+SEARCH_TERM = re.compile(r'\w+')
+
+
+def build_search_query(params):
+    """
+    Baut die Abfrage für /api/search, Rückgabe ``(sql, args, limit)``.
+
+    Unterstützte Query-Parameter:
+    - q=...          Suchbegriffe; alle müssen vorkommen, jeweils als Wortanfang,
+                     Zahlen als ganzes Wort (Groß-/Kleinschreibung und Akzente egal)
+    - type=a,b       nur customers, projects und/oder tasks
+    - archive=1      auch archivierte Projekte und Aufgaben (archive.search_index)
+    - limit/cursor   wie bei Listen (Standard SEARCH_PAGE_SIZE Treffer)
+
+    Sortiert wird nach Relevanz (bm25, Treffer im Titel zählen mehr).
+    Ungültige Parameter lösen ValueError aus.
+    """
+    terms = SEARCH_TERM.findall(params.get('q', ''))[:SEARCH_MAX_TERMS]
+    if not terms:
+        raise ValueError('Suchbegriff q fehlt')
+    where = ['search_index MATCH ?']
+    # Zahlen exakt: "3"* träfe auch 30, 31, ... und vervielfacht die zu
+    # bewertenden Treffer (bm25 wird für jeden Treffer berechnet)
+    args = [' '.join(f'"{term}"' if term.isdigit() else f'"{term}"*' for term in terms)]
+    if params.get('type'):
+        codes = []
+        for kind in params['type'].split(','):
+            if kind not in SEARCH_SOURCES:
+                raise ValueError(f'Unbekannter Typ: {kind}')
+            codes.append(SEARCH_SOURCES[kind][0])
+        where.append(f'rowid % {SEARCH_KIND_SLOTS} IN ({", ".join("?" * len(codes))})')
+        args.extend(codes)
+    archive = parse_archive(params)
+    limit = parse_limit(params['limit']) if params.get('limit') else SEARCH_PAGE_SIZE
+    after, after_args = [], []
+    if params.get('cursor'):
+        rank, rowid = decode_cursor(params['cursor'])
+        if not isinstance(rank, (int, float)):
+            raise ValueError('Ungültiger Cursor')
+        after.append('(rank > ? OR (rank = ? AND rowid > ?))')
+        after_args.extend([rank, rank, rowid])
+    select = ("SELECT rowid, title, project_id, snippet(search_index, -1, '[', ']', '…', 12) AS snippet, rank "
+              "FROM {schema}.search_index WHERE ")
+    if not archive:
+        sql = (select.format(schema='main') + ' AND '.join(where + after) + ' ORDER BY rank, rowid LIMIT ?')
+        return sql, args + after_args + [limit + 1], limit
+    # Die Ränge beider Indizes beruhen auf getrennten Statistiken, sind aber
+    # vergleichbar genug, um gemeinsam sortiert zu werden. Steht ein Eintrag
+    # während des Verschiebens kurz in beiden, zählt der aktive.
+    sql = (
+        f"SELECT * FROM ({select.format(schema='main')}{' AND '.join(where)} "
+        f"UNION ALL {select.format(schema='archive')}{' AND '.join(where)} "
+        "AND rowid NOT IN (SELECT rowid FROM main.search_index)) "
+        f"{'WHERE ' + after[0] if after else ''} ORDER BY rank, rowid LIMIT ?"
+    )
+    return sql, args + args + after_args + [limit + 1], limit
+
+
+def search_result(row):
+    """Treffer als JSON-Objekt; im snippet sind die Fundstellen in [ ] gesetzt."""
+    return {
+        'type': SEARCH_KINDS[row['rowid'] % SEARCH_KIND_SLOTS],
+        'id': row['rowid'] // SEARCH_KIND_SLOTS,
+        'title': row['title'],
+        'snippet': row['snippet'],
+        'project_id': row['project_id'],
+    }
+
+
+# ----------------------
+#   Sammel-Operationen
+# ----------------------
+
+BULK_MAX_ITEMS = 1000
+
+# Felder je Tabelle beim Anlegen bzw. Ändern (wie bei POST/PUT einzelner Zeilen).
+# required: beim Anlegen anzugeben; not_null: dürfen beim Ändern nicht geleert
+# werden; integer: ganze Zahlen; references: Fremdschlüssel -> (Tabelle, Fehler)
+BULK_FIELDS = {
+    'tasks': {
+        'create': ('project_id', 'title', 'description', 'status', 'dueDate', 'assignee', 'priority'),
+        'update': ('title', 'description', 'status', 'dueDate', 'assignee', 'priority'),
+        'required': ('project_id', 'title'),
+        'not_null': ('project_id', 'title', 'status'),
+        'integer': ('project_id',),
+        'references': {'project_id': ('projects', 'Projekt nicht gefunden')},
+    },
+    'projects': {
+        'create': ('name', 'customer', 'fair', 'size', 'date', 'priority', 'status',
+                   'nextStep', 'dueDate', 'customer_id'),
+        'update': ('name', 'customer', 'fair', 'size', 'date', 'priority', 'status',
+                   'nextStep', 'dueDate', 'customer_id'),
+        'required': ('name', 'customer'),
+        'not_null': ('name', 'customer'),
+        'integer': ('size', 'customer_id'),
+        'references': {},
+    },
+}
+
+
+def _as_id(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def _existing_ids(conn, table, ids, columns='id'):
+    """Liefert {id: Row} für die vorhandenen ``ids`` aus ``table``."""
+    ids = list(set(ids))
+    found = {}
+    for i in range(0, len(ids), 500):
+        chunk = ids[i:i + 500]
+        sql = f'SELECT {columns} FROM {table} WHERE id IN ({",".join("?" * len(chunk))})'
+        for row in conn.execute(sql, chunk):
+            found[row['id']] = row
+    return found
+
+
+def _bulk_values(item, fields, spec, refs):
+    """
+    Werte der ``fields`` eines Eintrags, Ganzzahlen umgewandelt. Gibt
+    ``(Werte, None)`` oder, wenn eine Ganzzahl oder ein Fremdschlüssel
+    (``refs``: Feld -> vorhandene IDs) ungültig ist, ``(None, Fehler)`` zurück.
+    """
+    values = {f: item.get(f) for f in fields}
+    for f in spec['integer']:
+        if values.get(f) is not None:
+            values[f] = _as_id(values[f])
+            if values[f] is None:
+                return None, f'{f} muss eine ganze Zahl sein'
+    for f, (_, message) in spec['references'].items():
+        if values.get(f) is not None and values[f] not in refs[f]:
+            return None, message
+    return values, None
+
+
+def run_bulk(conn, table, body):
+    """
+    Führt ``{"create": [...], "update": [...], "delete": [...]}`` für ``table``
+    in einer Transaktion aus.
+
+    Ungültige Einträge (fehlende oder geleerte Pflichtfelder, keine ganze
+    Zahl, unbekannte IDs) werden vor dem Schreiben übersprungen und in ``errors`` gemeldet; alle gültigen werden gebündelt
+    per executemany geschrieben. Gibt ``(Ergebnis, Cache-Tags)`` zurück.
+    """
+    spec = BULK_FIELDS[table]
+    result = {'created': [], 'updated': [], 'deleted': [], 'errors': []}
+    tags = {table, 'overview'}
+
+    def error(op, index, message, item_id=None):
+        entry = {'op': op, 'index': index, 'error': message}
+        if item_id is not None:
+            entry['id'] = item_id
+        result['errors'].append(entry)
+
+    creates = body.get('create') or []
+    updates = body.get('update') or []
+    deletes = body.get('delete') or []
+
+    # Schreibsperre sofort holen: die neuen IDs werden aus sqlite_sequence
+    # abgeleitet und die Existenzprüfungen müssen bis zum Commit gelten
+    # (im Schreib-Thread der WriteQueue läuft bereits BEGIN IMMEDIATE)
+    if not conn.in_transaction:
+        conn.execute('BEGIN IMMEDIATE')
+
+    # vorhandene Ziele der Fremdschlüssel in create und update
+    items = [item for item in creates + updates if isinstance(item, dict)]
+    refs = {f: _existing_ids(conn, target, [
+        i for i in (_as_id(item.get(f)) for item in items) if i is not None
+    ]) for f, (target, _) in spec['references'].items()}
+
+    # ---- Anlegen ----
+    rows = []
+    for index, item in enumerate(creates):
+        if not isinstance(item, dict):
+            error('create', index, 'Eintrag muss ein Objekt sein')
+            continue
+        missing = [f for f in spec['required'] if item.get(f) in (None, '')]
+        if missing:
+            error('create', index, f'Pflichtfeld fehlt: {missing[0]}')
+            continue
+        values, message = _bulk_values(item, spec['create'], spec, refs)
+        if message:
+            error('create', index, message)
+            continue
+        if table == 'tasks':
+            values['status'] = values['status'] or 'ToDo'
+            tags.add(f'project:{values["project_id"]}:tasks')
+        rows.append(tuple(values[f] for f in spec['create']))
+    if rows:
+        seq = conn.execute('SELECT seq FROM sqlite_sequence WHERE name=?', (table,)).fetchone()
+        last_id = seq[0] if seq else 0
+        conn.executemany(
+            f'INSERT INTO {table} ({", ".join(spec["create"])}, updated_at) '
+            f'VALUES ({", ".join("?" * len(spec["create"]))}, {NOW_SQL})',
+            rows
+        )
+        result['created'] = [dict(r) for r in conn.execute(
+            f'SELECT * FROM {table} WHERE id > ? ORDER BY id', (last_id,))]
+
+    # ---- Ändern (gruppiert nach geänderten Feldern, je Gruppe ein executemany) ----
+    columns = 'id, project_id' if table == 'tasks' else 'id'
+    existing = _existing_ids(conn, table, [
+        _as_id(item.get('id')) for item in updates if isinstance(item, dict)
+    ], columns)
+    groups = defaultdict(list)
+    for index, item in enumerate(updates):
+        item_id = _as_id(item.get('id')) if isinstance(item, dict) else None
+        if item_id is None:
+            error('update', index, 'id fehlt')
+            continue
+        if item_id not in existing:
+            error('update', index, 'nicht gefunden', item_id)
+            continue
+        fields = tuple(f for f in spec['update'] if f in item)
+        if not fields:
+            error('update', index, 'keine Felder geändert', item_id)
+            continue
+        emptied = [f for f in fields if f in spec['not_null'] and item[f] in (None, '')]
+        if emptied:
+            error('update', index, f'Pflichtfeld darf nicht leer sein: {emptied[0]}', item_id)
+            continue
+        values, message = _bulk_values(item, fields, spec, refs)
+        if message:
+            error('update', index, message, item_id)
+            continue
+        groups[fields].append(tuple(values[f] for f in fields) + (item_id,))
+    updated_ids = []
+    for fields, params in groups.items():
+        conn.executemany(
+            f'UPDATE {table} SET {", ".join(f"{f}=?" for f in fields)}, updated_at={NOW_SQL} '
+            f'WHERE id=?', params)
+        updated_ids.extend(p[-1] for p in params)
+    if updated_ids:
+        result['updated'] = list(_existing_ids(conn, table, updated_ids, '*').values())
+        result['updated'] = [dict(r) for r in sorted(result['updated'], key=lambda r: r['id'])]
+
+    # ---- Löschen ----
+    delete_ids = [_as_id(item.get('id') if isinstance(item, dict) else item) for item in deletes]
+    existing = _existing_ids(conn, table, [i for i in delete_ids if i is not None], columns)
+    to_delete = []
+    for index, item_id in enumerate(delete_ids):
+        if item_id is None:
+            error('delete', index, 'id fehlt')
+        elif item_id not in existing:
+            error('delete', index, 'nicht gefunden', item_id)
+        elif item_id not in to_delete:
+            to_delete.append(item_id)
+    if table == 'projects' and to_delete:
+        # mitgelöschte Aufgaben (ON DELETE CASCADE) aus dem Cache nehmen
+        placeholders = ','.join('?' * len(to_delete))
+        for row in conn.execute(
+                f'SELECT id FROM tasks WHERE project_id IN ({placeholders})', to_delete):
+            tags.add(f'task:{row["id"]}')
+        tags.add('tasks')
+    conn.executemany(f'DELETE FROM {table} WHERE id=?', [(i,) for i in to_delete])
+    result['deleted'] = to_delete
+
+    # Cache-Tags der einzelnen Zeilen
+    kind = table[:-1]
+    for row in result['updated']:
+        tags.add(f'{kind}:{row["id"]}')
+    for item_id in to_delete:
+        tags.add(f'{kind}:{item_id}')
+        if table == 'projects':
+            tags.add(f'project:{item_id}:tasks')
+    if table == 'tasks':
+        for row in result['updated']:
+            tags.add(f'project:{row["project_id"]}:tasks')
+        for item_id in to_delete:
+            tags.add(f'project:{existing[item_id]["project_id"]}:tasks')
+    return result, tags
+
+
+# ----------------------
+#   Archiv
+# ----------------------
+
+ARCHIVE_TABLES = ('projects', 'tasks')
+
+# FROM-Ausdruck für archive=1: aktive und archivierte Zeilen. Steht eine Zeile
+# während des Verschiebens kurz in beiden Dateien, zählt die aktive.
+ARCHIVE_SOURCES = {
+    table: (f'(SELECT {", ".join(TABLE_COLUMNS[table])} FROM main.{table} UNION ALL '
+            f'SELECT {", ".join(TABLE_COLUMNS[table])} FROM archive.{table} '
+            f'WHERE id NOT IN (SELECT id FROM main.{table})) AS {table}')
+    for table in ARCHIVE_TABLES
+}
+
+# Projekte, die archiviert werden dürfen (Parameter: Status..., Stichtag,
+# Stichtag, letzte ID des vorigen Schubs, Anzahl). Zeilen ohne updated_at
+# (älter als Migration 6) gelten als zum Zeitpunkt von Migration 8 geändert.
+ARCHIVE_CANDIDATES_SQL = """
+    WITH legacy(ts) AS (SELECT value FROM main.schema_meta WHERE key = 'legacy_updated_at')
+    SELECT id FROM main.projects p
+    WHERE status IN ({statuses})
+      AND COALESCE(updated_at, (SELECT ts FROM legacy)) < ?
+      AND NOT EXISTS (SELECT 1 FROM main.tasks t WHERE t.project_id = p.id
+                      AND COALESCE(t.updated_at, (SELECT ts FROM legacy)) >= ?)
+      AND id > ?
+    ORDER BY id
+    LIMIT ?
+"""
+
+# Projekte, die seit einer Sequenznummer geändert wurden (auch über ihre Aufgaben)
+ARCHIVE_CHANGED_SQL = """
+    SELECT row_id FROM change_log WHERE tbl = 'projects' AND seq > ?
+    UNION
+    SELECT project_id FROM change_log WHERE tbl = 'tasks' AND seq > ?
+"""
+
+# nur ein Archivierungslauf je Prozess gleichzeitig
+archive_lock = threading.Lock()
+
+
+def init_archive(conn):
+    """
+    Legt in der Archivdatei projects und tasks mit den Spalten der aktiven
+    Tabellen an und ergänzt dort Spalten, die spätere Migrationen hinzufügen.
+    Ohne NOT NULL und Fremdschlüssel, das Archiv nimmt nur Kopien auf.
+    Dazu ein eigener Volltextindex archive.search_index (index_archive_search).
+    """
+    for table in ARCHIVE_TABLES:
+        columns = [(name, col_type) for _, name, col_type, *_ in conn.execute(f'PRAGMA main.table_info({table})')]
+        existing = {row[1] for row in conn.execute(f'PRAGMA archive.table_info({table})')}
+        if not existing:
+            defs = ', '.join('id INTEGER PRIMARY KEY' if name == 'id' else f'{name} {col_type}'
+                             for name, col_type in columns)
+            conn.execute(f'CREATE TABLE archive.{table} ({defs})')
+            continue
+        for name, col_type in columns:
+            if name not in existing:
+                conn.execute(f'ALTER TABLE archive.{table} ADD COLUMN {name} {col_type}')
+    conn.execute('CREATE INDEX IF NOT EXISTS archive.idx_projects_customer_id ON projects(customer_id)')
+    conn.execute('CREATE INDEX IF NOT EXISTS archive.idx_tasks_project_id ON tasks(project_id)')
+    if not conn.execute("SELECT 1 FROM archive.sqlite_master WHERE name = 'search_index'").fetchone():
+        # Volltextindex der archivierten Zeilen (auch für Archive, die vor ihm entstanden sind)
+        _create_search_index(conn, 'archive')
+        for table in ARCHIVE_TABLES:
+            code, title, body, project = SEARCH_SOURCES[table]
+            conn.execute(f'INSERT INTO archive.search_index(rowid, title, body, project_id) '
+                         f'SELECT {_search_values(code, title, body, project)} FROM archive.{table}')
+
+
+def parse_archive(params):
+    """True bei archive=1 (archivierte Zeilen einschließen)."""
+    archive = params.get('archive') or '0'
+    if archive not in ('0', '1'):
+        raise ValueError('archive muss 0 oder 1 sein')
+    return archive == '1'
+
+
+def table_source(table, params):
+    """FROM-Ausdruck für ``table``; mit archive=1 inkl. Archiv (ARCHIVE_SOURCES)."""
+    if parse_archive(params) and table in ARCHIVE_SOURCES:
+        return ARCHIVE_SOURCES[table]
+    return table
+
+
+def index_archive_search(conn, ids, add=True):
+    """
+    Entfernt die Einträge der archivierten Projekte ``ids`` und ihrer Aufgaben
+    aus archive.search_index und legt sie mit ``add`` aus den Archivzeilen
+    neu an. Die Trigger der aktiven Tabellen löschen beim Verschieben nur
+    die Einträge in main.search_index.
+    """
+    marks = ', '.join('?' * len(ids))
+    for table, key in (('projects', 'id'), ('tasks', 'project_id')):
+        code, title, body, project = SEARCH_SOURCES[table]
+        conn.execute(f'DELETE FROM archive.search_index WHERE rowid IN '
+                     f'(SELECT id * {SEARCH_KIND_SLOTS} + {code} FROM archive.{table} WHERE {key} IN ({marks}))', ids)
+        if add:
+            conn.execute(f'INSERT INTO archive.search_index(rowid, title, body, project_id) '
+                         f'SELECT {_search_values(code, title, body, project)} FROM archive.{table} '
+                         f'WHERE {key} IN ({marks})', ids)
+
+
+def archive_copy(conn, cutoff, after_id, limit=ARCHIVE_BATCH):
+    """
+    Schritt 1: kopiert bis zu ``limit`` archivierbare Projekte mit ID nach
+    ``after_id`` samt Aufgaben ins Archiv. Liefert ``(ids, seq)`` mit der
+    Sequenznummer des Änderungsprotokolls zum Zeitpunkt der Kopie.
+    """
+    sql = ARCHIVE_CANDIDATES_SQL.format(statuses=', '.join('?' * len(ARCHIVE_STATUSES)))
+    ids = [row[0] for row in conn.execute(sql, (*ARCHIVE_STATUSES, cutoff, cutoff, after_id, limit))]
+    if ids:
+        marks = ', '.join('?' * len(ids))
+        for table, key in (('projects', 'id'), ('tasks', 'project_id')):
+            columns = ', '.join(TABLE_COLUMNS[table])
+            conn.execute(f'INSERT OR REPLACE INTO archive.{table} ({columns}) '
+                         f'SELECT {columns} FROM main.{table} WHERE {key} IN ({marks})', ids)
+        index_archive_search(conn, ids)
+    return ids, change_log_range(conn)[1]
+
+
+def archive_remove(conn, ids, seq):
+    """
+    Schritt 2, in einer eigenen Transaktion nach dem Commit von archive_copy:
+    löscht die kopierten Projekte samt Aufgaben aus der aktiven Datenbank.
+
+    Wurde ein Projekt oder eine seiner Aufgaben seit der Kopie geändert
+    (laut change_log nach ``seq``), bleibt es aktiv und die Kopie wird
+    verworfen. Liefert ``(verschobene IDs, [(Aufgaben-ID, Projekt-ID), ...],
+    Anzahl übersprungener)``.
+    """
+    if change_log_range(conn)[0] > seq + 1:
+        # Einträge schon gelöscht: Änderungen lassen sich nicht ausschließen
+        changed = set(ids)
+    else:
+        changed = {row[0] for row in conn.execute(ARCHIVE_CHANGED_SQL, (seq, seq))}
+    keep = [i for i in ids if i in changed]
+    move = [i for i in ids if i not in changed]
+    if keep:
+        marks = ', '.join('?' * len(keep))
+        index_archive_search(conn, keep, add=False)
+        conn.execute(f'DELETE FROM archive.tasks WHERE project_id IN ({marks})', keep)
+        conn.execute(f'DELETE FROM archive.projects WHERE id IN ({marks})', keep)
+    tasks = []
+    if move:
+        marks = ', '.join('?' * len(move))
+        tasks = conn.execute(f'DELETE FROM main.tasks WHERE project_id IN ({marks}) RETURNING id, project_id',
+                             move).fetchall()
+        conn.execute(f'DELETE FROM main.projects WHERE id IN ({marks})', move)
+    return move, [tuple(row) for row in tasks], len(keep)
+
+
+def archive_finished_projects():
+    """
+    Verschiebt alle archivierbaren Projekte schubweise ins Archiv und liefert
+    ``{'projects': ..., 'tasks': ..., 'skipped': ...}``.
+
+    Je Schub laufen Kopie und Löschen als zwei Aufträge der WriteQueue, also
+    in getrennten Transaktionen: SQLite committet mehrere Dateien nur je
+    Datei atomar, das Löschen darf erst nach dem Commit der Kopie folgen.
+    Dazwischen und zwischen den Schüben kommen andere Schreibzugriffe an
+    die Reihe. Die Löschungen stehen wie gewohnt im Änderungsprotokoll,
+    Clients mit since= entfernen die Zeilen also aus ihren Listen.
+    """
+    cutoff = parse_updated_since(
+        (datetime.datetime.now(datetime.timezone.utc) - datetime.timedelta(days=ARCHIVE_AFTER_DAYS)).isoformat())
+    totals = {'projects': 0, 'tasks': 0, 'skipped': 0}
+    after_id = 0
+    with archive_lock:
+        while True:
+            ids, seq = write_queue.run(lambda conn: archive_copy(conn, cutoff, after_id))
+            if not ids:
+                break
+            moved, tasks, skipped = write_queue.run(lambda conn: archive_remove(conn, ids, seq))
+            tags = set()
+            for project_id in moved:
+                tags.update(change_tags('projects', project_id, 'delete', project_id))
+            for task_id, project_id in tasks:
+                tags.update(change_tags('tasks', task_id, 'delete', project_id))
+            if tags:
+                response_cache.invalidate(*tags)
+            totals['projects'] += len(moved)
+            totals['tasks'] += len(tasks)
+            totals['skipped'] += skipped
+            if len(ids) < ARCHIVE_BATCH:
+                break
+            after_id = ids[-1]
+            time.sleep(ARCHIVE_PAUSE_MS / 1000)
+    return totals
+
+
+# ----------------------
+#   Antwort-Cache
+# ----------------------
+
+class ResponseCache:
+    """
+    LRU-Cache für fertig serialisierte GET-Antworten der API.
+
+    Jeder Eintrag trägt Tags (z.B. ``tasks`` oder ``project:5:tasks``), die
+    beschreiben, von welchen Daten er abhängt. Schreibende Handler rufen nach
+    dem Commit ``invalidate()`` mit den betroffenen Tags auf.
+
+    Damit eine Antwort, die noch mit dem alten Datenstand berechnet wurde,
+    nicht nach der Invalidierung im Cache landet, merkt sich ``begin()`` den
+    Generationszähler der Tags; ``put()`` verwirft die Antwort, wenn sich
+    einer davon inzwischen geändert hat.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_ENTRIES, max_bytes=int(RESPONSE_CACHE_MB * 1024 * 1024)):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # Einzelne Antworten dürfen höchstens ein Achtel des Caches belegen
+        self.max_entry_bytes = max_bytes // 8
+        self._entries = OrderedDict()  # key -> (body, content_type, headers, tags)
+        self._keys_by_tag = defaultdict(set)
+        self._generations = defaultdict(int)
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self):
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key):
+        """Liefert ``(body, content_type, headers)`` oder None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[:3]
+
+    def begin(self, tags):
+        """Stand der Tags vor dem Berechnen einer Antwort (für put())."""
+        with self._lock:
+            return tuple(self._generations[tag] for tag in tags)
+
+    def put(self, key, body, content_type, headers, tags, generation):
+        if len(body) > self.max_entry_bytes:
+            return
+        with self._lock:
+            if generation != tuple(self._generations[tag] for tag in tags):
+                return
+            self._remove(key)
+            self._entries[key] = (body, content_type, headers, tags)
+            self.size_bytes += len(body)
+            for tag in tags:
+                self._keys_by_tag[tag].add(key)
+            while len(self._entries) > self.max_entries or self.size_bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags):
+        """Entfernt alle Einträge, die von einem der ``tags`` abhängen."""
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] += 1
+                for key in self._keys_by_tag.pop(tag, ()):
+                    if self._remove(key):
+                        self.invalidations += 1
+
+    def invalidate_all(self):
+        """Entfernt alle Einträge; bisher ausgelieferte ETags passen danach nicht mehr."""
+        with self._lock:
+            for tag in self._generations:
+                self._generations[tag] += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._keys_by_tag.clear()
+            self.size_bytes = 0
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size_bytes -= len(entry[0])
+        for tag in entry[3]:
+            keys = self._keys_by_tag.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._keys_by_tag[tag]
+        return True
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.size_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+response_cache = ResponseCache()
+
+# Zufällige Kennung dieses Serverlaufs: die Generationszähler des Caches
+# beginnen nach jedem Neustart bei 0, ETags vorheriger Läufe dürfen nicht passen.
+# Im Prefork-Betrieb zählt jeder Prozess für sich und erhält eine eigene Kennung.
+BOOT_ID = os.urandom(4).hex()
+
+
+def make_etag(key, generation):
+    """Starker ETag aus Anfrage-Schlüssel und Änderungsstand der zugehörigen Daten."""
+    digest = hashlib.blake2b(f'{BOOT_ID}|{key}|{generation}'.encode(), digest_size=10).hexdigest()
+    return f'"{digest}"'
+
+
+def etag_matches(if_none_match, etag):
+    """Prüft den If-None-Match-Header (Liste oder ``*``) gegen ``etag``."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    candidates = (c.strip() for c in if_none_match.split(','))
+    return etag in (c[2:] if c.startswith('W/') else c for c in candidates)
+
+
+def cache_tags(parts):
+    """
+    Tags, von denen die GET-Antwort für ``parts`` (z.B. ['api','projects','1','tasks'])
+    abhängt, oder None für nicht cachebare Pfade.
+    """
+    if len(parts) == 2 and parts[1] in ('customers', 'projects', 'tasks', 'overview'):
+        return (parts[1],)
+    if len(parts) == 3 and parts[2].isdigit():
+        kind = {'customers': 'customer', 'projects': 'project', 'tasks': 'task'}.get(parts[1])
+        return (f'{kind}:{parts[2]}',) if kind else None
+    if len(parts) == 4 and parts[1] == 'customers' and parts[2].isdigit() and parts[3] == 'projects':
+        # hängt an allen Projekten, da customer_id per PUT geändert werden kann
+        return ('projects',)
+    if len(parts) == 4 and parts[1] == 'projects' and parts[2].isdigit() and parts[3] == 'tasks':
+        return (f'project:{parts[2]}:tasks',)
+    if len(parts) == 3 and parts[1] == 'tasks' and parts[2] == 'open':
+        # enthält die Projektnamen
+        return ('tasks', 'projects')
+    if len(parts) == 2 and parts[1] == 'search':
+        return ('customers', 'projects', 'tasks')
+    if len(parts) == 2 and parts[1] == 'timeline':
+        return ('tasks', 'projects')
+    if len(parts) == 2 and parts[1] == 'stats':
+        # jede Änderung an Projekten oder Aufgaben invalidiert auch 'overview'
+        return ('overview',)
+    return None
+
+
+# Antworten, die vom heutigen Datum abhängen (überfällige Aufgaben)
+DATE_DEPENDENT = ('overview', 'stats', 'timeline')
+
+
+def invalidate_task_change(project_id, task_id=None):
+    """Nach Änderungen an Aufgaben eines Projekts: dessen Liste, globale Liste, Übersicht."""
+    tags = ['tasks', f'project:{project_id}:tasks', 'overview']
+    if task_id is not None:
+        tags.append(f'task:{task_id}')
+    response_cache.invalidate(*tags)
+
+
+def change_tags(tbl, row_id, op, project_id):
+    """Cache-Tags, die der schreibende Handler für einen Eintrag im change_log invalidiert hat."""
+    if tbl == 'customers':
+        return ('customers', f'customer:{row_id}')
+    if tbl == 'projects':
+        tags = ('projects', f'project:{row_id}', f'project:{row_id}:tasks', 'overview')
+        # mit dem Projekt werden auch seine Aufgaben gelöscht
+        return tags + ('tasks',) if op == 'delete' else tags
+    return ('tasks', f'task:{row_id}', f'project:{project_id}:tasks', 'overview')
+
+
+class ProcessSync:
+    """
+    Gleicht im Prefork-Betrieb Antwort-Cache und Änderungs-Feed eines
+    Prozesses mit den Schreibzugriffen der anderen Prozesse ab.
+
+    Nach jedem Commit mit Änderungen erhöht ``publish()`` (aus WriteQueue,
+    bevor der schreibende Handler antwortet) einen Zähler im gemeinsamen
+    Speicher, den der Supervisor vor dem Fork anlegt. Hat er sich geändert,
+    liest ``sync()`` die neuen Einträge des Änderungsprotokolls und
+    invalidiert dieselben Tags wie der schreibende Handler (``change_tags``);
+    fehlen Einträge, weil sie bereits gelöscht wurden, wird der ganze Cache
+    verworfen. Eigene Schreibzugriffe invalidiert ein Prozess dabei ein
+    zweites Mal, das kostet höchstens einen erneut berechneten Eintrag.
+
+    ``sync()`` läuft vor jeder cachebaren GET-Anfrage, damit sie alles sieht,
+    was vor ihr committet wurde, und alle PROCESS_SYNC_MS im Hintergrund, um
+    wartende SSE-Streams und Long-Polls zu wecken.
+    """
+
+    def __init__(self):
+        self.counter = None
+        self._seen = 0
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def setup(self):
+        """Im Supervisor vor dem Fork der Worker-Prozesse aufrufen."""
+        self.counter = multiprocessing.Value('Q', 0)
+
+    def start(self):
+        """Im Worker-Prozess nach dem Fork: aktuellen Stand merken und Abgleich starten."""
+        self._seen = self.counter.value
+        with db_pool.connection() as conn:
+            self._seq = change_log_range(conn)[1]
+        threading.Thread(target=self._poll, name='process-sync', daemon=True).start()
+
+    def publish(self):
+        if self.counter is not None:
+            with self.counter.get_lock():
+                self.counter.value += 1
+
+    def sync(self):
+        if self.counter is None or self.counter.value == self._seen:
+            return
+        with self._lock:
+            # Zähler vor dem Lesen: wer danach erhöht, hat ihn erst nach
+            # seinem Commit erhöht und wird beim nächsten Aufruf gelesen
+            seen = self.counter.value
+            if seen == self._seen:
+                return
+            with db_pool.connection() as conn:
+                low, high = change_log_range(conn)
+                if low > self._seq + 1 or high < self._seq:
+                    tags = None
+                else:
+                    tags = set()
+                    for row in conn.execute(
+                            'SELECT tbl, row_id, op, project_id FROM change_log WHERE seq > ?', (self._seq,)):
+                        tags.update(change_tags(*row))
+            if tags is None:
+                response_cache.invalidate_all()
+            elif tags:
+                response_cache.invalidate(*tags)
+            self._seq = high
+            self._seen = seen
+        change_feed.wake()
+
+    def _poll(self):
+        while True:
+            time.sleep(PROCESS_SYNC_MS / 1000)
+            try:
+                self.sync()
+            except sqlite3.Error as e:
+                print(f'Abgleich mit anderen Prozessen fehlgeschlagen: {e}', file=sys.stderr, flush=True)
+
+
+process_sync = ProcessSync()
+
+
+# ----------------------
+#   Export
+# ----------------------
+
+# Formate für /api/export/<tabelle>?format=...
+EXPORT_CONTENT_TYPES = {
+    'columns': 'application/json',
+    'csv': 'text/csv; charset=utf-8',
+}
+EXPORT_READ_BYTES = 64 * 1024
+
+
+def spool_columns(cursor, width):
+    """
+    Liest ``cursor`` (Zeilen als Tupel) in einem Durchgang und schreibt die
+    ersten ``width`` Spalten als kommagetrennte JSON-Werte je Spalte in eine
+    eigene temporäre Datei. Gibt ``(Dateien, Zeilenzahl)`` zurück; die
+    Dateien stehen am Anfang und müssen vom Aufrufer geschlossen werden.
+    """
+    files = [tempfile.SpooledTemporaryFile(EXPORT_SPOOL_KB * 1024) for _ in range(width)]
+    count = 0
+    sample = current_request.sample
+    try:
+        while True:
+            batch = cursor.fetchmany(STREAM_BATCH_ROWS)
+            if not batch:
+                break
+            start = time.perf_counter() if sample else 0
+            for f, column in zip(files, zip(*batch)):
+                if count:
+                    f.write(b',')
+                # Tupel werden als JSON-Array kodiert; die Klammern entfallen
+                f.write(json_encode(column)[1:-1].encode())
+            count += len(batch)
+            if sample:
+                sample.encode_seconds += time.perf_counter() - start
+    except BaseException:
+        for f in files:
+            f.close()
+        raise
+    for f in files:
+        f.seek(0)
+    return files, count
+
+
+def columns_chunks(fields, files, count):
+    """
+    Spaltenweises JSON aus spool_columns:
+    ``{"columns": [...], "rows": n, "data": [[Werte der 1. Spalte], ...]}``.
+    """
+    yield f'{{"columns": {json_encode(fields)}, "rows": {count}, "data": ['.encode()
+    for index, f in enumerate(files):
+        yield b'[' if index == 0 else b'], ['
+        yield from iter(lambda: f.read(EXPORT_READ_BYTES), b'')
+    yield b']]}'
+
+
+def csv_chunks(cursor, fields):
+    """CSV (RFC 4180, Kopfzeile mit den Spaltennamen) blockweise aus ``cursor``."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+    width = len(fields)
+    sample = current_request.sample
+    while True:
+        batch = cursor.fetchmany(STREAM_BATCH_ROWS)
+        if not batch:
+            break
+        start = time.perf_counter() if sample else 0
+        # zusätzlich gelesene id/Sortierspalte (siehe build_list_query) abschneiden
+        writer.writerows(batch if len(batch[0]) == width else (row[:width] for row in batch))
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        if sample:
+            sample.encode_seconds += time.perf_counter() - start
+        yield data
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+def gzip_chunks(chunks, level=EXPORT_GZIP_LEVEL):
+    """Komprimiert einen Strom von Byte-Blöcken fortlaufend als ein gzip-Member."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+# ----------------------
+#   Statische Dateien
+# ----------------------
+
+STATIC_CONTENT_TYPES = {
+    '.html': 'text/html; charset=utf-8',
+    '.css': 'text/css; charset=utf-8',
+    '.js': 'application/javascript; charset=utf-8',
+    '.json': 'application/json; charset=utf-8',
+    '.svg': 'image/svg+xml',
+    '.png': 'image/png',
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.gif': 'image/gif',
+}
+
+# Nur Textformate lohnen eine Kompression
+COMPRESSIBLE_EXTENSIONS = ('.html', '.css', '.js', '.json', '.svg')
+
+
+class StaticAsset:
+    """Eine statische Datei samt Validatoren und vorkomprimierten Varianten."""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        ext = os.path.splitext(file_path)[1].lower()
+        self.content_type = STATIC_CONTENT_TYPES.get(ext, 'application/octet-stream')
+        # HTML immer neu validieren, damit neue Versionen sofort ankommen
+        self.cache_control = 'no-cache' if ext == '.html' else f'public, max-age={STATIC_MAX_AGE}'
+        with open(file_path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            self.mtime_ns = st.st_mtime_ns
+            self.mtime = st.st_mtime
+            self.size = st.st_size
+            # große Dateien bleiben auf der Platte und gehen per sendfile() raus
+            self.body = f.read() if st.st_size <= STATIC_MAX_CACHED_KB * 1024 else None
+        self.etag = f'"{self.mtime_ns:x}-{self.size:x}"'
+        self.last_modified = email.utils.formatdate(self.mtime, usegmt=True)
+        # Content-Encoding -> (Body, ETag); starke ETags unterscheiden sich je Kodierung
+        self.variants = {}
+        if self.body and ext in COMPRESSIBLE_EXTENSIONS and self.size > 256:
+            compressed = {'gzip': gzip.compress(self.body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed['br'] = brotli.compress(self.body)
+            for encoding, data in compressed.items():
+                if len(data) < self.size:
+                    self.variants[encoding] = (data, f'{self.etag[:-1]}-{encoding}"')
+        self.checked_at = time.monotonic()
+
+    def changed_on_disk(self):
+        try:
+            st = os.stat(self.file_path)
+        except OSError:
+            return True
+        return st.st_mtime_ns != self.mtime_ns or st.st_size != self.size
+
+
+class StaticAssetCache:
+    """
+    Hält die Frontend-Dateien aus ``root`` im Speicher.
+
+    Dateien werden beim Start (preload) oder beim ersten Abruf geladen und
+    höchstens alle STATIC_CHECK_INTERVAL Sekunden per mtime/Größe auf
+    Änderungen geprüft und dann neu eingelesen.
+    """
+
+    def __init__(self, root):
+        self.root = os.path.realpath(root)
+        self._assets = {}
+        self._lock = threading.Lock()
+
+    def preload(self):
+        """Lädt alle Dateien mit bekannter Frontend-Endung aus dem Wurzelverzeichnis."""
+        for name in sorted(os.listdir(self.root)):
+            if os.path.splitext(name)[1].lower() in STATIC_CONTENT_TYPES:
+                self.get(name)
+
+    def get(self, rel_path):
+        """Liefert das StaticAsset für ``rel_path`` oder None, wenn es die Datei nicht gibt."""
+        asset = self._assets.get(rel_path)
+        if asset is not None:
+            now = time.monotonic()
+            if now - asset.checked_at < STATIC_CHECK_INTERVAL:
+                return asset
+            asset.checked_at = now
+            if not asset.changed_on_disk():
+                return asset
+        file_path = os.path.realpath(os.path.join(self.root, rel_path))
+        # Pfade außerhalb des Verzeichnisses (z.B. ../) nicht ausliefern
+        if os.path.commonpath([self.root, file_path]) != self.root or not os.path.isfile(file_path):
+            with self._lock:
+                self._assets.pop(rel_path, None)
+            return None
+        try:
+            asset = StaticAsset(file_path)
+        except OSError:
+            return None
+        with self._lock:
+            self._assets[rel_path] = asset
+        return asset
+
+
+static_assets = StaticAssetCache(STATIC_DIR)
+
+
+def choose_encoding(accept_encoding, variants):
+    """Wählt die beste vorhandene Kodierung (br vor gzip) laut Accept-Encoding."""
+    if not variants or not accept_encoding:
+        return None
+    accepted = set()
+    for item in accept_encoding.split(','):
+        name, _, params = item.strip().partition(';')
+        q = params.strip()
+        if q.startswith('q='):
+            try:
+                if float(q[2:]) == 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(name.strip().lower())
+    for encoding in ('br', 'gzip'):
+        if encoding in variants and (encoding in accepted or '*' in accepted):
+            return encoding
+    return None
+
+
+# ----------------------
+#   Lastbegrenzung
+# ----------------------
+
+# Routen, deren Anfragen viele Zeilen lesen oder lange schreiben
+HEAVY_ROUTES = frozenset({
+    'GET /api/export/customers', 'GET /api/export/projects', 'GET /api/export/tasks',
+    'GET /api/overview', 'GET /api/search',
+    'POST /api/tasks/bulk', 'POST /api/projects/bulk', 'POST /api/projects/{id}/tasks/bulk',
+    'POST /api/archive', 'DELETE /api/projects/{id}',
+})
+
+# Listen, die ohne einen dieser Query-Parameter die ganze Tabelle liefern
+FULL_LIST_ROUTES = {
+    'GET /api/customers': ('limit', 'since'),
+    'GET /api/projects': ('limit', 'since'),
+    'GET /api/tasks': ('limit', 'since'),
+    'GET /api/tasks/open': ('updated_since',),
+}
+
+# Ab so vielen Token Buckets werden die vollen (länger ungenutzten) entfernt
+ADMISSION_PRUNE_CLIENTS = 10000
+
+
+def is_heavy(name, params):
+    """True, wenn eine Anfrage an Route ``name`` mit ``params`` aufwendig ist."""
+    if name in HEAVY_ROUTES:
+        return True
+    cheap = FULL_LIST_ROUTES.get(name)
+    return cheap is not None and not any(p in params for p in cheap)
+
+
+class Admission:
+    """
+    Lastbegrenzung vor den API-Handlern, damit der Server bei Überlast
+    schnell ablehnt, statt Anfragen bis zum Timeout der Clients zu stauen:
+
+    - Hat die Verbindung länger als ADMISSION_QUEUE_MS auf einen Worker
+      gewartet, ist der Server überlastet (overloaded): 503
+    - Höchstens ADMISSION_HEAVY_MAX aufwendige Anfragen (is_heavy) laufen
+      gleichzeitig (begin_heavy/end_heavy); weitere warten auf einen Platz,
+      solange die Wartezeit zusammen mit der in der Warteschlange unter
+      ADMISSION_QUEUE_MS bleibt, sonst 503
+    - Je Client ein Token Bucket mit ADMISSION_CLIENT_RATE Anfragen je
+      Sekunde und ADMISSION_CLIENT_BURST Vorrat (take_token): 429
+
+    Statische Dateien werden nie abgelehnt, Antworten aus dem Antwort-Cache
+    belegen keinen Platz für aufwendige Anfragen (siehe ProjectHandler._handle).
+    """
+
+    def __init__(self, queue_ms=ADMISSION_QUEUE_MS, heavy_max=ADMISSION_HEAVY_MAX,
+                 rate=ADMISSION_CLIENT_RATE, burst=ADMISSION_CLIENT_BURST):
+        self.queue_seconds = queue_ms / 1000
+        self._heavy_slots = threading.BoundedSemaphore(heavy_max) if heavy_max > 0 else None
+        self.rate = rate
+        self.burst = burst
+        self.heavy = 0
+        self.shed = 0
+        self.limited = 0
+        self._lock = threading.Lock()
+        self._buckets = {}  # Client -> (Tokens, Zeitpunkt der letzten Anfrage)
+        self._prune_at = ADMISSION_PRUNE_CLIENTS
+
+    @staticmethod
+    def queue_wait():
+        """
+        Sekunden, die die Verbindung der aktuellen Anfrage auf einen Worker
+        gewartet hat; 0 ab der zweiten Anfrage derselben Verbindung.
+        """
+        accepted, current_request.accepted = current_request.accepted, None
+        return time.monotonic() - accepted if accepted is not None else 0.0
+
+    def overloaded(self, waited):
+        if not self.queue_seconds or waited <= self.queue_seconds:
+            return False
+        with self._lock:
+            self.shed += 1
+        return True
+
+    def begin_heavy(self, waited):
+        """
+        Belegt einen Platz für eine aufwendige Anfrage, deren Verbindung
+        ``waited`` Sekunden auf einen Worker gewartet hat. False, wenn bis
+        zum Ende des Zeitbudgets keiner frei wird.
+        """
+        if self._heavy_slots is not None:
+            timeout = max(0.0, self.queue_seconds - waited) if self.queue_seconds else None
+            if not self._heavy_slots.acquire(timeout=timeout):
+                with self._lock:
+                    self.shed += 1
+                return False
+        with self._lock:
+            self.heavy += 1
+        return True
+
+    def end_heavy(self):
+        with self._lock:
+            self.heavy -= 1
+        if self._heavy_slots is not None:
+            self._heavy_slots.release()
+
+    def take_token(self, client):
+        """Verbraucht ein Token von ``client``; liefert 0 oder die Sekunden bis zum nächsten."""
+        if self.rate <= 0:
+            return 0
+        now = time.monotonic()
+        with self._lock:
+            tokens, last = self._buckets.get(client, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - last) * self.rate)
+            if tokens < 1:
+                self._buckets[client] = (tokens, now)
+                self.limited += 1
+                return (1 - tokens) / self.rate
+            self._buckets[client] = (tokens - 1, now)
+            if len(self._buckets) >= self._prune_at:
+                self._prune(now)
+        return 0
+
+    def _prune(self, now):
+        # ein Bucket, der länger als burst/rate ungenutzt ist, ist wieder voll
+        # und entspricht einem fehlenden Eintrag
+        idle = self.burst / self.rate
+        for client in [c for c, (_, last) in self._buckets.items() if now - last >= idle]:
+            del self._buckets[client]
+        self._prune_at = max(ADMISSION_PRUNE_CLIENTS, len(self._buckets) * 2)
+
+
+admission = Admission()
+
 
-    - customers (Kunden)
-    - projects (Projekte/Messen, inkl. customer_id)
-    - tasks (Aufgaben, inkl. assignee, priority)
+# ----------------------
+#   Routing
+# ----------------------
 
-    Existiert die DB bereits, werden fehlende Spalten per ALTER TABLE ergänzt.
-    """
-    with sqlite3.connect(DB_FILE) as conn:
-        conn.execute('PRAGMA foreign_keys = ON')
-        cur = conn.cursor()
+# (Methode, Pfadform) -> Route. Die Pfadform ist das Tupel der Segmente, in
+# dem numerische Segmente durch '{id}' ersetzt sind, z.B.
+# ('api', 'projects', '{id}', 'tasks'). Die Zuordnung ist damit ein einziger
+# Dictionary-Zugriff, unabhängig von der Anzahl der Routen.
+ROUTES = {}
 
-        # Tabelle für Kunden
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS customers (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                contact_person TEXT,
-                email TEXT,
-                phone TEXT,
-                address TEXT,
-                design_note TEXT
-            )
-            """
-        )
+Route = namedtuple('Route', 'name handler')
 
-        # Tabelle für Projekte (Messen)
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS projects (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                customer TEXT NOT NULL,
-                fair TEXT,
-                size INTEGER,
-                date TEXT,
-                priority TEXT,
-                status TEXT,
-                nextStep TEXT,
-                dueDate TEXT
-            )
-            """
-        )
+ID_SEGMENT = '{id}'
 
-        # Prüfen, ob Spalte customer_id vorhanden ist, sonst hinzufügen
-        cur.execute("PRAGMA table_info(projects)")
-        project_cols = [row[1] for row in cur.fetchall()]
-        if 'customer_id' not in project_cols:
-            cur.execute("ALTER TABLE projects ADD COLUMN customer_id INTEGER")
-            # optional FK (nicht zwingend, da ALTER TABLE FK komplex ist)
-            conn.commit()
 
-        # Tabelle für Aufgaben mit zusätzlichen Feldern
-        cur.execute(
-            """
-            CREATE TABLE IF NOT EXISTS tasks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                project_id INTEGER NOT NULL,
-                title TEXT NOT NULL,
-                description TEXT,
-                status TEXT NOT NULL DEFAULT 'ToDo',
-                dueDate TEXT,
-                assignee TEXT,
-                priority TEXT,
-                FOREIGN KEY(project_id) REFERENCES projects(id) ON DELETE CASCADE
-            )
-            """
-        )
+def route(method, pattern):
+    """Dekorator: registriert die Handler-Methode für ``method`` und ``pattern``."""
+    def register(handler):
+        shape = tuple(pattern.strip('/').split('/'))
+        key = (method, shape)
+        if key in ROUTES:
+            raise ValueError(f'Route doppelt definiert: {method} {pattern}')
+        ROUTES[key] = Route(f'{method} {pattern}', handler)
+        return handler
+    return register
 
-        # Prüfen, ob Spalten assignee/priority existieren (Migration für alte DBs)
-        cur.execute("PRAGMA table_info(tasks)")
-        task_cols = [row[1] for row in cur.fetchall()]
-        if 'assignee' not in task_cols:
-            cur.execute("ALTER TABLE tasks ADD COLUMN assignee TEXT")
-        if 'priority' not in task_cols:
-            cur.execute("ALTER TABLE tasks ADD COLUMN priority TEXT")
 
-        conn.commit()
+def resolve_route(method, path):
+    """
+    Liefert ``(route, ids, parts)`` für die Anfrage: die passende Route (oder
+    None), die numerischen Pfadsegmente als Handler-Argumente und alle Segmente.
+    """
+    parts = path.strip('/').split('/')
+    ids = []
+    shape = []
+    for part in parts:
+        if part.isdigit():
+            ids.append(part)
+            shape.append(ID_SEGMENT)
+        else:
+            shape.append(part)
+    return ROUTES.get((method, tuple(shape))), ids, parts
 
 
 class ProjectHandler(BaseHTTPRequestHandler):
     """HTTP-Handler für API- und statische Anfragen."""
 
-    def _set_headers(self, code=200, content_type='application/json'):
+    # HTTP/1.1, damit Browser Verbindungen wiederverwenden (Keep-Alive).
+    # Dafür muss jede Antwort eine Content-Length mitsenden.
+    protocol_version = 'HTTP/1.1'
+    # TCP_NODELAY: Header und Body gehen als getrennte write()-Aufrufe raus.
+    # Mit Nagle wartete der Body auf das ACK des Headers, das der Client bei
+    # Keep-Alive verzögert sendet (~40 ms je kleiner Antwort)
+    disable_nagle_algorithm = True
+    # Socket-Timeout: beendet ungenutzte Keep-Alive-Verbindungen und
+    # verhindert, dass langsame Clients einen Worker dauerhaft blockieren
+    timeout = KEEPALIVE_TIMEOUT
+
+    # (Schlüssel, Tags, Generation, ETag) der aktuellen API-GET-Anfrage; wird
+    # von der ersten gesendeten Antwort verbraucht (siehe _take_cache_slot)
+    _cache_slot = None
+    # Statuscode der gesendeten Antwort (für /api/metrics)
+    _status = None
+
+    def setup(self):
+        super().setup()
+        self.wfile = CountingWriter(self.wfile)
+
+    def send_response(self, code, message=None):
+        self._status = code
+        super().send_response(code, message)
+
+    def _set_headers(self, code=200, content_type='application/json', content_length=None,
+                     headers=None):
         self.send_response(code)
         self.send_header('Content-Type', content_type)
+        if content_length is not None:
+            self.send_header('Content-Length', str(content_length))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        # Warten weitere Verbindungen auf einen Worker (oder fährt der Server
+        # herunter), wird die Verbindung nach dieser Antwort freigegeben
+        if getattr(self.server, 'should_release_connection', lambda: False)():
+            self.send_header('Connection', 'close')
         # CORS erlauben
         self.send_header('Access-Control-Allow-Origin', '*')
         self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
         self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        self.send_header('Access-Control-Expose-Headers', 'X-Next-Cursor, Link, X-Cache, ETag, X-Change-Seq, X-Updated-At, Retry-After')
+        self.end_headers()
+
+    def _send_json(self, payload, code=200, headers=None):
+        """Sendet ``payload`` als JSON-Antwort inkl. Content-Length."""
+        body = encode_json(payload)
+        slot = self._take_cache_slot()
+        if slot and code == 200:
+            if response_cache.enabled:
+                response_cache.put(slot[0], body, 'application/json', headers or {}, slot[1], slot[2])
+            headers = dict(headers or {}, **self._validator_headers(slot))
+        self._set_headers(code, content_length=len(body), headers=headers)
+        self.wfile.write(body)
+
+    @staticmethod
+    def _validator_headers(slot):
+        # no-cache: Browser dürfen die Antwort speichern, fragen aber jedes
+        # Mal mit If-None-Match nach und erhalten dann meist nur ein 304
+        return {'ETag': slot[3], 'Cache-Control': 'no-cache'}
+
+    def _serve_conditional(self, parts):
+        """
+        Beantwortet eine API-GET-Anfrage ohne Datenbankzugriff, wenn möglich:
+
+        - 304 Not Modified, wenn der ETag aus If-None-Match noch aktuell ist
+        - 200 aus dem Antwort-Cache
+
+        Sonst wird vermerkt, mit welchem ETag (und unter welchem Cache-Schlüssel)
+        die folgende Antwort gesendet werden soll, und False zurückgegeben.
+
+        Der ETag wird aus den Generationszählern der Cache-Tags gebildet und
+        ändert sich daher genau dann, wenn ein Schreibzugriff die zugrunde
+        liegenden Daten invalidiert hat.
+        """
+        tags = cache_tags(parts)
+        if not tags:
+            return False
+        process_sync.sync()
+        key = self.path
+        if 'application/x-ndjson' in self.headers.get('Accept', ''):
+            key += ' ndjson'
+        if parts[1] in DATE_DEPENDENT:
+            # überfällige Aufgaben ändern sich auch ohne Schreibzugriff um Mitternacht
+            key += ' ' + today_iso()
+        generation = response_cache.begin(tags)
+        slot = (key, tags, generation, make_etag(key, generation))
+        if etag_matches(self.headers.get('If-None-Match'), slot[3]):
+            self._send_not_modified(self._validator_headers(slot))
+            return True
+        cached = response_cache.get(key) if response_cache.enabled else None
+        if cached is None:
+            self._cache_slot = slot
+            return False
+        body, content_type, headers = cached
+        headers = dict(headers, **self._validator_headers(slot), **{'X-Cache': 'HIT'})
+        self._set_headers(200, content_type, len(body), headers)
+        self.wfile.write(body)
+        return True
+
+    def _send_not_modified(self, headers):
+        """304-Antwort: nur Header, kein Body (und daher auch keine Content-Length)."""
+        self.send_response(304)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if getattr(self.server, 'should_release_connection', lambda: False)():
+            self.send_header('Connection', 'close')
+        self.send_header('Access-Control-Allow-Origin', '*')
         self.end_headers()
 
+    def _take_cache_slot(self):
+        slot, self._cache_slot = self._cache_slot, None
+        return slot
+
+    def _send_list(self, table, params, where=(), args=()):
+        """
+        Beantwortet einen Listen-Endpunkt (Filter, Projektion, Sortierung und
+        Cursor-Paginierung, siehe build_list_query).
+
+        Gibt es weitere Zeilen, enthalten die Header X-Next-Cursor und Link
+        die Adresse der nächsten Seite. Listen ohne limit werden direkt aus
+        dem Cursor gestreamt (siehe _stream_rows).
+
+        X-Change-Seq enthält die Sequenznummer des Änderungsprotokolls, ab
+        der ``since=`` nur noch die Änderungen liefert (siehe _send_delta).
+        """
+        if 'since' in params:
+            self._send_delta(table, params, where, args)
+            return
+        try:
+            query = build_list_query(table, params, where, args)
+        except ValueError as exc:
+            self._send_json({'error': str(exc)}, 400)
+            return
+        with db_pool.connection() as conn:
+            # vor der Abfrage lesen: spätere Änderungen liefert since= erneut
+            headers = {'X-Change-Seq': str(change_log_range(conn)[1])}
+            cursor = conn.execute(query.sql, query.args)
+            if not query.limit:
+                self._stream_rows(cursor, query.fields, headers)
+                return
+            rows = cursor.fetchall()
+        if query.limit and len(rows) > query.limit:
+            rows = rows[:query.limit]
+            last = rows[-1]
+            headers.update(self._next_page_headers(
+                params, encode_cursor(last[query.sort_col], last['id']), query.limit))
+        data = [{f: row[f] for f in query.fields} for row in rows]
+        self._send_json(data, headers=headers)
+
+    def _next_page_headers(self, params, cursor, limit):
+        """X-Next-Cursor und Link (rel="next") für die Seite nach ``cursor``."""
+        next_params = dict(params, cursor=cursor, limit=str(limit))
+        return {
+            'X-Next-Cursor': cursor,
+            'Link': f'<{urlparse(self.path).path}?{urlencode(next_params)}>; rel="next"',
+        }
+
+    def _send_delta(self, table, params, where=(), args=()):
+        """
+        Listen-Endpunkt mit ``since=<seq>``: nur die seitdem geänderten Zeilen
+        (gleiche Filter und Projektion, ohne Paginierung) und die IDs der
+        entfernten, siehe read_delta. 410, wenn der Client neu laden muss.
+        """
+        try:
+            since = parse_since(params['since'])
+            query = build_list_query(
+                table, {k: v for k, v in params.items() if k not in ('since', 'limit', 'cursor')},
+                list(where) + [f'id IN ({DELTA_KEYS[table]})'], list(args) + [since])
+        except ValueError as exc:
+            self._send_json({'error': str(exc)}, 400)
+            return
+        with db_pool.connection() as conn:
+            delta = read_delta(conn, table, since, query.sql, query.args, query.fields)
+        self._send_delta_result(delta)
+
+    def _send_delta_result(self, delta):
+        if delta is None:
+            self._send_json({'error': 'Änderungen nicht mehr verfügbar, bitte neu laden'}, 410)
+        else:
+            self._send_json(delta)
+
+    def _stream_rows(self, cursor, fields, headers=None):
+        """
+        Schreibt die Zeilen von ``cursor`` blockweise als JSON-Array (bzw. als
+        NDJSON bei ``Accept: application/x-ndjson``) in die Antwort.
+
+        Es liegen nie mehr als STREAM_BATCH_ROWS Zeilen im Speicher und der
+        Client erhält die ersten Bytes, bevor die Abfrage fertig gelesen ist
+        (siehe _begin_stream).
+        """
+        ndjson = 'application/x-ndjson' in self.headers.get('Accept', '')
+        content_type = 'application/x-ndjson' if ndjson else 'application/json'
+        # Für den Antwort-Cache mitschreiben, solange die Antwort klein genug ist
+        slot = self._take_cache_slot()
+        collected = [] if slot and response_cache.enabled else None
+        collected_bytes = 0
+        extra_headers = headers or {}
+        headers = dict(extra_headers, **self._validator_headers(slot)) if slot else extra_headers
+        send = self._begin_stream(content_type, headers)
+
+        def write(data):
+            nonlocal collected, collected_bytes
+            send(data)
+            if collected is not None:
+                collected.append(data)
+                collected_bytes += len(data)
+                if collected_bytes > response_cache.max_entry_bytes:
+                    collected = None
+
+        encode = json_encode
+        sample = current_request.sample
+        prefix = b'' if ndjson else b'['
+        while True:
+            batch = cursor.fetchmany(STREAM_BATCH_ROWS)
+            if not batch:
+                break
+            start = time.perf_counter() if sample else 0
+            items = [encode(dict(zip(fields, row))) for row in batch]
+            data = ('\n'.join(items) + '\n').encode() if ndjson else prefix + ','.join(items).encode()
+            prefix = b','
+            if sample:
+                sample.encode_seconds += time.perf_counter() - start
+            write(data)
+        if not ndjson:
+            write(b'[]' if prefix == b'[' else b']')
+        self._end_stream()
+        if collected is not None:
+            response_cache.put(slot[0], b''.join(collected), content_type, extra_headers,
+                               slot[1], slot[2])
+
+    def _send_bulk(self, table, data):
+        """
+        Beantwortet eine Sammel-Operation (siehe run_bulk).
+
+        Status 200, wenn alle Einträge ausgeführt wurden, 207 bei teilweisem
+        Erfolg und 400, wenn kein Eintrag ausgeführt werden konnte.
+        """
+        if not isinstance(data, dict):
+            self._send_json({'error': 'Erwartet {"create": [...], "update": [...], "delete": [...]}'}, 400)
+            return
+        ops = [data.get(op) or [] for op in ('create', 'update', 'delete')]
+        if any(not isinstance(items, list) for items in ops):
+            self._send_json({'error': 'create/update/delete müssen Listen sein'}, 400)
+            return
+        if sum(len(items) for items in ops) > BULK_MAX_ITEMS:
+            self._send_json({'error': f'Höchstens {BULK_MAX_ITEMS} Einträge je Anfrage'}, 400)
+            return
+        try:
+            result, tags = write_queue.run(lambda conn: run_bulk(conn, table, data))
+        except sqlite3.IntegrityError as exc:
+            self._send_json({'error': f'Sammel-Operation abgebrochen: {exc}'}, 400)
+            return
+        except sqlite3.Error as exc:
+            self._send_write_error(exc, 'Sammel-Operation abgebrochen')
+            return
+        response_cache.invalidate(*tags)
+        done = len(result['created']) + len(result['updated']) + len(result['deleted'])
+        if not result['errors']:
+            code = 200
+        else:
+            code = 207 if done else 400
+        self._send_json(result, code)
+
+    def _begin_stream(self, content_type, headers=None):
+        """
+        Sendet die Header einer Antwort, deren Länge vorher nicht feststeht,
+        und gibt die Funktion zum Schreiben des Bodys zurück; danach
+        _end_stream aufrufen. HTTP/1.1-Clients bekommen Chunked
+        Transfer-Encoding, HTTP/1.0-Clients eine Antwort ohne Länge, deren
+        Ende das Schließen der Verbindung markiert.
+        """
+        headers = headers or {}
+        if self.request_version != 'HTTP/1.0':
+            self._set_headers(content_type=content_type,
+                              headers=dict(headers, **{'Transfer-Encoding': 'chunked'}))
+            return self._write_chunk
+        self.close_connection = True
+        self._set_headers(content_type=content_type, headers=headers)
+        return self.wfile.write
+
+    def _end_stream(self):
+        if self.request_version != 'HTTP/1.0':
+            self.wfile.write(b'0\r\n\r\n')
+
+    def _write_chunk(self, data):
+        """Schreibt ``data`` als einen Chunk (Transfer-Encoding: chunked)."""
+        self.wfile.write(b'%X\r\n%s\r\n' % (len(data), data))
+
+    def _send_export(self, table):
+        """
+        Exportiert ``table`` (bzw. den per Filter/fields=/sort= gewählten
+        Ausschnitt, siehe build_list_query) ohne Paginierung:
+
+        - format=columns (Standard): spaltenweises JSON, siehe columns_chunks
+        - format=csv: CSV, direkt aus dem Cursor gestreamt
+
+        Zeilen werden als Tupel gelesen und blockweise kodiert, ohne je Zeile
+        ein dict zu bauen. Mit Accept-Encoding: gzip wird der Strom
+        fortlaufend komprimiert.
+        """
+        params = dict(self.params)
+        fmt = params.pop('format', 'columns')
+        try:
+            if fmt not in EXPORT_CONTENT_TYPES:
+                raise ValueError(f'format muss einer von {", ".join(EXPORT_CONTENT_TYPES)} sein')
+            for name in ('limit', 'cursor', 'since'):
+                if name in params:
+                    raise ValueError(f'{name} wird beim Export nicht unterstützt')
+            query = build_list_query(table, params)
+        except ValueError as exc:
+            self._send_json({'error': str(exc)}, 400)
+            return
+        headers = {'Vary': 'Accept-Encoding'}
+        if fmt == 'csv':
+            headers['Content-Disposition'] = f'attachment; filename="{table}.csv"'
+        gzipped = choose_encoding(self.headers.get('Accept-Encoding'), ('gzip',)) == 'gzip'
+        if gzipped:
+            headers['Content-Encoding'] = 'gzip'
+        with db_pool.connection() as conn:
+            cursor = conn.cursor()
+            cursor.row_factory = None
+            cursor.execute(query.sql, query.args)
+            if fmt == 'csv':
+                self._send_chunks(csv_chunks(cursor, query.fields), EXPORT_CONTENT_TYPES[fmt],
+                                  headers, gzipped)
+                return
+            # erst alles lesen, dann die Verbindung zurückgeben und senden
+            files, count = spool_columns(cursor, len(query.fields))
+        try:
+            self._send_chunks(columns_chunks(query.fields, files, count), EXPORT_CONTENT_TYPES[fmt],
+                              headers, gzipped)
+        finally:
+            for f in files:
+                f.close()
+
+    def _send_chunks(self, chunks, content_type, headers, gzipped=False):
+        send = self._begin_stream(content_type, headers)
+        for data in gzip_chunks(chunks) if gzipped else chunks:
+            # ein leerer Chunk würde die Antwort vorzeitig beenden
+            if data:
+                send(data)
+        self._end_stream()
+
     def do_OPTIONS(self):
         """Behandelt OPTIONS-Anfragen für CORS."""
-        self._set_headers()
+        self._set_headers(content_length=0)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_PUT(self):
+        self._dispatch('PUT')
+
+    def do_DELETE(self):
+        self._dispatch('DELETE')
+
+    def _dispatch(self, method):
+        """
+        Sucht die Route zu Methode und Pfad in ROUTES und ruft deren Handler
+        mit den numerischen Pfadsegmenten als Argumenten auf.
+
+        Query-Parameter stehen danach in ``self.params``, ein JSON-Body in
+        ``self.body_data``. GET-Anfragen ohne API-Route gehen an serve_static.
+
+        Jede Anfrage wird unter dem Namen ihrer Route in ``metrics`` gezählt.
+        """
+        parsed = urlparse(self.path)
+        route, ids, parts = resolve_route(method, parsed.path)
+        if route:
+            name = route.name
+        elif method == 'GET' and not parsed.path.startswith('/api/'):
+            name = 'GET static'
+        else:
+            name = f'{method} unmatched'
+        self._status = None
+        written = getattr(self.wfile, 'bytes_written', 0)
+        sample = current_request.sample = metrics.begin(name)
+        try:
+            self._handle(method, parsed, route, ids, parts)
+        finally:
+            current_request.sample = None
+            metrics.finish(name, self._status or 'none',
+                           getattr(self.wfile, 'bytes_written', 0) - written, sample)
+
+    def _handle(self, method, parsed, route, ids, parts):
+        # Body immer vollständig lesen, sonst stünde er bei Keep-Alive
+        # vor der nächsten Anfrage auf der Verbindung
+        length = int(self.headers.get('Content-Length', 0))
+        body = self.rfile.read(length).decode() if length else ''
+        waited = admission.queue_wait()
+        if route is None:
+            if method == 'GET' and not parsed.path.startswith('/api/'):
+                self.serve_static(parsed.path)
+            elif method == 'GET':
+                self._send_json({'error': 'Ungültige Anfrage'}, 404)
+            else:
+                self._send_json({'error': 'Pfad nicht gefunden'}, 404)
+            return
+        if not self._admit(waited):
+            return
+        try:
+            self.body_data = json.loads(body) if body else {}
+        except json.JSONDecodeError:
+            self.body_data = {}
+        try:
+            self.body_data = normalize_dates(self.body_data)
+        except ValueError as exc:
+            self._send_json({'error': str(exc)}, 400)
+            return
+        self.params = {k: v[0] for k, v in parse_qs(parsed.query).items()} if parsed.query else {}
+        if method == 'GET' and self._serve_conditional(parts):
+            return
+        heavy = is_heavy(route.name, self.params)
+        if heavy and not admission.begin_heavy(waited):
+            self._send_overloaded()
+            return
+        try:
+            route.handler(self, *ids)
+        finally:
+            if heavy:
+                admission.end_heavy()
+
+    def _admit(self, waited):
+        """
+        Lehnt eine API-Anfrage ab, wenn ihre Verbindung zu lange auf einen
+        Worker gewartet hat (503) oder der Client sein Kontingent verbraucht
+        hat (429), siehe Admission. True, wenn sie bearbeitet werden soll.
+        """
+        if admission.overloaded(waited):
+            self._send_overloaded()
+            return False
+        retry = admission.take_token(self._client_key())
+        if retry:
+            self._send_json({'error': 'Zu viele Anfragen, bitte später erneut versuchen'}, 429,
+                            headers={'Retry-After': str(math.ceil(retry))})
+            return False
+        return True
+
+    def _client_key(self):
+        if ADMISSION_CLIENT_HEADER:
+            forwarded = self.headers.get(ADMISSION_CLIENT_HEADER)
+            if forwarded:
+                # letzter Eintrag: vom eigenen Proxy gesetzt, nicht vom Client
+                return forwarded.rsplit(',', 1)[-1].strip()
+        return self.client_address[0]
+
+    def _send_overloaded(self):
+        self._send_json({'error': 'Server ausgelastet, bitte später erneut versuchen'}, 503,
+                        headers={'Retry-After': str(ADMISSION_RETRY_AFTER)})
+
+    def _send_write_error(self, exc, not_found):
+        """
+        Antwort auf einen fehlgeschlagenen Schreibzugriff über die WriteQueue:
+        404 mit ``not_found`` bei verletztem Fremdschlüssel, 400 bei anderen
+        Constraints, 503 mit Retry-After, wenn die Datenbank gesperrt ist
+        (betrifft bei Group Commit alle Aufträge der Transaktion), sonst 500.
+        """
+        message = str(exc)
+        if isinstance(exc, sqlite3.IntegrityError):
+            if 'FOREIGN KEY' in message:
+                self._send_json({'error': not_found}, 404)
+            else:
+                self._send_json({'error': f'Ungültige Daten: {message}'}, 400)
+        elif isinstance(exc, sqlite3.OperationalError) and ('locked' in message or 'busy' in message):
+            self._send_json({'error': 'Datenbank ausgelastet, bitte später erneut versuchen'}, 503,
+                            headers={'Retry-After': str(ADMISSION_RETRY_AFTER)})
+        else:
+            self.log_error('Schreibzugriff fehlgeschlagen: %s', message)
+            self._send_json({'error': 'Datenbankfehler'}, 500)
+
+    def _send_row(self, sql, args, not_found):
+        """Sendet die erste Zeile der Abfrage als JSON oder 404 mit ``not_found``."""
+        with db_pool.connection() as conn:
+            row = conn.execute(sql, args).fetchone()
+        if row:
+            self._send_json(dict(row))
+        else:
+            self._send_json({'error': not_found}, 404)
+
+    def _send_by_id(self, table, row_id, not_found):
+        """Sendet die Zeile ``row_id`` von ``table``, mit archive=1 auch aus dem Archiv."""
+        try:
+            source = table_source(table, self.params)
+        except ValueError as exc:
+            self._send_json({'error': str(exc)}, 400)
+            return
+        self._send_row(f'SELECT * FROM {source} WHERE id=?', (row_id,), not_found)
+
+    def _update_row(self, table, row_id, allowed, not_found):
+        """
+        Übernimmt die Felder aus ``allowed``, die im Body stehen, in die Zeile
+        ``row_id`` von ``table``. Liefert die geänderte Zeile; gibt es sie
+        nicht oder wurde kein Feld geändert, sendet es 404 mit ``not_found``
+        und liefert None, ebenso nach einer Fehlerantwort (_send_write_error).
+        """
+        data = self.body_data
+        set_parts = []
+        values = []
+        for key in allowed:
+            if key in data:
+                set_parts.append(f'{key}=?')
+                values.append(data[key])
+        row = None
+        if set_parts:
+            values.append(row_id)
+
+            def update(conn):
+                sql = (f'UPDATE {table} SET {", ".join(set_parts)}, updated_at={NOW_SQL} '
+                       f'WHERE id=? {RETURNING[table]}')
+                return row_dict(table, conn.execute(sql, values).fetchone())
+
+            try:
+                row = write_queue.run(update)
+            except sqlite3.Error as exc:
+                self._send_write_error(exc, not_found)
+                return None
+        if not row:
+            self._send_json({'error': not_found}, 404)
+        return row
 
     # ----------------------
     #       GET (API)
     # ----------------------
-    def do_GET(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
-
-        # API abwickeln
-        if path.startswith('/api/'):
-            parts = path.strip('/').split('/')  # z.B. ['api','projects','1','tasks']
-
-            # ---- Customers ----
-            # /api/customers
-            if len(parts) == 2 and parts[1] == 'customers':
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    conn.row_factory = sqlite3.Row
-                    rows = conn.execute('SELECT * FROM customers').fetchall()
-                    data = [dict(row) for row in rows]
-                self._set_headers()
-                self.wfile.write(json.dumps(data).encode())
-                return
 
-            # /api/customers/<id>
-            if len(parts) == 3 and parts[1] == 'customers' and parts[2].isdigit():
-                customer_id = parts[2]
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    conn.row_factory = sqlite3.Row
-                    row = conn.execute(
-                        'SELECT * FROM customers WHERE id=?', (customer_id,)
-                    ).fetchone()
-                    if row:
-                        self._set_headers()
-                        self.wfile.write(json.dumps(dict(row)).encode())
-                    else:
-                        self._set_headers(404)
-                        self.wfile.write(json.dumps({'error': 'Kunde nicht gefunden'}).encode())
-                return
+    # ---- Cache ----
+    @route('GET', '/api/cache')
+    def get_cache_stats(self):
+        """Trefferstatistik des Antwort-Caches."""
+        self._send_json(response_cache.stats())
 
-            # /api/customers/<id>/projects -> alle Projekte für diesen Kunden
-            if len(parts) == 4 and parts[1] == 'customers' and parts[2].isdigit() and parts[3] == 'projects':
-                customer_id = parts[2]
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    conn.row_factory = sqlite3.Row
-                    rows = conn.execute(
-                        'SELECT * FROM projects WHERE customer_id=?', (customer_id,)
-                    ).fetchall()
-                    data = [dict(row) for row in rows]
-                self._set_headers()
-                self.wfile.write(json.dumps(data).encode())
-                return
+    # ---- Kennzahlen ----
+    @route('GET', '/api/metrics')
+    def get_metrics(self):
+        """Kennzahlen im Prometheus-Textformat (siehe RequestMetrics)."""
+        cache = response_cache.stats()
+        body = metrics.render([
+            ('response_cache_entries', 'gauge', 'Einträge im Antwort-Cache', cache['entries']),
+            ('response_cache_bytes', 'gauge', 'Größe des Antwort-Caches', cache['bytes']),
+            ('response_cache_hits_total', 'counter', 'Treffer im Antwort-Cache', cache['hits']),
+            ('response_cache_misses_total', 'counter', 'Fehlgriffe im Antwort-Cache', cache['misses']),
+            ('queued_connections', 'gauge', 'Verbindungen, die auf einen Worker warten',
+             getattr(self.server, 'queued_connections', lambda: 0)()),
+            ('change_streams', 'gauge', 'Offene SSE-Streams und Long-Polls', change_feed.streams),
+            ('write_batches_total', 'counter', 'Vom Schreib-Thread committete Transaktionen',
+             write_queue.batches),
+            ('write_jobs_total', 'counter', 'Darin ausgeführte Schreibanfragen', write_queue.jobs),
+            ('write_queue_length', 'gauge', 'Auf den Schreib-Thread wartende Schreibanfragen',
+             write_queue.pending()),
+            ('heavy_requests', 'gauge', 'Laufende aufwendige Anfragen', admission.heavy),
+            ('shed_requests_total', 'counter', 'Wegen Überlast mit 503 abgelehnte Anfragen', admission.shed),
+            ('rate_limited_requests_total', 'counter', 'Wegen der Client-Rate mit 429 abgelehnte Anfragen',
+             admission.limited),
+        ]).encode()
+        self._set_headers(200, 'text/plain; version=0.0.4; charset=utf-8', len(body))
+        self.wfile.write(body)
 
-            # ---- Projects ----
-            # /api/projects
-            if len(parts) == 2 and parts[1] == 'projects':
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    conn.row_factory = sqlite3.Row
-                    rows = conn.execute('SELECT * FROM projects').fetchall()
-                    data = [dict(row) for row in rows]
-                self._set_headers()
-                self.wfile.write(json.dumps(data).encode())
-                return
+    # ---- Export ----
+    @route('GET', '/api/export/customers')
+    def export_customers(self):
+        self._send_export('customers')
 
-            # /api/projects/<id>
-            if len(parts) == 3 and parts[1] == 'projects' and parts[2].isdigit():
-                project_id = parts[2]
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    conn.row_factory = sqlite3.Row
-                    row = conn.execute(
-                        'SELECT * FROM projects WHERE id=?', (project_id,)
-                    ).fetchone()
-                    if row:
-                        self._set_headers()
-                        self.wfile.write(json.dumps(dict(row)).encode())
-                    else:
-                        self._set_headers(404)
-                        self.wfile.write(json.dumps({'error': 'Projekt nicht gefunden'}).encode())
-                return
+    @route('GET', '/api/export/projects')
+    def export_projects(self):
+        """Projekte als spaltenweises JSON oder CSV, z.B. ?format=csv&status=Montage."""
+        self._send_export('projects')
 
-            # /api/projects/<id>/tasks
-            if len(parts) == 4 and parts[1] == 'projects' and parts[2].isdigit() and parts[3] == 'tasks':
-                project_id = parts[2]
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    conn.row_factory = sqlite3.Row
-                    rows = conn.execute(
-                        'SELECT * FROM tasks WHERE project_id=?', (project_id,)
-                    ).fetchall()
-                    data = [dict(row) for row in rows]
-                self._set_headers()
-                self.wfile.write(json.dumps(data).encode())
-                return
+    @route('GET', '/api/export/tasks')
+    def export_tasks(self):
+        """Aufgaben als spaltenweises JSON oder CSV, z.B. ?format=csv&project_id=17."""
+        self._send_export('tasks')
+
+    # ---- Customers ----
+    @route('GET', '/api/customers')
+    def list_customers(self):
+        self._send_list('customers', self.params)
+
+    @route('GET', '/api/customers/{id}')
+    def get_customer(self, customer_id):
+        self._send_row('SELECT * FROM customers WHERE id=?', (customer_id,), 'Kunde nicht gefunden')
+
+    @route('GET', '/api/customers/{id}/projects')
+    def list_customer_projects(self, customer_id):
+        """Alle Projekte für diesen Kunden."""
+        self._send_list('projects', self.params, ['customer_id=?'], [customer_id])
 
-            # ---- Tasks ----
-            # /api/tasks
-            if len(parts) == 2 and parts[1] == 'tasks':
-                # optionaler Statusfilter via Query
-                params = {}
-                if parsed.query:
-                    from urllib.parse import parse_qs
-                    params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
-                status_filter = params.get('status')
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    conn.row_factory = sqlite3.Row
-                    if status_filter:
-                        rows = conn.execute(
-                            'SELECT * FROM tasks WHERE status=?', (status_filter,)
-                        ).fetchall()
-                    else:
-                        rows = conn.execute('SELECT * FROM tasks').fetchall()
-                    data = [dict(row) for row in rows]
-                self._set_headers()
-                self.wfile.write(json.dumps(data).encode())
+    # ---- Projects ----
+    @route('GET', '/api/projects')
+    def list_projects(self):
+        self._send_list('projects', self.params)
+
+    @route('GET', '/api/projects/{id}')
+    def get_project(self, project_id):
+        self._send_by_id('projects', project_id, 'Projekt nicht gefunden')
+
+    @route('GET', '/api/projects/{id}/tasks')
+    def list_project_tasks(self, project_id):
+        self._send_list('tasks', self.params, ['project_id=?'], [project_id])
+
+    # ---- Übersicht ----
+    @route('GET', '/api/overview')
+    def get_overview(self):
+        """Alle Projekte inkl. Aufgabenzähler je Status (mit since=: nur geänderte)."""
+        if 'since' in self.params:
+            try:
+                since = parse_since(self.params['since'])
+            except ValueError as exc:
+                self._send_json({'error': str(exc)}, 400)
                 return
+            with db_pool.connection() as conn:
+                delta = read_delta(conn, 'overview', since,
+                                   f'{OVERVIEW_SQL} WHERE p.id IN ({DELTA_KEYS["overview"]})',
+                                   (today_iso(), since))
+            self._send_delta_result(delta)
+            return
+        with db_pool.connection() as conn:
+            seq = change_log_range(conn)[1]
+            rows = conn.execute(OVERVIEW_SQL, (today_iso(),)).fetchall()
+        self._send_json([dict(row) for row in rows], headers={'X-Change-Seq': str(seq)})
 
-            # /api/tasks/<id>
-            if len(parts) == 3 and parts[1] == 'tasks' and parts[2].isdigit():
-                task_id = parts[2]
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    conn.row_factory = sqlite3.Row
-                    row = conn.execute(
-                        'SELECT * FROM tasks WHERE id=?', (task_id,)
-                    ).fetchone()
-                    if row:
-                        self._set_headers()
-                        self.wfile.write(json.dumps(dict(row)).encode())
-                    else:
-                        self._set_headers(404)
-                        self.wfile.write(json.dumps({'error': 'Aufgabe nicht gefunden'}).encode())
+    @route('GET', '/api/timeline')
+    def get_timeline(self):
+        """
+        Fällige Aufgaben und Projekte in einem Zeitraum, nach Datum sortiert.
+
+        - from=/to=      JJJJ-MM-TT, jeweils einschließlich; fehlt eins, ist
+                         diese Seite offen. Ohne beide: heute und die
+                         folgenden TIMELINE_DEFAULT_DAYS - 1 Tage
+        - kind=task|project   nur diese Art
+        - open=1         keine erledigten Aufgaben und abgeschlossenen Projekte
+        - limit/cursor   Seiten wie bei den Listen (X-Next-Cursor, Link)
+
+        ``overdue`` markiert offene Termine vor heute; alle überfälligen
+        liefert z.B. ?to=<gestern>&open=1.
+        """
+        params = self.params
+        try:
+            start = normalize_date(params.get('from'), 'from')
+            end = normalize_date(params.get('to'), 'to')
+            if start is None and end is None:
+                start = today_iso()
+                end = (datetime.date.fromisoformat(start)
+                       + datetime.timedelta(days=TIMELINE_DEFAULT_DAYS - 1)).isoformat()
+            kind = params.get('kind')
+            if kind and kind not in TIMELINE_SOURCES:
+                raise ValueError(f'kind muss einer von {", ".join(TIMELINE_SOURCES)} sein')
+            kinds = [kind] if kind else list(TIMELINE_SOURCES)
+            limit = parse_limit(params['limit']) if params.get('limit') else DEFAULT_PAGE_SIZE
+            after = parse_timeline_cursor(params['cursor']) if params.get('cursor') else None
+        except ValueError as exc:
+            self._send_json({'error': str(exc)}, 400)
+            return
+        with db_pool.connection() as conn:
+            rows = read_timeline(conn, start, end, kinds, params.get('open') == '1', limit, after)
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1]
+            headers = self._next_page_headers(
+                params, encode_cursor([last['date'], last['kind']], last['id']), limit)
+        today = today_iso()
+        items = []
+        for row in rows:
+            item = dict(row)
+            item['overdue'] = item['date'] < today and (
+                item['status'] != 'Done' if item['kind'] == 'task' else item['status'] not in ARCHIVE_STATUSES)
+            items.append(item)
+        self._send_json(items, headers=headers)
+
+    @route('GET', '/api/unparsed-dates')
+    def get_unparsed_dates(self):
+        """
+        Datumswerte, die Migration 7 nicht erkennen konnte, mit Zeile und
+        Originaltext, solange die Spalte noch leer ist (zum Nachtragen per PUT).
+        """
+        with db_pool.connection() as conn:
+            self._send_json(read_unparsed_dates(conn))
+
+    @route('GET', '/api/stats')
+    def get_stats(self):
+        """Aufgabenzähler je Projekt, je Kunde und insgesamt (siehe summarize_stats)."""
+        today = today_iso()
+        with db_pool.connection() as conn:
+            projects = [dict(row) for row in conn.execute(STATS_SQL, (today,))]
+        totals, customers = summarize_stats(projects)
+        self._send_json({'date': today, 'totals': totals, 'customers': customers, 'projects': projects})
+
+    # ---- Suche ----
+    @route('GET', '/api/search')
+    def search(self):
+        """Volltextsuche über Kunden, Projekte und Aufgaben (siehe build_search_query)."""
+        try:
+            sql, args, limit = build_search_query(self.params)
+        except ValueError as exc:
+            self._send_json({'error': str(exc)}, 400)
+            return
+        with db_pool.connection() as conn:
+            rows = conn.execute(sql, args).fetchall()
+        headers = {}
+        if len(rows) > limit:
+            rows = rows[:limit]
+            headers = self._next_page_headers(
+                self.params, encode_cursor(rows[-1]['rank'], rows[-1]['rowid']), limit)
+        self._send_json([search_result(row) for row in rows], headers=headers)
+
+    # ---- Änderungsprotokoll ----
+    @route('GET', '/api/changes')
+    def get_changes(self):
+        """
+        Änderungen nach ``since`` (bzw. Header Last-Event-ID), ohne since ab jetzt.
+
+        Mit ``Accept: text/event-stream`` als Server-Sent Events (siehe
+        _stream_changes), sonst als JSON ``{"seq": ..., "changes": [...]}``;
+        ``wait=<Sekunden>`` wartet dabei auf die nächste Änderung (Long-Polling).
+        """
+        since = self.headers.get('Last-Event-ID') or self.params.get('since')
+        try:
+            since = parse_since(since) if since else None
+        except ValueError as exc:
+            self._send_json({'error': str(exc)}, 400)
+            return
+        try:
+            wait = float(self.params.get('wait') or 0)
+        except ValueError:
+            wait = -1
+        if not wait >= 0:
+            self._send_json({'error': 'wait muss eine Anzahl Sekunden sein'}, 400)
+            return
+        if 'text/event-stream' in self.headers.get('Accept', ''):
+            self._stream_changes(since)
+            return
+        # Wartende belegen einen Worker; sind alle Plätze vergeben, sofort antworten
+        waiting = wait > 0 and change_feed.try_open_stream()
+        try:
+            deadline = time.monotonic() + min(wait, CHANGE_STREAM_SECONDS) if waiting else 0
+            while True:
+                version = change_feed.version
+                with db_pool.connection() as conn:
+                    if since is None:
+                        since = change_log_range(conn)[1]
+                    changes = read_changes(conn, since)
+                if changes is None:
+                    self._send_json({'error': 'Änderungen nicht mehr verfügbar, bitte neu laden'}, 410)
+                    return
+                remaining = deadline - time.monotonic()
+                if changes or remaining <= 0:
+                    break
+                change_feed.wait(version, min(CHANGE_POLL_INTERVAL, remaining))
+        finally:
+            if waiting:
+                change_feed.close_stream()
+        self._send_json({'seq': changes[-1]['seq'] if changes else since, 'changes': changes})
+
+    def _stream_changes(self, since):
+        """
+        Sendet neue Einträge des Änderungsprotokolls als Server-Sent Events
+        (``id: <seq>``, ``event: change``, ``data: {...}``).
+
+        Ein Stream belegt einen Worker-Thread und endet daher nach
+        CHANGE_STREAM_SECONDS, beim Herunterfahren oder sobald weitere
+        Verbindungen auf einen Worker warten. EventSource verbindet sich
+        danach mit Last-Event-ID neu und setzt nahtlos fort. Liegt ``since``
+        nicht mehr vor, kommt ein ``reset``-Ereignis: der Client lädt neu.
+        """
+        chunked = self.request_version != 'HTTP/1.0'
+        headers = {'Cache-Control': 'no-cache'}
+        if chunked:
+            headers['Transfer-Encoding'] = 'chunked'
+            send = self._write_chunk
+        else:
+            self.close_connection = True
+            send = self.wfile.write
+        self._set_headers(content_type='text/event-stream', headers=headers)
+        release = getattr(self.server, 'should_release_connection', lambda: False)
+        if not change_feed.try_open_stream():
+            # alle Plätze belegt: später erneut versuchen
+            send(b'retry: %d\n\n' % (CHANGE_RETRY_MS * 5))
+        else:
+            try:
+                send(b'retry: %d\n\n' % CHANGE_RETRY_MS)
+                deadline = time.monotonic() + CHANGE_STREAM_SECONDS
+                last_sent = time.monotonic()
+                while True:
+                    version = change_feed.version
+                    with db_pool.connection() as conn:
+                        if since is None:
+                            since = change_log_range(conn)[1]
+                        changes = read_changes(conn, since)
+                        if changes is None:
+                            since = change_log_range(conn)[1]
+                    if changes is None:
+                        send(b'id: %d\nevent: reset\ndata: {}\n\n' % since)
+                        changes = []
+                    elif changes:
+                        since = changes[-1]['seq']
+                        send(''.join(f'id: {c["seq"]}\nevent: change\ndata: {json.dumps(c)}\n\n'
+                                     for c in changes).encode())
+                        last_sent = time.monotonic()
+                    elif time.monotonic() - last_sent >= CHANGE_PING_INTERVAL:
+                        send(b': ping\n\n')
+                        last_sent = time.monotonic()
+                    if time.monotonic() >= deadline or release():
+                        break
+                    if len(changes) < CHANGE_FEED_BATCH:
+                        change_feed.wait(version, CHANGE_POLL_INTERVAL)
+            except OSError:
+                # Client hat die Verbindung getrennt (oder liest nicht mehr)
+                self.close_connection = True
                 return
+            finally:
+                change_feed.close_stream()
+        if chunked:
+            self.wfile.write(b'0\r\n\r\n')
 
-            # Sonst
-            self._set_headers(404)
-            self.wfile.write(json.dumps({'error': 'Ungültige Anfrage'}).encode())
+    # ---- Tasks ----
+    @route('GET', '/api/tasks')
+    def list_tasks(self):
+        # Filter (project_id, status, assignee, priority, due_from/due_to) via Query
+        self._send_list('tasks', self.params)
+
+    @route('GET', '/api/tasks/open')
+    def list_open_tasks(self):
+        """
+        Offene Aufgaben aller Projekte mit project_name (siehe
+        open_tasks_filter). X-Updated-At enthält den Stand, ab dem
+        ``updated_since=`` nur noch die Änderungen liefert
+        (read_open_tasks_delta); 410, wenn der Client neu laden muss.
+        """
+        try:
+            where, args = open_tasks_filter(self.params)
+            since = (parse_updated_since(self.params['updated_since'])
+                     if 'updated_since' in self.params else None)
+        except ValueError as exc:
+            self._send_json({'error': str(exc)}, 400)
             return
+        with db_pool.connection() as conn:
+            if since is not None:
+                delta = read_open_tasks_delta(conn, where, args, since)
+            else:
+                headers = {'X-Change-Seq': str(change_log_range(conn)[1]),
+                           'X-Updated-At': conn.execute(LATEST_UPDATE_SQL).fetchone()[0]}
+                rows = conn.execute(f'{OPEN_TASKS_SQL} WHERE {" AND ".join(where)} ORDER BY t.id',
+                                    args).fetchall()
+        if since is None:
+            self._send_json([dict(row) for row in rows], headers=headers)
+        else:
+            self._send_delta_result(delta)
 
-        # kein API-Pfad -> statische Datei
-        self.serve_static(path)
+    @route('GET', '/api/tasks/{id}')
+    def get_task(self, task_id):
+        self._send_by_id('tasks', task_id, 'Aufgabe nicht gefunden')
 
     # ----------------------
     #       POST (API)
     # ----------------------
-    def do_POST(self):
-        parsed = urlparse(self.path)
-        path = parsed.path
-        length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(length).decode() if length else ''
+
+    @route('POST', '/api/customers')
+    def create_customer(self):
+        data = self.body_data
+        fields = (
+            data.get('name'),
+            data.get('contact_person'),
+            data.get('email'),
+            data.get('phone'),
+            data.get('address'),
+            data.get('design_note'),
+        )
+
+        def insert(conn):
+            row = conn.execute(
+                'INSERT INTO customers '
+                '(name, contact_person, email, phone, address, design_note, updated_at) '
+                f'VALUES (?, ?, ?, ?, ?, ?, {NOW_SQL}) {RETURNING["customers"]}',
+                fields
+            ).fetchone()
+            return row_dict('customers', row)
+
         try:
-            data = json.loads(body) if body else {}
-        except json.JSONDecodeError:
-            data = {}
-
-        # ---- Kunden anlegen: /api/customers ----
-        if path == '/api/customers':
-            fields = (
-                data.get('name'),
-                data.get('contact_person'),
-                data.get('email'),
-                data.get('phone'),
-                data.get('address'),
-                data.get('design_note'),
-            )
-            with sqlite3.connect(DB_FILE) as conn:
-                conn.execute('PRAGMA foreign_keys = ON')
-                cur = conn.cursor()
-                cur.execute(
-                    'INSERT INTO customers '
-                    '(name, contact_person, email, phone, address, design_note) '
-                    'VALUES (?, ?, ?, ?, ?, ?)',
-                    fields
-                )
-                conn.commit()
-                new_id = cur.lastrowid
-                row = cur.execute('SELECT * FROM customers WHERE id=?', (new_id,)).fetchone()
-                data_out = dict(zip([d[0] for d in cur.description], row))
-            self._set_headers(201)
-            self.wfile.write(json.dumps(data_out).encode())
-            return
-
-        # ---- Projekte anlegen: /api/projects ----
-        if path == '/api/projects':
-            customer_id = data.get('customer_id')
-            fields = (
-                data.get('name'),
-                data.get('customer'),   # Text-Feld (z.B. Kundenname Anzeige)
-                data.get('fair'),
-                data.get('size'),
-                data.get('date'),
-                data.get('priority'),
-                data.get('status'),
-                data.get('nextStep'),
-                data.get('dueDate'),
-                customer_id
-            )
-            with sqlite3.connect(DB_FILE) as conn:
-                conn.execute('PRAGMA foreign_keys = ON')
-                cur = conn.cursor()
-                cur.execute(
-                    'INSERT INTO projects '
-                    '(name, customer, fair, size, date, priority, status, nextStep, dueDate, customer_id) '
-                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
-                    fields
-                )
-                conn.commit()
-                new_id = cur.lastrowid
-                row = cur.execute('SELECT * FROM projects WHERE id=?', (new_id,)).fetchone()
-                data_out = dict(zip([d[0] for d in cur.description], row))
-            self._set_headers(201)
-            self.wfile.write(json.dumps(data_out).encode())
-            return
-
-        # ---- Aufgaben anlegen: /api/projects/<id>/tasks ----
-        if path.startswith('/api/projects') and path.endswith('/tasks'):
-            parts = path.strip('/').split('/')
-            if len(parts) == 4 and parts[1] == 'projects' and parts[2].isdigit():
-                project_id = parts[2]
-                title = data.get('title')
-                description = data.get('description')
-                status = data.get('status') or 'ToDo'
-                due_date = data.get('dueDate')
-                assignee = data.get('assignee')
-                priority = data.get('priority')
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    cur = conn.cursor()
-                    cur.execute(
-                        'INSERT INTO tasks '
-                        '(project_id, title, description, status, dueDate, assignee, priority) '
-                        'VALUES (?, ?, ?, ?, ?, ?, ?)',
-                        (project_id, title, description, status, due_date, assignee, priority)
-                    )
-                    conn.commit()
-                    new_id = cur.lastrowid
-                    row = cur.execute('SELECT * FROM tasks WHERE id=?', (new_id,)).fetchone()
-                    data_out = dict(zip([d[0] for d in cur.description], row))
-                self._set_headers(201)
-                self.wfile.write(json.dumps(data_out).encode())
-                return
+            data_out = write_queue.run(insert)
+        except sqlite3.Error as exc:
+            self._send_write_error(exc, 'Kunde nicht gefunden')
+            return
+        response_cache.invalidate('customers')
+        self._send_json(data_out, 201)
+
+    @route('POST', '/api/projects')
+    def create_project(self):
+        data = self.body_data
+        customer_id = data.get('customer_id')
+        fields = (
+            data.get('name'),
+            data.get('customer'),   # Text-Feld (z.B. Kundenname Anzeige)
+            data.get('fair'),
+            data.get('size'),
+            data.get('date'),
+            data.get('priority'),
+            data.get('status'),
+            data.get('nextStep'),
+            data.get('dueDate'),
+            customer_id
+        )
+
+        def insert(conn):
+            row = conn.execute(
+                'INSERT INTO projects '
+                '(name, customer, fair, size, date, priority, status, nextStep, dueDate, customer_id, '
+                'updated_at) '
+                f'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, {NOW_SQL}) {RETURNING["projects"]}',
+                fields
+            ).fetchone()
+            return row_dict('projects', row)
+
+        try:
+            data_out = write_queue.run(insert)
+        except sqlite3.Error as exc:
+            self._send_write_error(exc, 'Kunde nicht gefunden')
+            return
+        response_cache.invalidate('projects', 'overview')
+        self._send_json(data_out, 201)
+
+    @route('POST', '/api/projects/{id}/tasks')
+    def create_task(self, project_id):
+        data = self.body_data
+        title = data.get('title')
+        description = data.get('description')
+        status = data.get('status') or 'ToDo'
+        due_date = data.get('dueDate')
+        assignee = data.get('assignee')
+        priority = data.get('priority')
+
+        def insert(conn):
+            row = conn.execute(
+                'INSERT INTO tasks '
+                '(project_id, title, description, status, dueDate, assignee, priority, updated_at) '
+                f'VALUES (?, ?, ?, ?, ?, ?, ?, {NOW_SQL}) {RETURNING["tasks"]}',
+                (project_id, title, description, status, due_date, assignee, priority)
+            ).fetchone()
+            return row_dict('tasks', row)
+
+        try:
+            data_out = write_queue.run(insert)
+        except sqlite3.Error as exc:
+            self._send_write_error(exc, 'Projekt nicht gefunden')
+            return
+        invalidate_task_change(project_id)
+        self._send_json(data_out, 201)
+
+    # ---- Sammel-Operationen ----
+    @route('POST', '/api/tasks/bulk')
+    def bulk_tasks(self):
+        """{"create": [...], "update": [...], "delete": [...]} für Aufgaben."""
+        self._send_bulk('tasks', self.body_data)
+
+    @route('POST', '/api/projects/bulk')
+    def bulk_projects(self):
+        """{"create": [...], "update": [...], "delete": [...]} für Projekte."""
+        self._send_bulk('projects', self.body_data)
 
-        # Unbekannter Pfad
-        self._set_headers(404)
-        self.wfile.write(json.dumps({'error': 'Pfad nicht gefunden'}).encode())
+    @route('POST', '/api/projects/{id}/tasks/bulk')
+    def bulk_create_project_tasks(self, project_id):
+        """Liste neuer Aufgaben für dieses Projekt (z.B. eine Standard-Checkliste)."""
+        data = self.body_data
+        items = (data.get('create') or []) if isinstance(data, dict) else data
+        if not isinstance(items, list):
+            self._send_json({'error': 'Erwartet [...] oder {"create": [...]}'}, 400)
+            return
+        self._send_bulk('tasks', {'create': [
+            dict(item, project_id=project_id) if isinstance(item, dict) else item for item in items
+        ]})
+
+    @route('POST', '/api/archive')
+    def archive_projects(self):
+        """Verschiebt abgeschlossene Messen ins Archiv (siehe archive_finished_projects)."""
+        try:
+            totals = archive_finished_projects()
+        except sqlite3.Error as exc:
+            self._send_write_error(exc, 'Projekt nicht gefunden')
+            return
+        self._send_json(totals)
 
     # ----------------------
     #       PUT (API)
     # ----------------------
-    def do_PUT(self):
-        parsed = urlparse(self.path)
-        parts = parsed.path.strip('/').split('/')
-        length = int(self.headers.get('Content-Length', 0))
-        body = self.rfile.read(length).decode() if length else ''
-        try:
-            data = json.loads(body) if body else {}
-        except json.JSONDecodeError:
-            data = {}
-
-        # Kunde aktualisieren: /api/customers/<id>
-        if len(parts) == 3 and parts[0] == 'api' and parts[1] == 'customers' and parts[2].isdigit():
-            customer_id = parts[2]
-            allowed = ['name', 'contact_person', 'email', 'phone', 'address', 'design_note']
-            set_parts = []
-            values = []
-            for key in allowed:
-                if key in data:
-                    set_parts.append(f'{key}=?')
-                    values.append(data[key])
-            if set_parts:
-                values.append(customer_id)
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    cur = conn.cursor()
-                    cur.execute(
-                        f'UPDATE customers SET {", ".join(set_parts)} WHERE id=?',
-                        values
-                    )
-                    conn.commit()
-                    row = cur.execute(
-                        'SELECT * FROM customers WHERE id=?', (customer_id,)
-                    ).fetchone()
-                    if row:
-                        self._set_headers()
-                        self.wfile.write(json.dumps(dict(zip([d[0] for d in cur.description], row))).encode())
-                        return
-            self._set_headers(404)
-            self.wfile.write(json.dumps({'error': 'Kunde nicht gefunden oder keine Felder geändert'}).encode())
-            return
-
-        # Projekt aktualisieren: /api/projects/<id>
-        if len(parts) == 3 and parts[0] == 'api' and parts[1] == 'projects' and parts[2].isdigit():
-            project_id = parts[2]
-            allowed = ['name', 'customer', 'fair', 'size', 'date', 'priority',
-                       'status', 'nextStep', 'dueDate', 'customer_id']
-            set_parts = []
-            values = []
-            for key in allowed:
-                if key in data:
-                    set_parts.append(f'{key}=?')
-                    values.append(data[key])
-            if set_parts:
-                values.append(project_id)
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    cur = conn.cursor()
-                    cur.execute(
-                        f'UPDATE projects SET {", ".join(set_parts)} WHERE id=?',
-                        values
-                    )
-                    conn.commit()
-                    row = cur.execute(
-                        'SELECT * FROM projects WHERE id=?', (project_id,)
-                    ).fetchone()
-                    if row:
-                        self._set_headers()
-                        self.wfile.write(json.dumps(dict(zip([d[0] for d in cur.description], row))).encode())
-                        return
-            self._set_headers(404)
-            self.wfile.write(json.dumps({'error': 'Projekt nicht gefunden oder keine Felder geändert'}).encode())
-            return
-
-        # Aufgabe aktualisieren: /api/tasks/<id>
-        if len(parts) == 3 and parts[0] == 'api' and parts[1] == 'tasks' and parts[2].isdigit():
-            task_id = parts[2]
-            allowed_task = ['title', 'description', 'status',
-                            'dueDate', 'assignee', 'priority']
-            set_parts = []
-            values = []
-            for key in allowed_task:
-                if key in data:
-                    set_parts.append(f'{key}=?')
-                    values.append(data[key])
-            if set_parts:
-                values.append(task_id)
-                with sqlite3.connect(DB_FILE) as conn:
-                    conn.execute('PRAGMA foreign_keys = ON')
-                    cur = conn.cursor()
-                    cur.execute(
-                        f'UPDATE tasks SET {", ".join(set_parts)} WHERE id=?',
-                        values
-                    )
-                    conn.commit()
-                    row = cur.execute(
-                        'SELECT * FROM tasks WHERE id=?', (task_id,)
-                    ).fetchone()
-                    if row:
-                        self._set_headers()
-                        self.wfile.write(json.dumps(dict(zip([d[0] for d in cur.description], row))).encode())
-                        return
-            self._set_headers(404)
-            self.wfile.write(json.dumps({'error': 'Aufgabe nicht gefunden oder keine Felder geändert'}).encode())
-            return
-
-        # Unbekannter Pfad
-        self._set_headers(404)
-        self.wfile.write(json.dumps({'error': 'Pfad nicht gefunden'}).encode())
+
+    @route('PUT', '/api/metrics')
+    def update_metrics(self):
+        """Messung zur Laufzeit umstellen: {"sampleRate": 0..1, "slowQueryMs": >= 0}."""
+        data = self.body_data if isinstance(self.body_data, dict) else {}
+        settings = {}
+        for key, low, high in (('sampleRate', 0, 1), ('slowQueryMs', 0, float('inf'))):
+            if key not in data:
+                continue
+            value = data[key]
+            if isinstance(value, bool) or not isinstance(value, (int, float)) or not low <= value <= high:
+                self._send_json({'error': f'{key} muss eine Zahl von {low} bis {high} sein'}, 400)
+                return
+            settings[key] = value
+        if 'sampleRate' in settings:
+            metrics.sample_rate = float(settings['sampleRate'])
+        if 'slowQueryMs' in settings:
+            metrics.slow_query_seconds = settings['slowQueryMs'] / 1000
+        self._send_json({'sampleRate': metrics.sample_rate,
+                         'slowQueryMs': metrics.slow_query_seconds * 1000})
+
+    @route('PUT', '/api/customers/{id}')
+    def update_customer(self, customer_id):
+        allowed = ['name', 'contact_person', 'email', 'phone', 'address', 'design_note']
+        row = self._update_row('customers', customer_id, allowed,
+                               'Kunde nicht gefunden oder keine Felder geändert')
+        if not row:
+            return
+        response_cache.invalidate('customers', f'customer:{customer_id}')
+        self._send_json(row)
+
+    @route('PUT', '/api/projects/{id}')
+    def update_project(self, project_id):
+        allowed = ['name', 'customer', 'fair', 'size', 'date', 'priority',
+                   'status', 'nextStep', 'dueDate', 'customer_id']
+        row = self._update_row('projects', project_id, allowed,
+                               'Projekt nicht gefunden oder keine Felder geändert')
+        if not row:
+            return
+        response_cache.invalidate('projects', f'project:{project_id}', 'overview')
+        self._send_json(row)
+
+    @route('PUT', '/api/tasks/{id}')
+    def update_task(self, task_id):
+        allowed_task = ['title', 'description', 'status',
+                        'dueDate', 'assignee', 'priority']
+        row = self._update_row('tasks', task_id, allowed_task,
+                               'Aufgabe nicht gefunden oder keine Felder geändert')
+        if not row:
+            return
+        invalidate_task_change(row['project_id'], task_id)
+        self._send_json(row)
 
     # ----------------------
     #      DELETE (API)
     # ----------------------
-    def do_DELETE(self):
-        parsed = urlparse(self.path)
-        parts = parsed.path.strip('/').split('/')
-
-        # Kunde löschen: /api/customers/<id>
-        if len(parts) == 3 and parts[0] == 'api' and parts[1] == 'customers' and parts[2].isdigit():
-            customer_id = parts[2]
-            with sqlite3.connect(DB_FILE) as conn:
-                conn.execute('PRAGMA foreign_keys = ON')
-                cur = conn.cursor()
-                cur.execute('DELETE FROM customers WHERE id=?', (customer_id,))
-                conn.commit()
-                if cur.rowcount:
-                    self._set_headers(204, 'text/plain')
-                    return
-            self._set_headers(404)
-            self.wfile.write(json.dumps({'error': 'Kunde nicht gefunden'}).encode())
-            return
-
-        # Projekt löschen: /api/projects/<id>
-        if len(parts) == 3 and parts[0] == 'api' and parts[1] == 'projects' and parts[2].isdigit():
-            project_id = parts[2]
-            with sqlite3.connect(DB_FILE) as conn:
-                conn.execute('PRAGMA foreign_keys = ON')
-                cur = conn.cursor()
-                cur.execute('DELETE FROM projects WHERE id=?', (project_id,))
-                conn.commit()
-                if cur.rowcount:
-                    self._set_headers(204, 'text/plain')
-                    return
-            self._set_headers(404)
-            self.wfile.write(json.dumps({'error': 'Projekt nicht gefunden'}).encode())
-            return
-
-        # Aufgabe löschen: /api/tasks/<id>
-        if len(parts) == 3 and parts[0] == 'api' and parts[1] == 'tasks' and parts[2].isdigit():
-            task_id = parts[2]
-            with sqlite3.connect(DB_FILE) as conn:
-                conn.execute('PRAGMA foreign_keys = ON')
-                cur = conn.cursor()
-                cur.execute('DELETE FROM tasks WHERE id=?', (task_id,))
-                conn.commit()
-                if cur.rowcount:
-                    self._set_headers(204, 'text/plain')
-                    return
-            self._set_headers(404)
-            self.wfile.write(json.dumps({'error': 'Aufgabe nicht gefunden'}).encode())
+
+    @route('DELETE', '/api/customers/{id}')
+    def delete_customer(self, customer_id):
+        def delete(conn):
+            return conn.execute('DELETE FROM customers WHERE id=?', (customer_id,))
+
+        try:
+            cur = write_queue.run(delete)
+        except sqlite3.Error as exc:
+            self._send_write_error(exc, 'Kunde nicht gefunden')
+            return
+        if not cur.rowcount:
+            self._send_json({'error': 'Kunde nicht gefunden'}, 404)
+            return
+        response_cache.invalidate('customers', f'customer:{customer_id}')
+        self._set_headers(204, 'text/plain')
+
+    @route('DELETE', '/api/projects/{id}')
+    def delete_project(self, project_id):
+        def delete(conn):
+            cur = conn.cursor()
+            # Aufgaben werden per ON DELETE CASCADE mitgelöscht
+            task_ids = [r[0] for r in cur.execute(
+                'SELECT id FROM tasks WHERE project_id=?', (project_id,)).fetchall()]
+            cur.execute('DELETE FROM projects WHERE id=?', (project_id,))
+            return cur, task_ids
+
+        try:
+            cur, task_ids = write_queue.run(delete)
+        except sqlite3.Error as exc:
+            self._send_write_error(exc, 'Projekt nicht gefunden')
+            return
+        if not cur.rowcount:
+            self._send_json({'error': 'Projekt nicht gefunden'}, 404)
             return
+        response_cache.invalidate('projects', f'project:{project_id}', 'overview',
+                                  *[f'task:{t}' for t in task_ids])
+        invalidate_task_change(project_id)
+        self._set_headers(204, 'text/plain')
 
-        # Unbekannter Pfad
-        self._set_headers(404)
-        self.wfile.write(json.dumps({'error': 'Pfad nicht gefunden'}).encode())
+    @route('DELETE', '/api/tasks/{id}')
+    def delete_task(self, task_id):
+        def delete(conn):
+            return conn.execute('DELETE FROM tasks WHERE id=? RETURNING project_id', (task_id,)).fetchone()
+
+        try:
+            row = write_queue.run(delete)
+        except sqlite3.Error as exc:
+            self._send_write_error(exc, 'Aufgabe nicht gefunden')
+            return
+        if row is None:
+            self._send_json({'error': 'Aufgabe nicht gefunden'}, 404)
+            return
+        invalidate_task_change(row['project_id'], task_id)
+        self._set_headers(204, 'text/plain')
 
     # ----------------------
     #    Static File Serving
     # ----------------------
     def serve_static(self, path: str):
-        """Liefert statische Dateien (HTML, CSS, JS) aus dem Projektverzeichnis aus."""
+        """
+        Liefert statische Dateien (HTML, CSS, JS) aus dem Projektverzeichnis aus.
+
+        Die Dateien kommen aus dem Speicher (static_assets), bei passendem
+        Accept-Encoding vorkomprimiert, und unterstützen 304-Antworten.
+        """
         # root path -> index.html
-        if path in ('', '/', '/index.html'):
-            file_path = os.path.join(STATIC_DIR, 'index.html')
-            content_type = 'text/html; charset=utf-8'
-        else:
-            # führenden Slash entfernen
-            rel_path = path.lstrip('/')
-            file_path = os.path.join(STATIC_DIR, rel_path)
-
-            # Content-Type anhand Dateiendung bestimmen
-            if rel_path.endswith('.css'):
-                content_type = 'text/css; charset=utf-8'
-            elif rel_path.endswith('.js'):
-                content_type = 'application/javascript; charset=utf-8'
-            elif rel_path.endswith('.json'):
-                content_type = 'application/json; charset=utf-8'
-            elif rel_path.endswith('.html'):
-                content_type = 'text/html; charset=utf-8'
-            elif rel_path.endswith(('.png', '.jpg', '.jpeg', '.gif')):
-                content_type = 'image/' + rel_path.split('.')[-1]
-            else:
-                # Datei existiert?
-                if not os.path.isfile(file_path):
-                    self._set_headers(404)
-                    self.wfile.write(json.dumps({'error': 'Datei nicht gefunden'}).encode())
-                    return
-                # Fallback: binär
-                content_type = 'application/octet-stream'
+        if path in ('', '/'):
+            path = '/index.html'
+        asset = static_assets.get(path.lstrip('/'))
+        if asset is None:
+            self._send_json({'error': 'Datei nicht gefunden'}, 404)
+            return
+
+        encoding = choose_encoding(self.headers.get('Accept-Encoding'), asset.variants)
+        body, etag = asset.variants[encoding] if encoding else (asset.body, asset.etag)
+        headers = {
+            'ETag': etag,
+            'Last-Modified': asset.last_modified,
+            'Cache-Control': asset.cache_control,
+        }
+        if asset.variants:
+            headers['Vary'] = 'Accept-Encoding'
+        if self._is_not_modified(etag, asset.mtime):
+            self._send_not_modified(headers)
+            return
+        if encoding:
+            headers['Content-Encoding'] = encoding
 
-        # Datei lesen und senden
+        if body is not None:
+            self._set_headers(200, asset.content_type, len(body), headers)
+            self.wfile.write(body)
+            return
+        # große Datei: ohne Umweg über den Userspace vom Dateisystem in den Socket
         try:
-            with open(file_path, 'rb') as f:
-                content = f.read()
-            self._set_headers(200, content_type)
-            self.wfile.write(content)
+            with open(asset.file_path, 'rb') as f:
+                self._set_headers(200, asset.content_type, asset.size, headers)
+                sent = self.connection.sendfile(f, 0, asset.size)
+            if isinstance(self.wfile, CountingWriter):
+                self.wfile.bytes_written += sent
         except FileNotFoundError:
-            self._set_headers(404)
-            self.wfile.write(json.dumps({'error': 'Datei nicht gefunden'}).encode())
+            self._send_json({'error': 'Datei nicht gefunden'}, 404)
+
+    def _is_not_modified(self, etag, mtime):
+        """Auswertung von If-None-Match bzw. (ohne diesen) If-Modified-Since."""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match:
+            return etag_matches(if_none_match, etag)
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            return int(mtime) <= since
+        return False
+
+
+class PooledHTTPServer(HTTPServer):
+    """
+    HTTPServer, der angenommene Verbindungen an einen festen Pool von
+    Worker-Threads verteilt.
+
+    Der Haupt-Thread nimmt nur Verbindungen an und legt sie mit dem Zeitpunkt
+    der Annahme in eine begrenzte Warteschlange (ADMISSION_QUEUE). Ist sie
+    voll, blockiert accept() und weitere Clients warten im Listen-Backlog des
+    Betriebssystems, statt unbegrenzt Threads zu starten. Wie lange eine
+    Verbindung gewartet hat, prüft Admission bei ihrer ersten Anfrage.
+
+    Mit ``listen_socket`` übernimmt der Server einen bereits lauschenden
+    Socket (Prefork-Betrieb, siehe run_prefork), statt selbst zu binden.
+    """
+
+    # Mehr wartende Verbindungen im Kernel zulassen als der Standard (5)
+    request_queue_size = 128
+
+    def __init__(self, server_address, handler_class, workers=WORKER_THREADS, listen_socket=None):
+        self.workers = max(1, workers)
+        self._pending = queue.Queue(maxsize=ADMISSION_QUEUE)
+        self._stopping = threading.Event()
+        self._threads = []
+        # schlägt bind() fehl, ruft der Basiskonstruktor server_close() auf,
+        # das die Attribute oben bereits braucht
+        super().__init__(server_address, handler_class, bind_and_activate=listen_socket is None)
+        if listen_socket is not None:
+            self.socket.close()
+            self.socket = listen_socket
+            self.server_address = listen_socket.getsockname()
+            self.server_name = socket.getfqdn(self.server_address[0])
+            self.server_port = self.server_address[1]
+        for i in range(self.workers):
+            t = threading.Thread(target=self._worker, name=f'http-worker-{i}', daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def process_request(self, request, client_address):
+        self._pending.put((request, client_address, time.monotonic()))
+
+    def _worker(self):
+        while True:
+            item = self._pending.get()
+            if item is None:
+                return
+            request, client_address, current_request.accepted = item
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                current_request.accepted = None
+                self.shutdown_request(request)
+
+    def should_release_connection(self):
+        """True, wenn Keep-Alive-Verbindungen nach der Antwort geschlossen werden sollen."""
+        return self._stopping.is_set() or not self._pending.empty()
+
+    def queued_connections(self):
+        """Angenommene Verbindungen, die noch auf einen Worker warten."""
+        return self._pending.qsize()
+
+    def server_close(self):
+        """Schließt den Listen-Socket und wartet, bis laufende Anfragen fertig sind."""
+        self._stopping.set()
+        super().server_close()
+        for _ in self._threads:
+            self._pending.put(None)
+        for t in self._threads:
+            t.join(SHUTDOWN_TIMEOUT / len(self._threads))
+
+
+def serve(httpd):
+    """Bedient Anfragen bis Strg+C oder SIGTERM und fährt danach geordnet herunter."""
+    # SIGTERM (z.B. von Render) beendet den Server geordnet wie Strg+C.
+    # shutdown() muss aus einem anderen Thread als serve_forever() kommen.
+    def stop(signum, frame):
+        threading.Thread(target=httpd.shutdown, daemon=True).start()
+    signal.signal(signal.SIGTERM, stop)
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        write_queue.close()
+        db_pool.close()
+
+
+def run_worker_process(listen_socket):
+    """Worker-Prozess im Prefork-Betrieb, läuft direkt nach dem Fork."""
+    global BOOT_ID
+    BOOT_ID = os.urandom(4).hex()
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+    signal.signal(signal.SIGALRM, signal.SIG_DFL)
+    signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT, signal.SIGTERM})
+    httpd = PooledHTTPServer(None, ProjectHandler, WORKER_THREADS, listen_socket=listen_socket)
+    process_sync.start()
+    serve(httpd)
+
+
+def run_prefork(processes):
+    """
+    Supervisor für WORKER_PROCESSES > 1: bindet den Listen-Socket einmal und
+    startet ``processes`` Worker-Prozesse, die ihn erben.
+
+    Der Socket ist nicht blockierend: bei einer neuen Verbindung werden alle
+    wartenden Prozesse geweckt, einer erhält sie, bei den übrigen kehrt
+    accept() sofort zurück. Anders als bei SO_REUSEPORT (ein Socket je
+    Prozess) gehen so keine Verbindungen verloren, die im Backlog eines
+    abgestürzten Prozesses warten, und ein neu gestarteter Prozess nimmt
+    einfach am selben Socket teil.
+
+    Beendet sich ein Worker-Prozess, ohne dass der Server herunterfährt,
+    wird er neu gestartet. SIGTERM und Strg+C reicht der Supervisor als
+    SIGTERM weiter; wer danach nicht binnen SHUTDOWN_TIMEOUT fertig ist,
+    wird mit SIGKILL beendet.
+    """
+    listen_socket = socket.create_server(('', PORT), backlog=PooledHTTPServer.request_queue_size)
+    listen_socket.setblocking(False)
+    process_sync.setup()
+    workers = {}  # pid -> Startzeit
+    stopping = False
+
+    def spawn():
+        # bis die Worker ihre eigenen Signal-Handler gesetzt haben, dürfen
+        # sie keine Signale mit den Handlern des Supervisors bearbeiten
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGINT, signal.SIGTERM})
+        try:
+            pid = os.fork()
+            if pid == 0:
+                code = 1
+                try:
+                    run_worker_process(listen_socket)
+                    code = 0
+                except BaseException:
+                    traceback.print_exc()
+                finally:
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    os._exit(code)
+            workers[pid] = time.monotonic()
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGINT, signal.SIGTERM})
+
+    def signal_workers(signum):
+        for pid in list(workers):
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    def stop(signum, frame):
+        nonlocal stopping
+        if not stopping:
+            stopping = True
+            signal_workers(signal.SIGTERM)
+            signal.alarm(int(SHUTDOWN_TIMEOUT) + 1)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGALRM, lambda signum, frame: signal_workers(signal.SIGKILL))
+
+    for _ in range(processes):
+        spawn()
+    print(f'Server läuft auf http://localhost:{PORT} '
+          f'({processes} Prozesse mit je {WORKER_THREADS} Worker-Threads)', flush=True)
+    while workers:
+        pid, status = os.wait()
+        started = workers.pop(pid, None)
+        if started is None or stopping:
+            continue
+        code = os.waitstatus_to_exitcode(status)
+        reason = f'Signal {-code}' if code < 0 else f'Exit-Code {code}'
+        print(f'Worker-Prozess {pid} beendet ({reason}), starte neu', file=sys.stderr, flush=True)
+        if time.monotonic() - started < 1:
+            # stürzt er gleich beim Start ab, nicht im Takt neu starten
+            time.sleep(1)
+        if not stopping:
+            spawn()
+    listen_socket.close()
 
 
 def run_server():
     init_db()
-    server_address = ('', PORT)
-    httpd = HTTPServer(server_address, ProjectHandler)
-    print(f'Server läuft auf http://localhost:{PORT}')
-    httpd.serve_forever()
+    static_assets.preload()
+    if WORKER_PROCESSES > 1:
+        run_prefork(WORKER_PROCESSES)
+        return
+    httpd = PooledHTTPServer(('', PORT), ProjectHandler, WORKER_THREADS)
+    print(f'Server läuft auf http://localhost:{PORT} ({httpd.workers} Worker-Threads)')
+    serve(httpd)
 
 
 if __name__ == '__main__':
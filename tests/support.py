@@ -0,0 +1,64 @@
+"""
+Gemeinsame Hilfen für die Tests.
+
+Die Tests arbeiten direkt auf einer frisch migrierten SQLite-Datenbank in
+einem temporären Verzeichnis, ohne Server-Prozess; projects.db bleibt
+unangetastet. Ausführen im Projektverzeichnis mit
+
+    python -m unittest discover tests
+"""
+
+import contextlib
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import server  # noqa: E402
+
+
+class DatabaseTestCase(unittest.TestCase):
+    """
+    Testfall mit eigener Datenbank: ``self.conn`` (Autocommit, Row-Factory,
+    Fremdschlüssel an). Mit ``up_to`` laufen nur die Migrationen bis zu
+    dieser Version, init_db() bringt die Datenbank danach auf den aktuellen Stand.
+    """
+
+    up_to = None
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        db_file = os.path.join(tmp.name, 'test.db')
+        old_db_file, server.DB_FILE = server.DB_FILE, db_file
+        self.addCleanup(setattr, server, 'DB_FILE', old_db_file)
+        self.conn = sqlite3.connect(db_file, isolation_level=None)
+        self.addCleanup(self.conn.close)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA foreign_keys = ON')
+        if self.up_to is None:
+            self.init_db()
+        else:
+            for version, _, migrate in server.MIGRATIONS:
+                if version <= self.up_to:
+                    migrate(self.conn)
+                    self.conn.execute(f'PRAGMA user_version = {version}')
+
+    def init_db(self):
+        """Führt die noch offenen Migrationen aus und gibt die Meldungen von init_db zurück."""
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output), contextlib.redirect_stderr(output):
+            server.init_db()
+        return output.getvalue()
+
+    def insert(self, table, **values):
+        """Fügt eine Zeile ein und gibt ihre ID zurück."""
+        cur = self.conn.execute(
+            f'INSERT INTO {table} ({", ".join(values)}) VALUES ({", ".join("?" * len(values))})',
+            tuple(values.values()))
+        return cur.lastrowid
@@ -0,0 +1,104 @@
+"""Änderungsprotokoll (Migration 3): Trigger-Einträge, read_changes und die
+since=-Deltas der Listen (read_delta)."""
+
+import unittest
+from unittest import mock
+
+from support import DatabaseTestCase, server
+
+
+class ChangeLogTest(DatabaseTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.customer = self.insert('customers', name='Kunde')
+        self.project = self.insert('projects', name='Messestand', customer='Kunde')
+        self.other = self.insert('projects', name='Zweiter Stand', customer='Kunde')
+        self.tasks = [self.insert('tasks', project_id=self.project, title=f'Aufgabe {i}')
+                      for i in range(3)]
+        self.since = self.latest_seq()
+
+    def latest_seq(self):
+        return server.change_log_range(self.conn)[1]
+
+    def changes(self):
+        return [(c['table'], c['id'], c['op'], c['project_id'])
+                for c in server.read_changes(self.conn, self.since)]
+
+    def task_delta(self, params):
+        query = server.build_list_query(
+            'tasks', params, [f'id IN ({server.DELTA_KEYS["tasks"]})'], [self.since])
+        return server.read_delta(self.conn, 'tasks', self.since, query.sql, query.args, query.fields)
+
+    def test_initial_inserts_are_logged(self):
+        self.since = 0
+        self.assertEqual(self.changes(), [
+            ('customers', self.customer, 'upsert', None),
+            ('projects', self.project, 'upsert', self.project),
+            ('projects', self.other, 'upsert', self.other),
+        ] + [('tasks', t, 'upsert', self.project) for t in self.tasks])
+
+    def test_update_delete_and_move(self):
+        first, second, third = self.tasks
+        self.conn.execute("UPDATE customers SET email='a@example.com' WHERE id=?", (self.customer,))
+        self.conn.execute("UPDATE tasks SET status='Done' WHERE id=?", (first,))
+        self.conn.execute('DELETE FROM tasks WHERE id=?', (second,))
+        self.conn.execute('UPDATE tasks SET project_id=? WHERE id=?', (self.other, third))
+        changes = self.changes()
+        self.assertEqual(changes[:3], [
+            ('customers', self.customer, 'upsert', None),
+            ('tasks', first, 'upsert', self.project),
+            ('tasks', second, 'delete', self.project),
+        ])
+        # Verschieben meldet die Aufgabe für das neue und das bisherige Projekt
+        self.assertCountEqual(changes[3:], [
+            ('tasks', third, 'upsert', self.other),
+            ('tasks', third, 'upsert', self.project),
+        ])
+
+    def test_cascade_delete_is_logged(self):
+        self.conn.execute('DELETE FROM projects WHERE id=?', (self.project,))
+        self.assertCountEqual(self.changes(), [('projects', self.project, 'delete', self.project)]
+                              + [('tasks', t, 'delete', self.project) for t in self.tasks])
+
+    def test_seq_is_monotonic(self):
+        for task_id in self.tasks:
+            self.conn.execute("UPDATE tasks SET title='Neu' WHERE id=?", (task_id,))
+        seqs = [c['seq'] for c in server.read_changes(self.conn, self.since)]
+        self.assertEqual(seqs, sorted(seqs))
+        self.assertGreater(seqs[0], self.since)
+        self.assertEqual(server.read_changes(self.conn, seqs[-1]), [])
+
+    def test_delta_rows_and_removed(self):
+        first, second, third = self.tasks
+        self.conn.execute("UPDATE tasks SET title='Geändert' WHERE id=?", (first,))
+        self.conn.execute('DELETE FROM tasks WHERE id=?', (second,))
+        self.conn.execute("UPDATE tasks SET status='Done' WHERE id=?", (third,))
+        delta = self.task_delta({'status': 'ToDo', 'fields': 'id,title'})
+        self.assertEqual(delta['seq'], self.latest_seq())
+        self.assertEqual(delta['rows'], [{'id': first, 'title': 'Geändert'}])
+        # gelöscht bzw. passt nicht mehr zum Filter
+        self.assertEqual(delta['removed'], sorted([second, third]))
+
+    def test_delta_without_changes(self):
+        self.assertEqual(self.task_delta({}), {'seq': self.since, 'rows': [], 'removed': []})
+
+    def test_overview_delta_counts_task_changes(self):
+        self.conn.execute("UPDATE tasks SET status='Done' WHERE id=?", (self.tasks[0],))
+        changed = {row[0] for row in self.conn.execute(server.DELTA_KEYS['overview'], (self.since,))}
+        self.assertEqual(changed, {self.project})
+
+    def test_since_no_longer_available(self):
+        self.assertIsNone(server.read_changes(self.conn, self.latest_seq() + 1))
+        for task_id in self.tasks:
+            self.conn.execute("UPDATE tasks SET title='Neu' WHERE id=?", (task_id,))
+        with mock.patch.object(server, 'CHANGE_LOG_RETAIN', 2):
+            server.prune_change_log(self.conn)
+        self.assertIsNone(server.read_changes(self.conn, self.since))
+        self.assertIsNone(self.task_delta({}))
+        low, high = server.change_log_range(self.conn)
+        self.assertEqual(len(server.read_changes(self.conn, low - 1)), high - low + 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""Migration 7 (Datumsspalten als JJJJ-MM-TT, unparsed_dates) und Migration 8
+(legacy_updated_at für Zeilen ohne updated_at) auf einer Datenbank mit Stand 6."""
+
+import unittest
+
+from support import DatabaseTestCase, server
+
+# gespeicherter Text -> erwarteter Wert nach Migration 7 (None: leer bzw. nicht erkennbar)
+DATES = {
+    '2025-03-05': '2025-03-05',
+    '2025-3-5': '2025-03-05',
+    '5.3.2025': '2025-03-05',
+    '05.03.25': '2025-03-05',
+    '2025-03-05T10:30:00Z': '2025-03-05',
+    ' 2025-03-05 ': '2025-03-05',
+    '': None,
+    '   ': None,
+    '2025-02-30': None,
+    '31.04.2025': None,
+    'nächste Woche': None,
+}
+UNPARSED = ('2025-02-30', '31.04.2025', 'nächste Woche')
+
+
+class DateMigrationTest(DatabaseTestCase):
+
+    up_to = 6
+
+    def setUp(self):
+        super().setUp()
+        self.projects = {}
+        self.tasks = {}
+        for value in DATES:
+            project = self.insert('projects', name=f'Messe {value}', customer='Kunde',
+                                  date=value, dueDate=value, status='Abgeschlossen')
+            self.projects[value] = project
+            self.tasks[value] = self.insert('tasks', project_id=project, title=f'Aufgabe {value}',
+                                            dueDate=value)
+        self.legacy = self.insert('projects', name='Alt', customer='Kunde', status='Abgeschlossen')
+        self.old = self.insert('projects', name='Lange fertig', customer='Kunde', status='Abgeschlossen',
+                               updated_at='2020-01-01T00:00:00.000Z')
+        self.output = self.init_db()
+
+    def column(self, table, column, row_id):
+        return self.conn.execute(f'SELECT {column} FROM {table} WHERE id=?', (row_id,)).fetchone()[0]
+
+    def test_dates_normalized(self):
+        for value, expected in DATES.items():
+            with self.subTest(value=value):
+                self.assertEqual(self.column('projects', 'date', self.projects[value]), expected)
+                self.assertEqual(self.column('projects', 'dueDate', self.projects[value]), expected)
+                self.assertEqual(self.column('tasks', 'dueDate', self.tasks[value]), expected)
+
+    def test_rewritten_rows_get_updated_at(self):
+        self.assertIsNotNone(self.column('projects', 'updated_at', self.projects['5.3.2025']))
+        self.assertIsNone(self.column('projects', 'updated_at', self.projects['2025-03-05']))
+
+    def test_unparsed_values_kept(self):
+        expected = sorted(
+            [('projects', self.projects[v], field, v) for v in UNPARSED for field in ('date', 'dueDate')]
+            + [('tasks', self.tasks[v], 'dueDate', v) for v in UNPARSED])
+        listed = sorted((e['table'], e['id'], e['field'], e['value'])
+                        for e in server.read_unparsed_dates(self.conn))
+        self.assertEqual(listed, expected)
+        self.assertIn('projects.date: 3 nicht erkennbare Datumswerte', self.output)
+        self.assertIn('tasks.dueDate: 3 nicht erkennbare Datumswerte', self.output)
+
+    def test_unparsed_entry_disappears_once_set(self):
+        task = self.tasks['nächste Woche']
+        self.conn.execute("UPDATE tasks SET dueDate='2025-04-01' WHERE id=?", (task,))
+        listed = [(e['table'], e['id']) for e in server.read_unparsed_dates(self.conn)]
+        self.assertNotIn(('tasks', task), listed)
+        self.assertIn(('projects', self.projects['nächste Woche']), listed)
+
+    def test_init_db_again_is_a_no_op(self):
+        before = self.conn.execute('SELECT id, date, dueDate, updated_at FROM projects').fetchall()
+        output = self.init_db()
+        self.assertNotIn('migriert', output)
+        self.assertEqual(self.conn.execute('PRAGMA user_version').fetchone()[0], server.MIGRATIONS[-1][0])
+        self.assertEqual(self.conn.execute('SELECT id, date, dueDate, updated_at FROM projects').fetchall(),
+                         before)
+
+    def candidates(self, cutoff):
+        sql = server.ARCHIVE_CANDIDATES_SQL.format(statuses='?')
+        return {row[0] for row in self.conn.execute(sql, ('Abgeschlossen', cutoff, cutoff, 0, 1000))}
+
+    def test_rows_without_updated_at_count_from_migration_8(self):
+        legacy = self.conn.execute(
+            "SELECT value FROM schema_meta WHERE key = 'legacy_updated_at'").fetchone()[0]
+        self.assertIsNone(self.column('projects', 'updated_at', self.legacy))
+        # Stichtag vor Migration 8: nur die Zeile mit altem updated_at ist archivierbar
+        self.assertEqual(self.candidates('2021-01-01T00:00:00.000Z'), {self.old})
+        self.assertNotIn(self.legacy, self.candidates(legacy))
+        self.assertIn(self.legacy, self.candidates('9999-01-01T00:00:00.000Z'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+"""project_stats: Die Trigger aus Migration 5 halten die Zähler so, wie sie
+eine Neuberechnung per GROUP BY über alle Aufgaben ergäbe."""
+
+import random
+import unittest
+
+from support import DatabaseTestCase
+
+# Zähler und next_due je Projekt, frisch aus den Aufgaben berechnet
+RECOUNT_SQL = """
+    SELECT p.id AS project_id,
+           COUNT(t.id) AS total,
+           COALESCE(SUM(t.status IS 'ToDo'), 0) AS todo,
+           COALESCE(SUM(t.status IS 'InBearbeitung'), 0) AS in_progress,
+           COALESCE(SUM(t.status IS 'Done'), 0) AS done,
+           MIN(CASE WHEN t.status IS NOT 'Done' THEN t.dueDate END) AS next_due
+    FROM projects p
+    LEFT JOIN tasks t ON t.project_id = p.id
+    GROUP BY p.id
+    ORDER BY p.id
+"""
+
+STATUSES = ('ToDo', 'InBearbeitung', 'Done')
+
+
+class ProjectStatsTest(DatabaseTestCase):
+
+    def assertStatsMatchRecount(self, msg=None):
+        stored = [dict(row) for row in self.conn.execute(
+            'SELECT project_id, total, todo, in_progress, done, next_due '
+            'FROM project_stats ORDER BY project_id')]
+        recount = [dict(row) for row in self.conn.execute(RECOUNT_SQL)]
+        self.assertEqual(stored, recount, msg)
+
+    def add_project(self):
+        return self.insert('projects', name='Messestand', customer='Kunde')
+
+    def add_task(self, project_id, status='ToDo', due=None):
+        return self.insert('tasks', project_id=project_id, title='Aufgabe', status=status, dueDate=due)
+
+    def test_insert_update_delete(self):
+        p = self.add_project()
+        self.assertStatsMatchRecount()
+        first = self.add_task(p, due='2025-03-10')
+        second = self.add_task(p, status='InBearbeitung', due='2025-03-05')
+        self.add_task(p, status='Done', due='2025-03-01')
+        self.assertStatsMatchRecount()
+        self.assertEqual(self.conn.execute(
+            'SELECT next_due FROM project_stats WHERE project_id=?', (p,)).fetchone()[0], '2025-03-05')
+
+        # Die früheste offene Aufgabe wird erledigt: next_due rückt vor
+        self.conn.execute("UPDATE tasks SET status='Done' WHERE id=?", (second,))
+        self.assertStatsMatchRecount()
+        self.conn.execute("UPDATE tasks SET dueDate='2025-02-01' WHERE id=?", (first,))
+        self.assertStatsMatchRecount()
+        self.conn.execute("UPDATE tasks SET dueDate=NULL WHERE id=?", (first,))
+        self.assertStatsMatchRecount()
+        self.conn.execute('DELETE FROM tasks WHERE id=?', (first,))
+        self.assertStatsMatchRecount()
+
+    def test_move_between_projects(self):
+        a, b = self.add_project(), self.add_project()
+        task = self.add_task(a, due='2025-01-15')
+        self.add_task(a, due='2025-04-01')
+        self.add_task(b, status='Done')
+        self.conn.execute('UPDATE tasks SET project_id=? WHERE id=?', (b, task))
+        self.assertStatsMatchRecount()
+        # Verschieben und Status ändern in einem UPDATE
+        self.conn.execute("UPDATE tasks SET project_id=?, status='Done' WHERE id=?", (a, task))
+        self.assertStatsMatchRecount()
+
+    def test_project_delete_cascades(self):
+        a, b = self.add_project(), self.add_project()
+        for status in STATUSES:
+            self.add_task(a, status=status, due='2025-06-01')
+            self.add_task(b, status=status, due='2025-06-02')
+        self.conn.execute('DELETE FROM projects WHERE id=?', (a,))
+        self.assertStatsMatchRecount()
+
+    def test_random_changes(self):
+        rnd = random.Random(14)
+        projects = [self.add_project() for _ in range(5)]
+        tasks = []
+
+        def due():
+            return rnd.choice([None, f'2025-{rnd.randint(1, 12):02d}-{rnd.randint(1, 28):02d}'])
+
+        for step in range(500):
+            action = rnd.random()
+            if action < 0.3 or not tasks:
+                tasks.append(self.add_task(rnd.choice(projects), rnd.choice(STATUSES), due()))
+            elif action < 0.5:
+                self.conn.execute('UPDATE tasks SET status=? WHERE id=?',
+                                  (rnd.choice(STATUSES), rnd.choice(tasks)))
+            elif action < 0.65:
+                self.conn.execute('UPDATE tasks SET dueDate=? WHERE id=?', (due(), rnd.choice(tasks)))
+            elif action < 0.8:
+                self.conn.execute('UPDATE tasks SET project_id=?, status=?, dueDate=? WHERE id=?',
+                                  (rnd.choice(projects), rnd.choice(STATUSES), due(), rnd.choice(tasks)))
+            elif action < 0.9:
+                self.conn.execute('DELETE FROM tasks WHERE id=?', (tasks.pop(rnd.randrange(len(tasks))),))
+            elif action < 0.95:
+                self.conn.execute("UPDATE tasks SET title='Neu' WHERE id=?", (rnd.choice(tasks),))
+            else:
+                projects.append(self.add_project())
+            self.assertStatsMatchRecount(f'nach Schritt {step}')
+
+
+class ProjectStatsMigrationTest(ProjectStatsTest):
+    """Wie oben, aber die Aufgaben stammen aus der Zeit vor Migration 5."""
+
+    up_to = 4
+
+    def setUp(self):
+        super().setUp()
+        a, b = self.add_project(), self.add_project()
+        self.add_project()
+        for status in STATUSES:
+            self.add_task(a, status=status, due='2025-05-01')
+            self.add_task(b, status=status)
+        self.init_db()
+
+    def test_backfill(self):
+        self.assertStatsMatchRecount()
+
+
+if __name__ == '__main__':
+    unittest.main()